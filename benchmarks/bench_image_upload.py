@@ -0,0 +1,143 @@
+"""
+Benchmark `ImageField` uploads per second per core with the image process pool
+against the previous serial decode/resize/encode/upload path.
+
+Uploads go to an in-memory storage with a simulated per-file upload latency.
+The largest event loop stall seen while uploading is reported as well.
+
+Usage:
+    python -m avcfastapi.benchmarks.bench_image_upload [uploads] [concurrency]
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("APP_NAME", "benchmark")
+os.environ.setdefault("APP_SECRET_KEY", "benchmark")
+os.environ.setdefault("APP_CORS_ORIGINS", "*")
+
+from PIL import Image as PILImage
+
+from avcfastapi.core.storage import imaging
+from avcfastapi.core.storage.settings import settings
+from avcfastapi.core.storage.sqlalchemy.fields import ImageField
+from avcfastapi.core.storage.storage_class.abstract import (
+    Storage,
+    run_in_storage_executor,
+)
+
+UPLOAD_LATENCY = 0.02
+VARIATIONS = {
+    "large": {"width": 1920, "height": 1920},
+    "medium": {"width": 1024, "height": 1024},
+    "small": {"width": 512, "height": 512},
+    "thumbnail": {"width": 150, "height": 150},
+}
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        super().__init__("memory", "")
+        self.files = {}
+
+    def save(self, content, filepath, content_type=None):
+        time.sleep(UPLOAD_LATENCY)
+        self.files[filepath] = self._get_bytes(content)
+        return filepath
+
+    def get_path(self, filepath):
+        return filepath
+
+    def get_url(self, filepath):
+        return f"memory://{filepath}"
+
+
+def legacy_save_file(field: ImageField, content: bytes, path: str):
+    img, fmt = field._process_image_file(content, path)
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    buffer.seek(0)
+    field.storage.save(content=buffer, filepath=path, content_type=f"image/{fmt}")
+    for key, variant in field._generate_variants(img, field.variations).items():
+        buffer = io.BytesIO()
+        variant.save(buffer, format=fmt)
+        buffer.seek(0)
+        field.storage.save(
+            content=buffer,
+            filepath=field._get_variant_path(path, key),
+            content_type=f"image/{fmt}",
+        )
+
+
+def _image(width: int = 4000, height: int = 3000) -> bytes:
+    gradient = PILImage.linear_gradient("L").resize((width, height))
+    noise = PILImage.effect_noise((width, height), 32)
+    img = PILImage.merge("RGB", (gradient, noise, gradient.transpose(0)))
+    buffer = io.BytesIO()
+    img.save(buffer, format="jpeg", quality=90)
+    return buffer.getvalue()
+
+
+async def _run(upload, uploads: int, concurrency: int) -> dict:
+    stalls = []
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - start - 0.01)
+
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with limit:
+            await upload(f"bench/{index}.jpg")
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(uploads)))
+    elapsed = time.perf_counter() - start
+    tick.cancel()
+    return {
+        "uploads_per_s": uploads / elapsed,
+        "max_loop_stall_ms": max(stalls, default=0) * 1000,
+    }
+
+
+async def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    cores = os.cpu_count() or 1
+    content = _image()
+    print(f"12 MP JPEG ({len(content) // 1024} KB), {len(VARIATIONS)} variations")
+    print(f"{uploads} uploads, concurrency {concurrency}, {cores} cores")
+
+    field = ImageField(storage=MemoryStorage(), variations=VARIATIONS)
+
+    async def legacy(path):
+        await run_in_storage_executor(legacy_save_file, field, content, path)
+
+    async def current(path):
+        await field.asave_file(content, path)
+
+    settings.STORAGE_IMAGE_WORKERS = cores
+    imaging.get_image_executor()
+    # Warm up the worker processes
+    await current("bench/warmup.jpg")
+
+    print(f"{'path':<16}{'uploads/s':>12}{'per core':>12}{'max stall ms':>16}")
+    for name, upload in [("serial", legacy), ("process pool", current)]:
+        result = await _run(upload, uploads, concurrency)
+        print(
+            f"{name:<16}{result['uploads_per_s']:>12.2f}"
+            f"{result['uploads_per_s'] / cores:>12.2f}"
+            f"{result['max_loop_stall_ms']:>16.1f}"
+        )
+    imaging.shutdown_image_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
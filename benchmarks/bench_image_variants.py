@@ -0,0 +1,121 @@
+"""
+Benchmark variant generation on 4K and 12 MP JPEGs: every variant resized
+from the full resolution original (previous behaviour), cascaded variants,
+and cascaded variants from a reduced scale JPEG decode.
+
+Every mode runs in a fresh process, so its peak RSS growth can be reported.
+Peak RSS is measured around the variant generation only.
+Variant sizes are checked against the previous behaviour and the mean pixel
+difference to it is reported.
+
+Usage:
+    python -m avcfastapi.benchmarks.bench_image_variants
+"""
+
+import io
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import resource
+import time
+
+os.environ.setdefault("APP_NAME", "benchmark")
+os.environ.setdefault("APP_SECRET_KEY", "benchmark")
+os.environ.setdefault("APP_CORS_ORIGINS", "*")
+
+from PIL import Image as PILImage, ImageChops, ImageFilter, ImageStat
+
+from avcfastapi.core.storage.imaging import (
+    fit_size,
+    generate_variants,
+    open_for_variants,
+)
+
+RUNS = 3
+INPUTS = {"4K": (3840, 2160), "12 MP": (4000, 3000)}
+VARIATIONS = {
+    "large": {"width": 1920, "height": 1920},
+    "medium": {"width": 1024, "height": 1024},
+    "small": {"width": 512, "height": 512},
+    "thumbnail": {"width": 150, "height": 150},
+}
+
+
+def _image(size: tuple[int, int]) -> bytes:
+    gradient = PILImage.linear_gradient("L").resize(size)
+    # Smooth noise, closer to a photo than per-pixel noise
+    noise = PILImage.effect_noise(size, 64).filter(ImageFilter.GaussianBlur(2))
+    img = PILImage.merge("RGB", (gradient, noise, gradient.transpose(0)))
+    buffer = io.BytesIO()
+    img.save(buffer, format="jpeg", quality=90)
+    return buffer.getvalue()
+
+
+def legacy_variants(content: bytes) -> dict:
+    img = PILImage.open(io.BytesIO(content))
+    img.load()
+    return {
+        key: img.resize(
+            fit_size(img.size, value["width"], value["height"]), PILImage.LANCZOS
+        )
+        for key, value in VARIATIONS.items()
+    }
+
+
+def cascaded_variants(content: bytes) -> dict:
+    img = PILImage.open(io.BytesIO(content))
+    img.load()
+    return generate_variants(img, VARIATIONS)
+
+
+def draft_variants(content: bytes) -> dict:
+    img, size = open_for_variants(content, VARIATIONS)
+    return generate_variants(img, VARIATIONS, size)
+
+
+MODES = {
+    "from original": legacy_variants,
+    "cascaded": cascaded_variants,
+    "cascaded + draft": draft_variants,
+}
+
+
+def _measure(mode: str, content: bytes, queue) -> None:
+    func = MODES[mode]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        variants = func(content)
+    elapsed = (time.perf_counter() - start) / RUNS
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    reference = legacy_variants(content)
+    diff = 0.0
+    for key, variant in variants.items():
+        assert variant.size == reference[key].size, key
+        delta = ImageStat.Stat(ImageChops.difference(variant, reference[key]))
+        diff = max(diff, sum(delta.mean) / len(delta.mean))
+    queue.put((elapsed * 1000, (rss_after - rss_before) / 1024, diff))
+
+
+def main():
+    # Peak RSS survives fork and exec, so start the server before any image
+    # is allocated here
+    context = multiprocessing.get_context("forkserver")
+    multiprocessing.forkserver.ensure_running()
+    print(
+        f"{'input':<8}{'mode':<20}{'ms/upload':>12}{'peak RSS MB':>14}{'mean diff':>12}"
+    )
+    for name, size in INPUTS.items():
+        content = _image(size)
+        for mode in MODES:
+            queue = context.Queue()
+            process = context.Process(target=_measure, args=(mode, content, queue))
+            process.start()
+            elapsed, rss, diff = queue.get()
+            process.join()
+            print(f"{name:<8}{mode:<20}{elapsed:>12.1f}{rss:>14.1f}{diff:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
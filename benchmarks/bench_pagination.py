@@ -0,0 +1,145 @@
+"""
+Benchmark per-item cost of `paginated_response` against the previous
+`jsonable_encoder` -> `model_validate` -> render round trip.
+
+Usage:
+    python -m avcfastapi.benchmarks.bench_pagination
+"""
+
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("APP_NAME", "benchmark")
+os.environ.setdefault("APP_SECRET_KEY", "benchmark")
+os.environ.setdefault("APP_CORS_ORIGINS", "*")
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import Field
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import declarative_base
+from starlette.requests import Request
+
+from avcfastapi.core.database.mongo.fields import PyObjectId
+from avcfastapi.core.fastapi.response.models import CustomBaseModel
+from avcfastapi.core.fastapi.response.pagination import (
+    PaginatedResponse,
+    paginated_response,
+)
+from avcfastapi.core.fastapi.response.response_class import CustomORJSONResponse
+
+PAGE_SIZES = [10, 100, 1000]
+
+Base = declarative_base()
+
+
+class Product(Base):
+    __tablename__ = "products"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    description = Column(String)
+    price = Column(Integer)
+    created_at = Column(DateTime)
+
+
+class ProductSchema(CustomBaseModel):
+    id: int
+    name: str
+    description: str
+    price: int
+    created_at: datetime
+
+
+class DocumentSchema(CustomBaseModel):
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    description: str
+    price: int
+    created_at: datetime
+
+
+def legacy_paginated_response(result, request, schema):
+    limit = int(request.query_params.get("limit", 10))
+    offset = int(request.query_params.get("offset", 0))
+    page = result[:limit]
+    model_dicts = jsonable_encoder(page, custom_encoder={ObjectId: str})
+    validated_items = [schema.model_validate(item_dict) for item_dict in model_dicts]
+    return PaginatedResponse(limit=limit, offset=offset, items=validated_items)
+
+
+def _rows(count: int) -> list:
+    return [
+        Product(
+            id=i,
+            name=f"product-{i}",
+            description="lorem ipsum " * 8,
+            price=i * 10,
+            created_at=datetime(2024, 1, 1),
+        )
+        for i in range(count)
+    ]
+
+
+def _documents(count: int) -> list:
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"product-{i}",
+            "description": "lorem ipsum " * 8,
+            "price": i * 10,
+            "created_at": datetime(2024, 1, 1),
+        }
+        for i in range(count)
+    ]
+
+
+def _request(limit: int) -> Request:
+    query = f"limit={limit}&offset=0".encode()
+    return Request(
+        {"type": "http", "path": "/items", "query_string": query, "headers": []}
+    )
+
+
+def _measure(func, min_time: float = 0.5) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def main():
+    print(
+        f"{'source':<12}{'page size':>10}{'legacy us/item':>16}{'current us/item':>17}{'speedup':>10}"
+    )
+    for name, factory, schema in [
+        ("orm", _rows, ProductSchema),
+        ("mongo", _documents, DocumentSchema),
+    ]:
+        for size in PAGE_SIZES:
+            items = factory(size + 1)
+            request = _request(size)
+
+            def legacy():
+                response = legacy_paginated_response(items, request, schema)
+                CustomORJSONResponse(response)
+
+            def current():
+                response = paginated_response(items, request, schema)
+                CustomORJSONResponse(response)
+
+            legacy_time = _measure(legacy) / size * 1e6
+            current_time = _measure(current) / size * 1e6
+            print(
+                f"{name:<12}{size:>10}{legacy_time:>16.2f}"
+                f"{current_time:>17.2f}{legacy_time / current_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
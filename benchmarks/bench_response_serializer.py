@@ -0,0 +1,97 @@
+"""
+Benchmark `CustomORJSONResponse.render` against the previous recursive `clean()`.
+
+Usage:
+    python -m avcfastapi.benchmarks.bench_response_serializer
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import List
+
+import orjson
+from pydantic import BaseModel
+
+from avcfastapi.core.fastapi.response.serializer import ORJSON_OPTIONS, serialize
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def legacy_render(content):
+    def clean(obj):
+        if isinstance(obj, BaseModel):
+            return {
+                "id" if k == "_id" else k: clean(v) for k, v in obj.model_dump().items()
+            }
+        elif isinstance(obj, dict):
+            return {"id" if k == "_id" else k: clean(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [clean(i) for i in obj]
+        elif isinstance(obj, tuple):
+            return tuple(clean(i) for i in obj)
+        else:
+            return obj
+
+    return orjson.dumps(clean(content), option=ORJSON_OPTIONS)
+
+
+class Item(BaseModel):
+    id: str
+    name: str
+    price: float
+    tags: List[str]
+    created_at: datetime
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+def _document(index: int, id_key: str) -> dict:
+    return {
+        id_key: f"{index:024x}",
+        "name": f"item-{index}",
+        "price": index * 1.5,
+        "tags": ["a", "b", "c"],
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat(),
+    }
+
+
+def _payloads(size: int) -> dict:
+    per_item = len(orjson.dumps(_document(0, "_id")))
+    count = max(1, size // per_item)
+    return {
+        "dicts with _id": [_document(i, "_id") for i in range(count)],
+        "dicts without _id": [_document(i, "id") for i in range(count)],
+        "model": ItemList(items=[_document(i, "id") for i in range(count)]),
+    }
+
+
+def _measure(func, content, min_time: float = 0.5) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        func(content)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def main():
+    print(
+        f"{'payload':<20}{'size':>12}{'clean() ms':>14}{'serialize ms':>14}{'speedup':>10}"
+    )
+    for size in SIZES:
+        for name, content in _payloads(size).items():
+            assert serialize(content) == legacy_render(content)
+            legacy = _measure(legacy_render, content)
+            current = _measure(serialize, content)
+            print(
+                f"{name:<20}{size:>12}{legacy * 1000:>14.3f}"
+                f"{current * 1000:>14.3f}{legacy / current:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
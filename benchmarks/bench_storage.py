@@ -0,0 +1,330 @@
+"""
+Benchmark `FileSystemStorage` and `S3Storage`: small object puts, large object
+throughput, reads of a large file from `CachedStorage`, URL presigning,
+`ImageField.save_file` with variants and the cost of `get_result` per loaded
+row.
+
+S3 runs offline against a local moto server (`pip install "moto[server]"`),
+or against any S3 compatible endpoint, e.g. MinIO, given with --endpoint-url.
+Every benchmark runs in a fresh process, so its peak RSS can be reported.
+Images are processed in the benchmark process (`STORAGE_IMAGE_WORKERS=0`),
+so their memory is included.
+
+Results are printed as JSON lines, one per benchmark and backend, with
+ops/s, p50 and p99 latency in ms, MB/s for large objects, and peak RSS.
+
+Usage:
+    python -m avcfastapi.benchmarks.bench_storage [--backends fs s3]
+        [--benchmarks put_small ...] [--quick] [--endpoint-url URL]
+        [--output results.jsonl]
+"""
+
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from queue import Empty
+
+os.environ.setdefault("APP_NAME", "benchmark")
+os.environ.setdefault("APP_SECRET_KEY", "benchmark")
+os.environ.setdefault("APP_CORS_ORIGINS", "*")
+os.environ.setdefault("APP_STORAGE_IMAGE_WORKERS", "0")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+BUCKET = "avcfastapi-benchmark"
+REGION = "us-east-1"
+VARIATIONS = {
+    "large": {"width": 1920, "height": 1920},
+    "medium": {"width": 1024, "height": 1024},
+    "small": {"width": 512, "height": 512},
+    "thumbnail": {"width": 150, "height": 150},
+}
+
+# Operations per benchmark, full and --quick runs
+SIZES = {
+    "put_small": (1000, 100),
+    "put_large": (5, 2),
+    "presign": (20000, 2000),
+    "presign_cached": (20000, 2000),
+    "cached_read_large": (20, 5),
+    "image_save_file": (20, 3),
+    "get_result": (100000, 10000),
+    "get_result_resolve": (20000, 2000),
+}
+SMALL_OBJECT_SIZE = 1024
+LARGE_OBJECT_SIZE = (64 * 1024 * 1024, 16 * 1024 * 1024)
+
+
+def _make_storage(backend: str, directory: str, **kwargs):
+    if backend == "fs":
+        from avcfastapi.core.storage.storage_class.filestorage import (
+            FileSystemStorage,
+        )
+
+        return FileSystemStorage(directory, "bench", url_prefix="/media")
+
+    from avcfastapi.core.storage.storage_class.s3storage import S3Storage
+
+    return S3Storage(
+        BUCKET,
+        os.environ["AWS_ACCESS_KEY_ID"],
+        os.environ["AWS_SECRET_ACCESS_KEY"],
+        REGION,
+        base_path="bench",
+        private=True,
+        **kwargs,
+    )
+
+
+def _image_field(storage, lazy: bool = False):
+    from avcfastapi.core.storage.sqlalchemy.fields import ImageField
+
+    return ImageField(
+        storage=storage, upload_to="images", variations=VARIATIONS, lazy=lazy
+    )
+
+
+def _jpeg(width: int = 2000, height: int = 1500) -> bytes:
+    from PIL import Image as PILImage
+
+    gradient = PILImage.linear_gradient("L").resize((width, height))
+    noise = PILImage.effect_noise((width, height), 32)
+    img = PILImage.merge("RGB", (gradient, noise, gradient.transpose(0)))
+    buffer = io.BytesIO()
+    img.save(buffer, format="jpeg", quality=90)
+    return buffer.getvalue()
+
+
+def _timed(func, ops: int) -> list[float]:
+    latencies = []
+    for index in range(ops):
+        start = time.perf_counter()
+        func(index)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench_put_small(backend, directory, ops, quick):
+    storage = _make_storage(backend, directory)
+    content = os.urandom(SMALL_OBJECT_SIZE)
+    latencies = _timed(lambda index: storage.save(content, f"small/{index}.bin"), ops)
+    return latencies, SMALL_OBJECT_SIZE
+
+
+def bench_put_large(backend, directory, ops, quick):
+    storage = _make_storage(backend, directory)
+    size = LARGE_OBJECT_SIZE[quick]
+    content = os.urandom(size)
+    # A file-like object is streamed in parts, as an upload would be
+    latencies = _timed(
+        lambda index: storage.save(io.BytesIO(content), f"large/{index}.bin"), ops
+    )
+    return latencies, size
+
+
+def bench_presign(backend, directory, ops, quick):
+    # Every key signed once, the URL cache can't help
+    storage = _make_storage(backend, directory, url_cache_size=0)
+    return _timed(lambda index: storage.get_url(f"small/{index}.bin"), ops), None
+
+
+def bench_presign_cached(backend, directory, ops, quick):
+    # A page of 100 items rendered over and over
+    storage = _make_storage(backend, directory)
+    return _timed(lambda index: storage.get_url(f"small/{index % 100}.bin"), ops), None
+
+
+def bench_cached_read_large(backend, directory, ops, quick):
+    # Reads of a large file served from the local cache after the first miss
+    from avcfastapi.core.storage.storage_class.cached import CachedStorage
+
+    size = LARGE_OBJECT_SIZE[quick]
+    storage = CachedStorage(
+        _make_storage(backend, directory),
+        cache_dir=os.path.join(directory, f"cache-{backend}"),
+        max_size=size * 8,
+    )
+    storage.save(os.urandom(size), "large/cached.bin")
+    storage.read("large/cached.bin")
+    return _timed(lambda index: storage.read("large/cached.bin"), ops), size
+
+
+def bench_image_save_file(backend, directory, ops, quick):
+    field = _image_field(_make_storage(backend, directory))
+    content = _jpeg()
+    latencies = _timed(
+        lambda index: field.save_file(content, f"images/{index}.jpg"), ops
+    )
+    return latencies, len(content)
+
+
+def bench_get_result(backend, directory, ops, quick):
+    # Loading a row of a lazy field only wraps the stored path
+    field = _image_field(_make_storage(backend, directory), lazy=True)
+    return _timed(lambda index: field.get_result(f"images/{index}.jpg"), ops), None
+
+
+def bench_get_result_resolve(backend, directory, ops, quick):
+    # Loading a row and rendering the URLs of the image and its variants
+    field = _image_field(_make_storage(backend, directory, url_cache_size=0))
+    return (
+        _timed(lambda index: field.get_result(f"images/{index}.jpg").resolve(), ops),
+        None,
+    )
+
+
+BENCHMARKS = {
+    "put_small": bench_put_small,
+    "put_large": bench_put_large,
+    "presign": bench_presign,
+    "presign_cached": bench_presign_cached,
+    "cached_read_large": bench_cached_read_large,
+    "image_save_file": bench_image_save_file,
+    "get_result": bench_get_result,
+    "get_result_resolve": bench_get_result_resolve,
+}
+
+
+def _percentile(latencies: list[float], percent: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _measure(name: str, backend: str, directory: str, quick: bool, queue) -> None:
+    # Imported first, so the RSS growth is the benchmark's own
+    import avcfastapi.core.storage.sqlalchemy.fields  # noqa: F401
+    import avcfastapi.core.storage.storage_class  # noqa: F401
+
+    try:
+        ops = SIZES[name][quick]
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        latencies, object_size = BENCHMARKS[name](backend, directory, ops, quick)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception as e:
+        queue.put({"benchmark": name, "backend": backend, "error": repr(e)})
+        return
+
+    seconds = sum(latencies)
+    result = {
+        "benchmark": name,
+        "backend": backend,
+        "ops": ops,
+        "seconds": round(seconds, 4),
+        "ops_per_s": round(ops / seconds, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 4),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(rss_after / 1024, 1),
+        "peak_rss_growth_mb": round((rss_after - rss_before) / 1024, 1),
+    }
+    if object_size is not None:
+        result["mb_per_s"] = round(ops * object_size / seconds / 1024**2, 2)
+    queue.put(result)
+
+
+def _start_s3(endpoint_url):
+    """Start a local moto server unless an endpoint is given, and create the bucket."""
+    import boto3
+
+    server = None
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        # Keep the request log of the server out of the results
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+        server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+    # Picked up by every boto3 client, including the ones `S3Storage` creates
+    os.environ["AWS_ENDPOINT_URL_S3"] = endpoint_url
+    client = boto3.client("s3", region_name=REGION)
+    try:
+        client.create_bucket(Bucket=BUCKET)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    return server
+
+
+def _wait_result(process, queue, name: str, backend: str) -> dict:
+    """Result of a benchmark process, or an error if it died without one."""
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            if not process.is_alive():
+                break
+    # The result may have been sent just before the process exited
+    try:
+        return queue.get(timeout=1)
+    except Empty:
+        return {
+            "benchmark": name,
+            "backend": backend,
+            "error": f"process exited with code {process.exitcode}",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_storage")
+    parser.add_argument(
+        "--backends", nargs="+", choices=["fs", "s3"], default=["fs", "s3"]
+    )
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Fewer, smaller operations."
+    )
+    parser.add_argument(
+        "--endpoint-url", default=None, help="S3 endpoint to use instead of moto."
+    )
+    parser.add_argument(
+        "--output", default=None, help="Append the results to this file."
+    )
+    args = parser.parse_args()
+
+    server = _start_s3(args.endpoint_url) if "s3" in args.backends else None
+    # Peak RSS survives fork and exec, so start the server before any large
+    # object is allocated here
+    context = multiprocessing.get_context("forkserver")
+    multiprocessing.forkserver.ensure_running()
+
+    output = open(args.output, "a") if args.output else None
+    directory = tempfile.mkdtemp(prefix="bench-storage-")
+    try:
+        for backend in args.backends:
+            for name in args.benchmarks:
+                queue = context.Queue()
+                process = context.Process(
+                    target=_measure,
+                    args=(name, backend, directory, args.quick, queue),
+                )
+                process.start()
+                result = _wait_result(process, queue, name, backend)
+                process.join()
+                line = json.dumps(result)
+                print(line, flush=True)
+                if output is not None:
+                    output.write(line + "\n")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        if output is not None:
+            output.close()
+        if server is not None:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
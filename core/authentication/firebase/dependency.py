@@ -5,6 +5,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .models import DecodedToken
 from . import firebase_client
 from ...exception.authentication import UnauthorizedException
+from ...utils.timing import span
 
 
 http_bearer = HTTPBearer(auto_error=False)
@@ -17,7 +18,10 @@ async def firebase_authenticate(
         raise UnauthorizedException(
             "Missing or invalid authentication token.",
         )
-    response = firebase_client.verify_token(token.credentials, fetch_user_info=False)
+    with span("auth"):
+        response = firebase_client.verify_token(
+            token.credentials, fetch_user_info=False
+        )
     if not response or not response.decoded_token:
         raise UnauthorizedException(
             "Invalid authentication token.",
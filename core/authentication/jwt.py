@@ -10,6 +10,7 @@ import jwt
 
 from ..settings import settings
 from ..exception.authentication import ForbiddenException
+from ..utils.timing import timed
 
 
 T = TypeVar("T")
@@ -71,6 +72,7 @@ class _JWTAuthentication:
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
         return encoded_jwt
 
+    @timed("auth")
     async def verify_access_token(self, token: str) -> T:
         if self.provider is None:
             raise RuntimeError(
@@ -2,14 +2,38 @@ from typing import Annotated
 from fastapi.params import Depends
 import motor.motor_asyncio
 import pymongo
+from pymongo import monitoring
 from pymongo.errors import DuplicateKeyError
 from .settings import settings
+from ...settings import settings as core_settings
+from ...utils.timing import record
+
+
+class _CommandTimingListener(monitoring.CommandListener):
+    """
+    Records commands as `mongo` spans of the current request. Motor runs them
+    in threads with a copy of the request's context.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record("mongo", event.duration_micros / 1_000_000)
 
 
 class _Connection:
     def __init__(self):
         """Initialize connection only (without schema)."""
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(settings.DATABASE_URL)
+        event_listeners = []
+        if core_settings.SERVER_TIMING:
+            event_listeners.append(_CommandTimingListener())
+        self.client = motor.motor_asyncio.AsyncIOMotorClient(
+            settings.DATABASE_URL, event_listeners=event_listeners
+        )
         self.db = self.client.get_database(name=settings.DATABASE_NAME)
         self.schema: dict[str, dict] = {}
 
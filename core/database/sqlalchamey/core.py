@@ -1,41 +1,174 @@
-import logging
-import os
-from typing import Annotated
+import time
+from typing import Annotated, Optional
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 
 from .listeners import add_loader_criteria
 from .settings import settings
+from .sql_logging import setup_sql_logging
+from .timing import setup_server_timing
+from ...utils.timing import record
 from apps.registry import *
 
-engine = create_async_engine(settings.DATABASE_URL)
 
-AsyncSessionLocal = async_sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+class _PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, wait: float):
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+
+
+_pool_wait_stats = _PoolWaitStats()
+
+
+class _InstrumentedQueue(AsyncAdaptedQueue):
+    """
+    Queue of the idle connections, recording how long checkouts block on it.
+    Opening a new connection happens outside the queue, so it isn't counted.
+    """
+
+    def get(self, block=True, timeout=None):
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            wait = time.perf_counter() - start
+            _pool_wait_stats.record_wait(wait)
+            record("db_pool", wait)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    _queue_class = _InstrumentedQueue
+    wait_stats = _pool_wait_stats
+
+    def connect(self):
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        self.wait_stats.checkouts += 1
+        return connection
+
+
+_engine: Optional[AsyncEngine] = None
+
+
+class _LazyAsyncSessionMaker(async_sessionmaker):
+    """Session factory creating the engine on first use, see `get_engine`."""
+
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+
+# Bound to the engine when the first session is created, so scripts and
+# background jobs can use `AsyncSessionLocal()` without calling `init_engine`
+AsyncSessionLocal = _LazyAsyncSessionMaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
 
-async def get_session():
-    async with AsyncSessionLocal() as session:
-        add_loader_criteria(session)
-        yield session
+def _create_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        connect_args={
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": settings.DATABASE_SERVER_SETTINGS,
+        },
+    )
 
 
-SessionDep = Annotated[AsyncSession, Depends(get_session)]
+def get_engine() -> AsyncEngine:
+    """
+    Return the async engine, creating it on first use.
+
+    The engine is created lazily (normally from the app lifespan) so that worker
+    processes never inherit a connection pool from the parent across fork.
+    """
+    global _engine
+    if _engine is None:
+        _engine = _create_engine()
+        setup_sql_logging(_engine)
+        setup_server_timing(_engine)
+        AsyncSessionLocal.configure(bind=_engine)
+    return _engine
+
+
+async def init_engine():
+    """Create the engine, called on application startup."""
+    get_engine()
+
 
-# setup logging for sqlalchamey
+async def dispose_engine():
+    """Close all pooled connections and drop the engine, called on shutdown."""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
 
-logger = logging.getLogger("sqlalchemy.engine")
-logger.setLevel(logging.INFO)
-logger.propagate = False
-logger.handlers.clear()
 
-os.makedirs("logs", exist_ok=True)
+def get_pool_stats() -> dict:
+    """
+    Return connection pool statistics for observability.
+    """
+    stats = {
+        "checkouts": _pool_wait_stats.checkouts,
+        "timeouts": _pool_wait_stats.timeouts,
+        "wait_ms_total": round(_pool_wait_stats.wait_total * 1000, 3),
+        "wait_ms_max": round(_pool_wait_stats.wait_max * 1000, 3),
+    }
+    if _engine is None:
+        return stats
+    pool = _engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **stats,
+    }
 
-file_handler = logging.FileHandler("logs/sql.log")
-file_handler.setLevel(logging.INFO)
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
+def __getattr__(name: str):
+    # Keeps `from .core import engine` working with the lazily created engine.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-logger.addHandler(file_handler)
+
+async def get_session():
+    async with AsyncSessionLocal() as session:
+        add_loader_criteria(session)
+        yield session
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
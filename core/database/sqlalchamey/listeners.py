@@ -4,10 +4,16 @@ from sqlalchemy import event
 from sqlalchemy.orm import Query
 from sqlalchemy.orm import with_loader_criteria
 
+# Execution option to skip the soft delete filter, e.g. for admin queries:
+#   select(User).execution_options(include_deleted=True)
+INCLUDE_DELETED = "include_deleted"
+
 
 def add_loader_criteria(session):
     @event.listens_for(session.sync_session, "do_orm_execute")
     def _add_criteria(execute_state):
+        if execute_state.execution_options.get(INCLUDE_DELETED, False):
+            return
         execute_state.statement = execute_state.statement.options(
             with_loader_criteria(
                 SoftDeleteMixin,
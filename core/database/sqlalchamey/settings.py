@@ -10,6 +10,28 @@ class SqlalchameySettings(BaseSettings):
     DATABASE_PASSWORD: str
     DATABASE_NAME: str
 
+    # Connection pool
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+
+    # Statement caches
+    DATABASE_QUERY_CACHE_SIZE: int = 500
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # asyncpg server settings, e.g. {"application_name": "api", "jit": "off"}
+    DATABASE_SERVER_SETTINGS: dict[str, str] = {}
+
+    # Query logging, written from a background thread
+    DATABASE_SQL_LOG: bool = False
+    DATABASE_SQL_LOG_FILE: str = "logs/sql.log"
+    DATABASE_SQL_LOG_SLOW_MS: float = 0
+    DATABASE_SQL_LOG_SAMPLE_RATE: float = 1.0
+    DATABASE_SQL_LOG_PARAMETERS: bool = False
+
     @property
     def cors_origins(self) -> list[str]:
         if isinstance(self.CORS_ORIGINS, str):
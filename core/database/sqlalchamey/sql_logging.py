@@ -0,0 +1,95 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from sqlalchemy import event
+
+from .settings import settings
+
+logger = logging.getLogger("sqlalchemy.queries")
+
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener():
+    """
+    Route the query logger through a queue so the file is written by a
+    background thread and never on the event loop.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_dir = os.path.dirname(settings.DATABASE_SQL_LOG_FILE)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = logging.FileHandler(settings.DATABASE_SQL_LOG_FILE)
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+
+    log_queue = queue.SimpleQueue()
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(stop_sql_logging)
+
+
+def stop_sql_logging():
+    """Flush pending records and stop the background writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is dropped with it when the
+    # statement fails and `after_cursor_execute` never fires
+    if context is not None:
+        context._sql_log_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_sql_log_start", None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if elapsed_ms < settings.DATABASE_SQL_LOG_SLOW_MS:
+        return
+    if random.random() >= settings.DATABASE_SQL_LOG_SAMPLE_RATE:
+        return
+    if settings.DATABASE_SQL_LOG_PARAMETERS:
+        logger.info("%.2f ms | %s | %r", elapsed_ms, statement, parameters)
+    else:
+        logger.info("%.2f ms | %s", elapsed_ms, statement)
+
+
+def setup_sql_logging(engine):
+    """
+    Log statements of `engine` with their timings, if enabled in the settings.
+
+    Only statements slower than `DATABASE_SQL_LOG_SLOW_MS` are considered, and
+    of those a `DATABASE_SQL_LOG_SAMPLE_RATE` fraction is logged.
+
+    Args:
+        engine: A sync `Engine` or an `AsyncEngine`.
+    """
+    if not settings.DATABASE_SQL_LOG:
+        return
+    engine = getattr(engine, "sync_engine", engine)
+    _start_listener()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -2,6 +2,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .settings import settings
+from .sql_logging import setup_sql_logging
 
 _sync_engine = None
 SessionLocal = None
@@ -11,7 +12,8 @@ def get_db_session():
     global _sync_engine, SessionLocal
     if _sync_engine is None:
         sync_url = settings.DATABASE_URL_SYNC
-        _sync_engine = create_engine(sync_url, echo=True)
+        _sync_engine = create_engine(sync_url)
+        setup_sql_logging(_sync_engine)
         SessionLocal = sessionmaker(
             bind=_sync_engine, autocommit=False, autoflush=False
         )
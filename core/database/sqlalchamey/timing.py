@@ -0,0 +1,33 @@
+import time
+
+from sqlalchemy import event
+
+from ...settings import settings as core_settings
+from ...utils.timing import get_timings, record
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and get_timings() is not None:
+        context._server_timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_server_timing_start", None)
+    if start is not None:
+        record("db", time.perf_counter() - start)
+
+
+def setup_server_timing(engine):
+    """
+    Record the statements of `engine` as `db` spans of the current request, if
+    `SERVER_TIMING` is enabled. The async driver runs statements in greenlets
+    sharing the request's context, so no session needs to be passed around.
+
+    Args:
+        engine: A sync `Engine` or an `AsyncEngine`.
+    """
+    if not core_settings.SERVER_TIMING:
+        return
+    engine = getattr(engine, "sync_engine", engine)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,4 +1,5 @@
 from contextlib import asynccontextmanager
+import sys
 import traceback
 import uuid
 from fastapi import Request
@@ -18,29 +19,109 @@ from ..app.exception_handlers import (
 )
 from ..response.response_class import CustomORJSONResponse
 from ..loaders.router import autoload_routers
+from ..middlewares.latency import latency_registry
 from ..middlewares.process_time_middleware import ProcessingTimeMiddleware
 from ...settings import settings
 
+_CORE_PACKAGE = __name__.rsplit(".fastapi.app", 1)[0]
 
-def create_app(apps_dir: str = "apps", on_startup=None, on_shutdown=None):
+
+def _get_core_module(name: str):
+    """
+    Return a core module if the application has imported it, else None.
+
+    Routers are loaded before the lifespan starts, so any app using e.g.
+    `SessionDep` has imported the module by then.
+    """
+    return sys.modules.get(f"{_CORE_PACKAGE}.{name}")
+
+
+def _get_sqlalchemy_core():
+    """
+    Return the SQLAlchemy core module if the application uses it.
+    Apps without SQLAlchemy never import it.
+    """
+    return _get_core_module("database.sqlalchamey.core")
+
+
+def create_app(
+    apps_dir: str = "apps",
+    on_startup=None,
+    on_shutdown=None,
+    metrics_path: str | None = None,
+):
+    """
+    Create the application with the routers found in `apps_dir`.
+
+    Args:
+        apps_dir (str): Directory of the apps, see `autoload_routers`.
+        on_startup: Coroutine function awaited on startup.
+        on_shutdown: Coroutine function awaited on shutdown.
+        metrics_path (str, optional): Path of an endpoint serving the request
+            latency histograms and database pool stats, e.g. "/api/metrics".
+            It has no authentication, so only enable it where the path is not
+            reachable publicly. Disabled by default.
+    """
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        sqlalchemy_core = _get_sqlalchemy_core()
+        if sqlalchemy_core:
+            await sqlalchemy_core.init_engine()
         if on_startup:
             await on_startup()
         print("AVC CORE:: Cooking ...")
         yield
         if on_shutdown:
             await on_shutdown()
+        if sqlalchemy_core:
+            await sqlalchemy_core.dispose_engine()
+        imaging = _get_core_module("storage.imaging")
+        if imaging:
+            imaging.shutdown_image_executor()
         print("AVC CORE:: Cooked !")
 
     app = FastAPI(lifespan=lifespan, default_response_class=CustomORJSONResponse)
 
-    router = autoload_routers(apps_dir)
+    router = autoload_routers(
+        apps_dir,
+        manifest_path=settings.ROUTER_MANIFEST,
+        report=settings.ROUTER_IMPORT_REPORT,
+    )
 
     app.include_router(router=router)
 
-    app.add_middleware(ProcessingTimeMiddleware)
+    variants = _get_core_module("storage.variants")
+    if variants and variants.image_fields:
+        # Some image field renders its variants on first request
+        app.include_router(router=variants.variant_router)
+
+    if _get_core_module("fastapi.response.cache"):
+        # Some route caches its responses, stored once rendered by this middleware
+        from ..middlewares.response_cache import ResponseCacheMiddleware
+
+        app.add_middleware(ResponseCacheMiddleware)
+
+    if settings.COMPRESSION_ENABLED:
+        # Outside the response cache, which stores responses uncompressed
+        from ..middlewares.compression import CompressionMiddleware
+
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+            zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+            thread_threshold=settings.COMPRESSION_THREAD_THRESHOLD,
+        )
+
+    if settings.SERVER_TIMING:
+        # Outside compression, so its time is included in the header
+        from ..middlewares.server_timing import ServerTimingMiddleware
+
+        app.add_middleware(ServerTimingMiddleware)
+
+    app.add_middleware(ProcessingTimeMiddleware, registry=latency_registry)
 
     app.add_middleware(
         CORSMiddleware,
@@ -84,4 +165,14 @@ def create_app(apps_dir: str = "apps", on_startup=None, on_shutdown=None):
             content="<html><h1>Haa shit! My Code is working.</h1></html>"
         )
 
+    if metrics_path:
+
+        @app.get(metrics_path, summary="Request latency metrics", tags=["Health Check"])
+        def metrics():
+            content = {"routes": latency_registry.snapshot()}
+            sqlalchemy_core = _get_sqlalchemy_core()
+            if sqlalchemy_core:
+                content["database_pool"] = sqlalchemy_core.get_pool_stats()
+            return content
+
     return app
@@ -1,9 +1,21 @@
+import threading
 from typing import Type, TypeVar, Callable, Dict, Any
 from fastapi import Depends
 from inspect import Parameter, Signature
 
 T = TypeVar("T", bound="AbstractService")
 
+# A new instance of the service for every request (FastAPI still shares it
+# between the dependencies of one request)
+REQUEST_SCOPE = "request"
+# A single instance of the service per process
+APP_SCOPE = "app"
+
+_SCOPES = {REQUEST_SCOPE: REQUEST_SCOPE, APP_SCOPE: APP_SCOPE, "singleton": APP_SCOPE}
+
+# Reentrant, an app scoped service may get another one in its __init__
+_lock = threading.RLock()
+
 
 class AbstractService:
     """
@@ -19,6 +31,27 @@ class AbstractService:
     #                (e.g., Annotated[AsyncSession, Depends(get_db)]).
     DEPENDENCIES: Dict[str, Any] = {}
 
+    # How long an instance of the service lives, `REQUEST_SCOPE` or `APP_SCOPE`
+    # ("singleton" is accepted for the latter). App scoped services are built
+    # once per process, for stateless services holding e.g. heavy API clients.
+    # They can't declare `DEPENDENCIES`, as those are resolved per request.
+    SCOPE: str = REQUEST_SCOPE
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        scope = _SCOPES.get(cls.SCOPE)
+        if scope is None:
+            raise TypeError(
+                f"{cls.__name__}.SCOPE must be one of {', '.join(_SCOPES)}, "
+                f"got {cls.SCOPE!r}"
+            )
+        if scope == APP_SCOPE and cls.DEPENDENCIES:
+            raise TypeError(
+                f"{cls.__name__} is app scoped and can't have DEPENDENCIES, "
+                "they are resolved per request"
+            )
+        cls.SCOPE = scope
+
     def __init__(self, **kwargs: Any):
         """
         Initialize the service with all its dependencies.
@@ -43,11 +76,35 @@ class AbstractService:
         # to its __init__ method.
         return cls(**kwargs)
 
+    @classmethod
+    def get_instance(cls: Type[T]) -> T:
+        """
+        Returns the process wide instance of an app scoped service, building it
+        on first use. Also usable outside of requests, e.g. in scripts.
+
+        :return: The instance of the service class (cls).
+        """
+        if cls.SCOPE != APP_SCOPE:
+            raise TypeError(f"{cls.__name__} is not app scoped")
+        # Looked up on the class itself, subclasses have their own instance
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            with _lock:
+                instance = cls.__dict__.get("_instance")
+                if instance is None:
+                    instance = cls()
+                    cls._instance = instance
+        return instance
+
     @classmethod
     def get_dependency(cls: Type[T]) -> Callable[..., T]:
         """
         Returns a FastAPI dependency callable for this service.
 
+        The dependency is built once per class, so FastAPI recognizes it as the
+        same dependency wherever it's used and resolves it, and the service's
+        own dependencies, once per request.
+
         This method dynamically constructs a function signature based on the `DEPENDENCIES`
         class attribute of the current service class (cls). FastAPI inspects this signature
         to know which dependencies to resolve and inject.
@@ -57,6 +114,26 @@ class AbstractService:
 
         :return: A callable suitable for use with FastAPI's `Depends()`.
         """
+        dependency = cls.__dict__.get("_dependency")
+        if dependency is None:
+            with _lock:
+                dependency = cls.__dict__.get("_dependency")
+                if dependency is None:
+                    dependency = cls._build_dependency()
+                    cls._dependency = dependency
+        return dependency
+
+    @classmethod
+    def _build_dependency(cls: Type[T]) -> Callable[..., T]:
+        if cls.SCOPE == APP_SCOPE:
+            # Nothing to resolve per request. A coroutine function runs on the
+            # event loop, instead of taking a thread pool hop on every request.
+            async def app_dependency_callable() -> T:
+                return cls.get_instance()
+
+            app_dependency_callable.__name__ = f"_get_{cls.__name__.lower()}_service"
+            return Depends(app_dependency_callable)
+
         parameters = []
         # Get the dependencies specific to the current class (cls).
         # `getattr` with a default ensures it works even if a subclass doesn't define DEPENDENCIES.
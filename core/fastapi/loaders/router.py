@@ -1,4 +1,8 @@
 import os
+import sys
+import json
+import time
+import importlib
 import importlib.util
 import traceback
 from typing import Optional
@@ -7,13 +11,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Bumped when the manifest format changes, older manifests are rebuilt
+MANIFEST_VERSION = 1
 
-def autoload_routers(base_path: str) -> APIRouter:
+
+def autoload_routers(
+    base_path: str,
+    manifest_path: Optional[str] = None,
+    report: bool = False,
+) -> APIRouter:
     """
     Recursively load all routers from the given base path.
 
+    Every directory with a `router.py` exposing a `router` variable is loaded,
+    and its router is included in the router of the parent directory.
+    Routers are imported as dotted modules, e.g. `apps.users.router`, when the
+    base path is importable from `sys.path`, so modules they share are
+    imported once and relative imports work.
+
     Args:
         base_path: The base directory path to start looking for routers
+        manifest_path: File caching the discovered routers and the modification
+            times of the directories searched. Later starts only stat these
+            directories instead of walking the tree, and rebuild the manifest
+            when one of them changed.
+        report: Print the import time of every router
 
     Returns:
         APIRouter: The main router with all sub-routers mounted
@@ -26,20 +48,203 @@ def autoload_routers(base_path: str) -> APIRouter:
     if not os.path.isfile(base_router_path):
         raise FileNotFoundError(f"No router.py found at {base_path}")
 
-    # Import the base router
-    main_router = _import_router_from_path(base_router_path)
+    router_dirs = None
+    if manifest_path:
+        router_dirs = _load_manifest(manifest_path, base_path)
+    if router_dirs is None:
+        router_dirs, dir_mtimes = _discover_routers(base_path)
+        if manifest_path:
+            _write_manifest(manifest_path, base_path, router_dirs, dir_mtimes)
+
+    package = _get_package_name(base_path)
+    routers = {}
+    timings = []
+    start = time.perf_counter()
+    for router_dir in router_dirs:
+        parent = os.path.dirname(router_dir)
+        # A router that failed to load drops the routers below it
+        if router_dir and routers.get(parent) is None:
+            continue
+        import_start = time.perf_counter()
+        routers[router_dir], name = _import_router(base_path, router_dir, package)
+        timings.append((time.perf_counter() - import_start, name))
+    if report:
+        _print_report(timings, time.perf_counter() - start)
+
+    main_router = routers.get("")
     if not main_router:
         raise ValueError(
             f"router.py at {base_path} does not contain a valid router variable"
         )
 
     # Recursively include all sub-routers
-    visited_paths = set()
-    _include_sub_routers(base_path, main_router, visited_paths=visited_paths)
+    children = {}
+    for router_dir, router in routers.items():
+        if router_dir and router is not None:
+            children.setdefault(os.path.dirname(router_dir), []).append(router_dir)
+    _include_sub_routers("", routers, children)
 
     return main_router
 
 
+def _discover_routers(base_path: str) -> tuple[list[str], dict[str, int]]:
+    """
+    Find the directories with a router.py, parents before their children.
+    Directories without one are not searched further.
+
+    Returns:
+        tuple: Router directories relative to the base path, '' for the base
+            router, and the modification times of every directory checked.
+    """
+    router_dirs = []
+    dir_mtimes = {"": os.stat(base_path).st_mtime_ns}
+    visited_paths = set()
+
+    def visit(router_dir: str):
+        directory = os.path.join(base_path, router_dir)
+        # Symlinked directories could lead back here
+        real_path = os.path.realpath(directory)
+        if real_path in visited_paths:
+            return
+        visited_paths.add(real_path)
+        router_dirs.append(router_dir)
+
+        with os.scandir(directory) as entries:
+            subdirs = sorted(
+                (
+                    entry
+                    for entry in entries
+                    if not entry.name.startswith("_") and entry.is_dir()
+                ),
+                key=lambda entry: entry.name,
+            )
+        for entry in subdirs:
+            subdir = os.path.join(router_dir, entry.name) if router_dir else entry.name
+            # Creating or removing its router.py changes the directory's mtime
+            dir_mtimes[subdir] = entry.stat().st_mtime_ns
+            if os.path.isfile(os.path.join(entry.path, "router.py")):
+                visit(subdir)
+
+    visit("")
+    return router_dirs, dir_mtimes
+
+
+def _load_manifest(manifest_path: str, base_path: str) -> Optional[list[str]]:
+    """Router directories of a manifest, or None if it's missing or stale."""
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable router manifest {manifest_path}: {e}")
+        return None
+
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("base_path") != os.path.abspath(base_path)
+    ):
+        return None
+    for directory, mtime in manifest["directories"].items():
+        try:
+            if os.stat(os.path.join(base_path, directory)).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+    return manifest["routers"]
+
+
+def _write_manifest(
+    manifest_path: str,
+    base_path: str,
+    router_dirs: list[str],
+    dir_mtimes: dict[str, int],
+) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "base_path": os.path.abspath(base_path),
+        "routers": router_dirs,
+        "directories": dir_mtimes,
+    }
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=2)
+        # Several workers starting at once must not read a partial manifest
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        # e.g. a read-only file system, routers are discovered on every start
+        logger.warning(f"Could not write router manifest {manifest_path}: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def _get_package_name(base_path: str) -> Optional[str]:
+    """
+    Dotted name the base path is importable as, e.g. 'apps', from the first
+    `sys.path` entry containing it, or None if it isn't importable.
+    """
+    real_path = os.path.realpath(base_path)
+    for entry in sys.path:
+        root = os.path.realpath(entry or os.getcwd())
+        relative = os.path.relpath(real_path, root)
+        if relative == "." or relative.startswith(".."):
+            continue
+        parts = relative.split(os.sep)
+        if all(part.isidentifier() for part in parts):
+            return ".".join(parts)
+    return None
+
+
+def _import_router(
+    base_path: str, router_dir: str, package: Optional[str]
+) -> tuple[Optional[APIRouter], str]:
+    """
+    Import the router of a directory as a dotted module if possible, else from
+    its file path.
+
+    Returns:
+        tuple: The router, or None if it failed to load, and the name it was
+            imported as.
+    """
+    router_path = os.path.join(base_path, router_dir, "router.py")
+    parts = router_dir.split(os.sep) if router_dir else []
+    if package is None or not all(part.isidentifier() for part in parts):
+        return _import_router_from_path(router_path), router_path
+
+    module_name = ".".join([package, *parts, "router"])
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"Error importing router from {router_path}: {str(e)}")
+        return None, module_name
+
+    module_file = getattr(module, "__file__", None)
+    if not module_file or not os.path.samefile(module_file, router_path):
+        # Another package of the same name comes first on sys.path
+        logger.warning(
+            f"{module_name} resolves to {module_file}, importing {router_path} by path"
+        )
+        return _import_router_from_path(router_path), router_path
+
+    router = getattr(module, "router", None)
+    if not isinstance(router, APIRouter):
+        logger.warning(f"No valid router found in {router_path}")
+        return None, module_name
+    return router, module_name
+
+
+def _print_report(timings: list[tuple[float, str]], total: float) -> None:
+    print(f"AVC CORE:: Imported {len(timings)} routers in {total * 1000:.1f} ms")
+    # Shared modules are counted in the first router importing them
+    for seconds, name in sorted(timings, reverse=True):
+        print(f"AVC CORE::   {seconds * 1000:9.1f} ms  {name}")
+
+
 def _import_router_from_path(router_path: str) -> Optional[APIRouter]:
     """
     Import a router from a specific file path.
@@ -75,38 +280,17 @@ def _import_router_from_path(router_path: str) -> Optional[APIRouter]:
 
 
 def _include_sub_routers(
-    directory: str, parent_router: APIRouter, visited_paths: set
+    router_dir: str, routers: dict[str, APIRouter], children: dict[str, list[str]]
 ) -> None:
     """
-    Recursively find and include all sub-routers.
+    Recursively include the routers of the subdirectories of a router directory,
+    each one after its own sub-routers.
 
     Args:
-        directory: The directory to search for sub-routers
-        parent_router: The parent router to include sub-routers in
-        visited_paths: Set of paths already visited to avoid infinite recursion
+        router_dir: The router directory, relative to the base path
+        routers: Loaded routers by directory
+        children: Router directories by their parent directory
     """
-    # Add current directory to visited paths
-    visited_paths.add(os.path.abspath(directory))
-
-    # Get all subdirectories
-    subdirs = [
-        d
-        for d in os.listdir(directory)
-        if os.path.isdir(os.path.join(directory, d)) and not d.startswith("_")
-    ]
-
-    # Check each subdirectory for router.py
-    for subdir in subdirs:
-        subdir_path = os.path.join(directory, subdir)
-        router_file = os.path.join(subdir_path, "router.py")
-
-        # Skip if this path was already visited
-        if os.path.abspath(subdir_path) in visited_paths:
-            continue
-
-        # If router.py exists, import it and include in parent router
-        if os.path.isfile(router_file):
-            sub_router = _import_router_from_path(router_file)
-            if sub_router:
-                _include_sub_routers(subdir_path, sub_router, visited_paths)
-                parent_router.include_router(sub_router)
+    for child in children.get(router_dir, ()):
+        _include_sub_routers(child, routers, children)
+        routers[router_dir].include_router(routers[child])
@@ -0,0 +1,276 @@
+import zlib
+from typing import Callable, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...utils.timing import span
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content types not worth compressing again, e.g. images served from storage
+EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/x-brotli",
+    "application/pdf",
+    "application/octet-stream",
+    "text/event-stream",
+)
+# Compressible despite the prefixes above
+INCLUDED_CONTENT_TYPES = ("image/svg+xml",)
+
+# Encodings in order of preference, among those the client accepts equally
+ENCODINGS = ("zstd", "br", "gzip")
+
+
+def get_available_encodings() -> tuple[str, ...]:
+    """Encodings whose compression library is installed."""
+    available = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return tuple(encoding for encoding in ENCODINGS if available[encoding])
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Pick the encoding of a response from an `Accept-Encoding` header: the one
+    with the highest q-value, ties broken by the order of `encodings`.
+    """
+    q_values = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_values[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = q_values.get(encoding, q_values.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _weaken_etag(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        # The compressed body is not byte for byte the same
+        headers["ETag"] = f"W/{etag}"
+
+
+def _gzip_compressor(level: int) -> Callable[[bytes, bool], bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return compressor.compress(data) + compressor.flush(flush_mode)
+
+    return compress
+
+
+def _brotli_compressor(quality: int) -> Callable[[bytes, bool], bytes]:
+    compressor = brotli.Compressor(quality=quality)
+
+    def compress(data: bytes, final: bool) -> bytes:
+        output = compressor.process(data)
+        return output + (compressor.finish() if final else compressor.flush())
+
+    return compress
+
+
+def _zstd_compressor(level: int) -> Callable[[bytes, bool], bytes]:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(data: bytes, final: bool) -> bytes:
+        flush_mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return compressor.compress(data) + compressor.flush(flush_mode)
+
+    return compress
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with zstd, brotli or gzip, as
+    negotiated with the client's `Accept-Encoding`.
+
+    Responses smaller than `minimum_size`, already encoded, partial, or of an
+    excluded content type are sent as they are. Streaming responses are
+    compressed chunk by chunk. Bodies of at least `thread_threshold` bytes are
+    compressed in a thread, so the event loop keeps serving other requests.
+    zstd and brotli need the `zstandard` and `brotli` packages, encodings
+    whose package is missing are not offered.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        encodings: Optional[Sequence[str]] = None,
+        excluded_content_types: Sequence[str] = EXCLUDED_CONTENT_TYPES,
+        thread_threshold: int = 256 * 1024,
+    ):
+        """
+        Args:
+            app (ASGIApp): The application.
+            minimum_size (int): Smallest body compressed, in bytes.
+            gzip_level (int): gzip level, 1 to 9.
+            brotli_quality (int): brotli quality, 0 to 11. Qualities above 5
+                cost much more CPU for a few percent smaller responses.
+            zstd_level (int): zstd level, 1 to 22.
+            encodings (Sequence[str], optional): Encodings offered, in order of
+                preference. Defaults to every available one of zstd, br and gzip.
+            excluded_content_types (Sequence[str]): Content type prefixes sent
+                uncompressed.
+            thread_threshold (int): Bodies and chunks of at least this many
+                bytes are compressed in a thread.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        available = get_available_encodings()
+        self.encodings = tuple(
+            encoding for encoding in (encodings or available) if encoding in available
+        )
+        self.excluded_content_types = tuple(excluded_content_types)
+        self.thread_threshold = thread_threshold
+        self.compressors = {
+            "gzip": lambda: _gzip_compressor(gzip_level),
+            "br": lambda: _brotli_compressor(brotli_quality),
+            "zstd": lambda: _zstd_compressor(zstd_level),
+        }
+
+    def is_compressible(self, content_type: str) -> bool:
+        content_type = content_type.lower()
+        if content_type.startswith(INCLUDED_CONTENT_TYPES):
+            return True
+        return not content_type.startswith(self.excluded_content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Compresses the messages of one response, see `CompressionMiddleware`."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compress: Optional[Callable[[bytes, bool], bytes]] = None
+        self.passthrough = False
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        with span("compress"):
+            if len(data) >= self.middleware.thread_threshold:
+                return await run_in_threadpool(self.compress, data, final)
+            return self.compress(data, final)
+
+    def _should_compress(self, headers: MutableHeaders, message: Message) -> bool:
+        status = self.start_message["status"]
+        content_type = headers.get("content-type", "")
+        if status == 304 and "content-encoding" not in headers:
+            # 304s usually carry no content type, the response they validate
+            # is assumed to have been compressed, and get its ETag and Vary
+            if not content_type or self.middleware.is_compressible(content_type):
+                headers.add_vary_header("Accept-Encoding")
+                _weaken_etag(headers)
+            return False
+        if status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if not content_type or not self.middleware.is_compressible(content_type):
+            return False
+        # Caches must keep the compressed and uncompressed responses apart
+        headers.add_vary_header("Accept-Encoding")
+
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            try:
+                content_length = int(headers["content-length"])
+            except (KeyError, ValueError):
+                # Unknown length, a stream is assumed to be large
+                return True
+            return content_length >= self.middleware.minimum_size
+        return len(body) >= self.middleware.minimum_size
+
+    async def send(self, message: Message):
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if self.compress is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if message["type"] != "http.response.body" or not self._should_compress(
+                headers, message
+            ):
+                # e.g. a file sent with the path send extension
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.compress = self.middleware.compressors[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            _weaken_etag(headers)
+            more_body = message.get("more_body", False)
+            body = await self._compress(message.get("body", b""), not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self._send(self.start_message)
+            await self._send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+            return
+
+        more_body = message.get("more_body", False)
+        body = await self._compress(message.get("body", b""), not more_body)
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
@@ -0,0 +1,116 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+# Bucket upper bounds in milliseconds, growing by ~10% from 0.05 ms to ~2 min.
+# A percentile read from the histogram is therefore within 10% of the real value.
+_BUCKET_GROWTH = 1.1
+_BUCKET_BOUNDS: List[float] = []
+_bound = 0.05
+while _bound < 120_000:
+    _BUCKET_BOUNDS.append(round(_bound, 3))
+    _bound *= _BUCKET_GROWTH
+
+# Request methods are sent by the client, anything else is recorded as OTHER
+# so arbitrary verbs can't grow the registry
+KNOWN_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"}
+)
+OTHER_METHOD = "OTHER"
+# Route of the samples recorded once the registry holds `max_keys` histograms
+OVERFLOW_ROUTE = "<overflow>"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Samples are recorded from the event loop thread only, so plain integer
+    increments are enough and no lock is taken on the request path.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Return the upper bound of the bucket holding the q-th percentile (0-100).
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index >= len(_BUCKET_BOUNDS):
+                    return round(self.max_ms, 3)
+                return min(_BUCKET_BOUNDS[index], round(self.max_ms, 3))
+        return round(self.max_ms, 3)
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class LatencyRegistry:
+    """
+    Latency histograms keyed by request method, route template and status code.
+
+    Unknown methods are recorded as OTHER. Once `max_keys` histograms exist,
+    samples of new keys go to a single overflow histogram per method.
+    """
+
+    def __init__(self, max_keys: int = 1000):
+        self.max_keys = max_keys
+        self._histograms: Dict[Tuple[str, str, int], LatencyHistogram] = {}
+
+    def record(self, method: str, route: str, status_code: int, value_ms: float):
+        if method not in KNOWN_METHODS:
+            method = OTHER_METHOD
+        key = (method, route, status_code)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            if len(self._histograms) >= self.max_keys:
+                key = (method, OVERFLOW_ROUTE, 0)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        histogram.record(value_ms)
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "method": method,
+                "route": route,
+                "status_code": status_code,
+                **histogram.snapshot(),
+            }
+            for (method, route, status_code), histogram in sorted(
+                self._histograms.items()
+            )
+        ]
+
+    def clear(self):
+        self._histograms.clear()
+
+
+latency_registry = LatencyRegistry()
@@ -1,20 +1,50 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .latency import LatencyRegistry, latency_registry
 
-class ProcessingTimeMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+UNMATCHED_ROUTE = "<unmatched>"
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
 
-        response = await call_next(request)
+class ProcessingTimeMiddleware:
+    """
+    Pure ASGI middleware that sets the `X-Process-Time-MS` header and records the
+    request latency into a histogram keyed by route template and status code.
 
-        processing_time = (time.time() - start_time) * 1000
+    The header carries the time until the response headers were sent, the
+    histogram the time until the response body finished. Streaming responses
+    are passed through untouched.
+    """
 
-        response.headers["X-Process-Time-MS"] = str(round(processing_time, 2))
+    def __init__(self, app: ASGIApp, registry: LatencyRegistry = latency_registry):
+        self.app = app
+        self.registry = registry
 
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                processing_time = (time.perf_counter() - start_time) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time-MS", str(round(processing_time, 2)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.registry.record(
+                scope["method"],
+                route,
+                status_code,
+                (time.perf_counter() - start_time) * 1000,
+            )
@@ -0,0 +1,107 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..response.cache import (
+    UNCACHED_HEADERS,
+    SCOPE_ENABLED,
+    SCOPE_STORE,
+    SCOPE_VARY,
+    CachedResponse,
+    compute_etag,
+    etag_matches,
+    not_modified,
+)
+
+
+def _add_vary(headers: MutableHeaders, vary: tuple[str, ...]):
+    # Cached responses have the headers already
+    listed = {
+        name.strip().lower()
+        for value in headers.getlist("vary")
+        for name in value.split(",")
+    }
+    for header in vary:
+        if header not in listed:
+            headers.add_vary_header(header)
+
+
+class ResponseCacheMiddleware:
+    """
+    Pure ASGI middleware storing the responses of routes decorated with
+    `ResponseCache.cached` once rendered, and adding their ETag.
+
+    Responses of other routes are passed through untouched. The body of a
+    response being cached is buffered, as its ETag header depends on it.
+    Responses of routes with `vary` headers list them in their `Vary` header,
+    so shared caches keep the variants apart too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        scope[SCOPE_ENABLED] = True
+        start_message = None
+        body = []
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+            if start_message is None and message["type"] == "http.response.start":
+                vary = scope.get(SCOPE_VARY)
+                if vary:
+                    _add_vary(MutableHeaders(scope=message), vary)
+                store = scope.get(SCOPE_STORE)
+                headers = Headers(raw=message["headers"])
+                if store is None or message["status"] != 200 or "set-cookie" in headers:
+                    scope.pop(SCOPE_STORE, None)
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._send_cached(scope, start_message, b"".join(body), send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_cached(
+        self, scope: Scope, start_message: Message, body: bytes, send: Send
+    ):
+        cache, key, ttl, tags, versions = scope.pop(SCOPE_STORE)
+        etag = compute_etag(body)
+        headers = [
+            (name, value)
+            for name, value in start_message["headers"]
+            if name.lower() not in UNCACHED_HEADERS
+        ]
+        headers.append((b"etag", etag.encode("latin-1")))
+        response = CachedResponse(
+            status_code=start_message["status"],
+            headers=headers,
+            body=body,
+            etag=etag,
+            tags=tags,
+            tag_versions=versions,
+        )
+        await cache.store(key, response, ttl)
+
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            await not_modified(response)(scope, None, send)
+            return
+        headers = [
+            (name, value)
+            for name, value in start_message["headers"]
+            if name.lower() != b"etag"
+        ]
+        headers += [(b"etag", etag.encode("latin-1")), (b"x-cache", b"MISS")]
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,48 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...utils.timing import get_timings, start_timings, stop_timings
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware collecting the spans core subsystems record during a
+    request, and sending their totals in a `Server-Timing` header:
+
+        Server-Timing: db;dur=12.41;desc="3 calls", storage;dur=4.02;desc="6 calls",
+            auth;dur=1.10;desc="1 call", render;dur=0.85;desc="1 call", total;dur=19.70
+
+    Spans are recorded by the SQLAlchemy engine (`db`, and `db_pool` for
+    connection pool waits), Motor (`mongo`), `Storage` operations (`storage`),
+    JWT and Firebase authentication (`auth`), response rendering (`render`) and
+    compression (`compress`). Spans can overlap, e.g. a query run by the JWT
+    provider counts in both `db` and `auth`. `total` is the time until the
+    response headers were sent, so streamed bodies are not included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        token = start_timings()
+        timings = get_timings()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    timings.get_header(total=time.perf_counter() - start_time),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_timings(token)
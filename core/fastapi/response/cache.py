@@ -0,0 +1,423 @@
+import functools
+import hashlib
+import inspect
+import logging
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Sequence, Union
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Scope keys shared with `ResponseCacheMiddleware`
+SCOPE_ENABLED = "response_cache.enabled"
+SCOPE_STORE = "response_cache.store"
+SCOPE_VARY = "response_cache.vary"
+
+# Parameter added to the signature of cached endpoints without a `Request` one
+_REQUEST_PARAM = "_response_cache_request"
+
+# Request headers identifying the caller, see `ResponseCache.cached`
+IDENTITY_HEADERS = ("authorization", "cookie")
+
+# Response headers never stored with a cached response
+UNCACHED_HEADERS = {b"date", b"etag", b"set-cookie", b"x-cache"}
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response, as stored in a cache backend."""
+
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    tags: tuple[str, ...] = ()
+    # Versions of the tags when the response was rendered, see `invalidate_tags`
+    tag_versions: tuple[int, ...] = ()
+
+    def pack(self) -> bytes:
+        """Serialize the response for an out-of-process backend."""
+        meta = orjson.dumps(
+            {
+                "status_code": self.status_code,
+                "headers": [
+                    [key.decode("latin-1"), value.decode("latin-1")]
+                    for key, value in self.headers
+                ],
+                "etag": self.etag,
+                "tags": self.tags,
+                "tag_versions": self.tag_versions,
+            }
+        )
+        return struct.pack(">I", len(meta)) + meta + self.body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        (length,) = struct.unpack_from(">I", data)
+        meta = orjson.loads(data[4 : 4 + length])
+        return cls(
+            status_code=meta["status_code"],
+            headers=[
+                (key.encode("latin-1"), value.encode("latin-1"))
+                for key, value in meta["headers"]
+            ],
+            body=data[4 + length :],
+            etag=meta["etag"],
+            tags=tuple(meta["tags"]),
+            tag_versions=tuple(meta["tag_versions"]),
+        )
+
+
+class CacheBackend:
+    """
+    Storage of cached responses. Subclass it to keep responses out of process,
+    shared between workers, see `RedisCacheBackend`.
+    """
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def set(self, key: str, response: CachedResponse, ttl: float) -> None:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def get_tag_versions(self, tags: Sequence[str]) -> tuple[int, ...]:
+        """Current version of every tag, 0 for tags never invalidated."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def bump_tags(self, tags: Sequence[str]) -> None:
+        """Increment the version of the tags, so responses rendered before are stale."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU of cached responses, bounded in entries and in bytes.
+    Tracks hits, misses and evictions.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries (int): Responses kept, the least recently used is evicted.
+            max_bytes (int): Total size of the kept response bodies. Responses
+                larger than an eighth of it are not cached.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.tag_versions: dict[str, int] = {}
+        # Only used from the event loop, so no lock is needed
+        self._data: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1].body)
+
+    async def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key, response, ttl):
+        if len(response.body) > self.max_bytes // 8:
+            return
+        self._remove(key)
+        self._data[key] = (time.monotonic() + ttl, response)
+        self.size += len(response.body)
+        while len(self._data) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.evictions += 1
+
+    async def delete(self, key):
+        self._remove(key)
+
+    async def get_tag_versions(self, tags):
+        return tuple(self.tag_versions.get(tag, 0) for tag in tags)
+
+    async def bump_tags(self, tags):
+        for tag in tags:
+            self.tag_versions[tag] = self.tag_versions.get(tag, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_entries,
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cached responses shared between processes in Redis (`pip install redis`)."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "rc:"):
+        """
+        Args:
+            url (str): Redis URL.
+            prefix (str): Prefix of the keys of cached responses and tag versions.
+        """
+        if aioredis is None:
+            raise ImportError("RedisCacheBackend requires the redis package")
+        self.redis = aioredis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key):
+        data = await self.redis.get(f"{self.prefix}r:{key}")
+        return CachedResponse.unpack(data) if data is not None else None
+
+    async def set(self, key, response, ttl):
+        await self.redis.set(
+            f"{self.prefix}r:{key}", response.pack(), px=max(1, int(ttl * 1000))
+        )
+
+    async def delete(self, key):
+        await self.redis.delete(f"{self.prefix}r:{key}")
+
+    async def get_tag_versions(self, tags):
+        if not tags:
+            return ()
+        versions = await self.redis.mget([f"{self.prefix}t:{tag}" for tag in tags])
+        return tuple(int(version or 0) for version in versions)
+
+    async def bump_tags(self, tags):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"{self.prefix}t:{tag}")
+            await pipe.execute()
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _find_request_param(signature: inspect.Signature) -> Optional[str]:
+    """Name of the endpoint's own `Request` parameter, if it has one."""
+    for parameter in signature.parameters.values():
+        annotation = parameter.annotation
+        if isinstance(annotation, type) and issubclass(annotation, Request):
+            return parameter.name
+    return None
+
+
+def not_modified(response: CachedResponse) -> Response:
+    """304 response for a cached response the client has already."""
+    headers = {"etag": response.etag, "x-cache": "HIT"}
+    for key, value in response.headers:
+        if key in (b"cache-control", b"vary"):
+            headers[key.decode("latin-1")] = value.decode("latin-1")
+    return Response(status_code=304, headers=headers)
+
+
+class ResponseCache:
+    """Response cache of the routes decorated with its `cached` method."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or MemoryCacheBackend()
+
+    def get_key(
+        self,
+        request: Request,
+        vary: Sequence[str] = (),
+        key_builder: Optional[Callable[[Request], Optional[str]]] = None,
+    ) -> Optional[str]:
+        """
+        Cache key of a request: method, path, sorted query parameters, the
+        values of the `vary` headers and the value of `key_builder`. None if
+        `key_builder` returns None, meaning the request isn't cached.
+        """
+        parts = [
+            request.method,
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+        ]
+        for header in vary:
+            parts.append(request.headers.get(header, ""))
+        if key_builder is not None:
+            custom = key_builder(request)
+            if custom is None:
+                return None
+            parts.append(custom)
+        # Hashed, so header values such as tokens are never stored in clear
+        return hashlib.blake2b("\0".join(parts).encode(), digest_size=20).hexdigest()
+
+    async def lookup(self, key: str) -> Optional[CachedResponse]:
+        """A cached response, unless expired or invalidated by tag."""
+        response = await self.backend.get(key)
+        if response is None:
+            return None
+        if response.tags:
+            versions = await self.backend.get_tag_versions(response.tags)
+            if versions != response.tag_versions:
+                await self.backend.delete(key)
+                return None
+        return response
+
+    async def store(self, key: str, response: CachedResponse, ttl: float) -> None:
+        try:
+            await self.backend.set(key, response, ttl)
+        except Exception as e:
+            # The response was rendered fine, failing to cache it is no error
+            logger.warning(f"Could not cache response: {e}")
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Make every cached response tagged with one of the tags stale."""
+        await self.backend.bump_tags(tags)
+
+    def cached(
+        self,
+        ttl: float = 60,
+        tags: Union[Iterable[str], Callable[[Request], Iterable[str]]] = (),
+        vary: Sequence[str] = (),
+        key_builder: Optional[Callable[[Request], Optional[str]]] = None,
+    ):
+        """
+        Cache the rendered responses of a GET route.
+
+        Cached responses are sent without running the route, with a strong ETag
+        from a hash of the body, and `If-None-Match` requests matching it get a
+        304. Only 200 responses without cookies are cached. The route's
+        dependencies, e.g. authentication, still run on every request.
+        Requires `ResponseCacheMiddleware`, which `create_app` adds.
+
+        The default key doesn't identify the caller, so requests with an
+        `Authorization` or `Cookie` header are NOT cached unless `vary` or
+        `key_builder` is given. Giving either one states that the key covers
+        whatever the response depends on: a response cached for one user is
+        sent to every request with the same key.
+
+        Example:
+            @router.get("/products")
+            @response_cache.cached(ttl=300, tags=["products"])
+            async def list_products(...):
+                ...
+
+            await response_cache.invalidate_tags("products")
+
+        Args:
+            ttl (float): Seconds a response is cached for.
+            tags (Iterable[str] | Callable): Tags to invalidate the responses
+                by, or a function returning them for a request.
+            vary (Sequence[str]): Request headers the response depends on,
+                e.g. "accept-language", also listed in its `Vary` header. Add
+                "authorization" for responses depending on the user.
+            key_builder (Callable, optional): Returns an extra part of the key
+                for a request, e.g. the user id, or None to skip the cache.
+        """
+        normalized_vary = tuple(header.lower() for header in vary)
+        # Without an explicit key, responses may depend on who is asking
+        skip_identified = not normalized_vary and key_builder is None
+
+        def decorator(endpoint):
+            is_coroutine = inspect.iscoroutinefunction(endpoint)
+            signature = inspect.signature(endpoint)
+            request_param = _find_request_param(signature)
+
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                if request_param is None:
+                    request: Request = kwargs.pop(_REQUEST_PARAM)
+                else:
+                    request = kwargs[request_param]
+
+                async def call():
+                    if is_coroutine:
+                        return await endpoint(*args, **kwargs)
+                    return await run_in_threadpool(endpoint, *args, **kwargs)
+
+                if request.method not in ("GET", "HEAD"):
+                    return await call()
+                if not request.scope.get(SCOPE_ENABLED):
+                    logger.warning(
+                        "ResponseCacheMiddleware is not installed, "
+                        f"{request.url.path} is not cached"
+                    )
+                    return await call()
+                if normalized_vary:
+                    request.scope[SCOPE_VARY] = normalized_vary
+                if skip_identified and any(
+                    header in request.headers for header in IDENTITY_HEADERS
+                ):
+                    return await call()
+                key = self.get_key(request, normalized_vary, key_builder)
+                if key is None:
+                    return await call()
+
+                cached = await self.lookup(key)
+                if cached is not None:
+                    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+                        return not_modified(cached)
+                    response = Response(cached.body, status_code=cached.status_code)
+                    response.raw_headers = [*cached.headers, (b"x-cache", b"HIT")]
+                    return response
+
+                response_tags = tuple(tags(request) if callable(tags) else tags)
+                # Read before rendering, so an invalidation while rendering makes
+                # this response stale
+                versions = await self.backend.get_tag_versions(response_tags)
+                request.scope[SCOPE_STORE] = (
+                    self,
+                    key,
+                    ttl,
+                    response_tags,
+                    versions,
+                )
+                return await call()
+
+            parameters = [
+                parameter
+                for parameter in signature.parameters.values()
+                if parameter.kind
+                not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            ]
+            if request_param is None:
+                parameters.append(
+                    inspect.Parameter(
+                        _REQUEST_PARAM,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Request,
+                    )
+                )
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+            return wrapper
+
+        return decorator
+
+
+# Default cache, keeping responses in process memory
+response_cache = ResponseCache()
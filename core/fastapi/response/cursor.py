@@ -0,0 +1,317 @@
+import base64
+import hashlib
+import hmac
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+
+from ...exception.request import InvalidRequestException
+from ...settings import settings
+
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+# A sort key is the attribute name and whether it is sorted descending.
+SortKey = Tuple[str, bool]
+
+
+class DecodedCursor(NamedTuple):
+    values: List[Any]
+    previous: bool
+    # Sort keys and route the cursor was created for
+    sort_keys: List[SortKey]
+    route: Optional[str]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    if ObjectId and isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    tag, raw = next(iter(value.items()))
+    if tag == "$dt":
+        return datetime.fromisoformat(raw)
+    if tag == "$date":
+        return date.fromisoformat(raw)
+    if tag == "$uuid":
+        return UUID(raw)
+    if tag == "$dec":
+        return Decimal(raw)
+    if tag == "$oid" and ObjectId:
+        return ObjectId(raw)
+    return value
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()[:16]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_cursor(
+    values: Sequence[Any],
+    previous: bool = False,
+    sort_keys: Sequence[SortKey] = (),
+    route: Optional[str] = None,
+) -> str:
+    """
+    Encode the sort key values of a boundary item into an opaque, signed cursor.
+
+    Args:
+        values: The sort key values of the first or last item of a page.
+        previous: True if the cursor points to the page before the item.
+        sort_keys: The sort keys of the values, checked when the cursor is used.
+        route: The route the cursor belongs to, checked when the cursor is used.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = orjson.dumps(
+        {
+            "v": [_encode_value(value) for value in values],
+            "p": previous,
+            "k": [[name, descending] for name, descending in sort_keys],
+            "r": route,
+        }
+    )
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: str) -> DecodedCursor:
+    """
+    Decode and verify a cursor created by `encode_cursor`.
+
+    Returns:
+        DecodedCursor: The sort key values, the `previous` flag, and the sort
+            keys and route the cursor was created for.
+
+    Raises:
+        InvalidRequestException: If the cursor is malformed or was tampered with.
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        if not hmac.compare_digest(_sign(payload), _b64decode(encoded_signature)):
+            raise ValueError("Signature mismatch")
+        data = orjson.loads(payload)
+        return DecodedCursor(
+            values=[_decode_value(value) for value in data["v"]],
+            previous=bool(data["p"]),
+            sort_keys=[(name, bool(descending)) for name, descending in data["k"]],
+            route=data["r"],
+        )
+    except Exception as e:
+        raise InvalidRequestException(
+            message="Invalid pagination cursor", err_code="INVALID_CURSOR"
+        ) from e
+
+
+def check_cursor(pagination, sort_keys: Sequence[SortKey]) -> None:
+    """
+    Reject a cursor created for other sort keys, e.g. one replayed on another
+    endpoint, which would not match the columns it is compared to.
+
+    Raises:
+        InvalidRequestException: If the sort keys differ.
+    """
+    if pagination.cursor is None:
+        return
+    if list(pagination.cursor_sort_keys) != list(sort_keys) or len(
+        pagination.cursor
+    ) != len(sort_keys):
+        raise InvalidRequestException(
+            message="Pagination cursor does not belong to this endpoint",
+            err_code="INVALID_CURSOR",
+        )
+
+
+def get_sort_values(item: Any, sort_keys: Sequence[SortKey]) -> List[Any]:
+    """Read the sort key values from an ORM instance, row, model or document."""
+    if isinstance(item, dict):
+        return [item.get(name) for name, _ in sort_keys]
+    return [getattr(item, name) for name, _ in sort_keys]
+
+
+def _get_attribute_key(clause) -> str:
+    """
+    Name of the mapped attribute a column is read from on instances, which may
+    differ from the column name, e.g. `created: Mapped[int] = mapped_column("created_at")`.
+    """
+    annotations = getattr(clause, "_annotations", None) or {}
+    return annotations.get("proxy_key") or clause.key
+
+
+def _parse_order_by(order_by) -> Tuple[list, List[SortKey]]:
+    from sqlalchemy.sql import operators
+    from sqlalchemy.sql.elements import UnaryExpression
+
+    columns = []
+    sort_keys = []
+    for clause in order_by:
+        descending = False
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.desc_op,
+            operators.asc_op,
+        ):
+            descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        columns.append(clause)
+        sort_keys.append((_get_attribute_key(clause), descending))
+    return columns, sort_keys
+
+
+def select_sort_keys(*order_by) -> List[SortKey]:
+    """Sort keys of a SQLAlchemy ordering, for `cursor_paginated_response`."""
+    return _parse_order_by(order_by)[1]
+
+
+def find_sort_keys(sort: Sequence[Tuple[str, int]]) -> List[SortKey]:
+    """Sort keys of a pymongo style sort, for `cursor_paginated_response`."""
+    return [(name, direction < 0) for name, direction in sort]
+
+
+def apply_cursor_to_select(statement, pagination, *order_by):
+    """
+    Apply keyset pagination to a SQLAlchemy select.
+
+    The ordering is given as mapped attributes or their `.asc()`/`.desc()`
+    forms and must end with a unique column (usually the primary key).
+    Sort key columns must not be nullable.
+
+    Example:
+        order_by = (Post.created_at.desc(), Post.id.desc())
+        stmt = apply_cursor_to_select(select(Post), pagination, *order_by)
+        ...
+        return cursor_paginated_response(
+            rows, request, PostSchema, pagination, select_sort_keys(*order_by)
+        )
+
+    Args:
+        statement: The select to paginate.
+        pagination: The `CursorPaginationParams` of the request.
+        *order_by: The columns to order and seek by.
+
+    Returns:
+        The select with the seek condition, ordering and limit applied.
+
+    Raises:
+        InvalidRequestException: If the cursor was created for another ordering.
+    """
+    from sqlalchemy import and_, or_, tuple_
+
+    columns, sort_keys = _parse_order_by(order_by)
+    check_cursor(pagination, sort_keys)
+
+    # Walking backwards flips the ordering, the page is reversed again afterwards.
+    flipped = [descending != pagination.previous for _, descending in sort_keys]
+
+    if pagination.cursor is not None:
+        values = pagination.cursor
+
+        def seek(column, value, descending):
+            return column < value if descending else column > value
+
+        if len(set(flipped)) == 1:
+            condition = seek(tuple_(*columns), tuple_(*values), flipped[0])
+        else:
+            condition = or_(
+                *(
+                    and_(
+                        *(columns[j] == values[j] for j in range(i)),
+                        seek(columns[i], values[i], flipped[i]),
+                    )
+                    for i in range(len(columns))
+                )
+            )
+        statement = statement.where(condition)
+
+    return statement.order_by(
+        *(
+            column.desc() if descending else column.asc()
+            for column, descending in zip(columns, flipped)
+        )
+    ).limit(pagination.limit)
+
+
+def apply_cursor_to_find(
+    collection,
+    pagination,
+    sort: Sequence[Tuple[str, int]],
+    filter: Optional[dict] = None,
+    **kwargs,
+):
+    """
+    Run a keyset paginated Motor `find` on a collection.
+
+    Example:
+        sort = [("created_at", -1), ("_id", -1)]
+        cursor = apply_cursor_to_find(connection.posts, pagination, sort)
+        items = await cursor.to_list(length=None)
+        return cursor_paginated_response(
+            items, request, PostSchema, pagination, find_sort_keys(sort)
+        )
+
+    Args:
+        collection: The Motor collection to query.
+        pagination: The `CursorPaginationParams` of the request.
+        sort: pymongo style sort, ending with a unique field (usually `_id`).
+        filter: Additional query filter.
+        **kwargs: Passed through to `collection.find`.
+
+    Returns:
+        The Motor cursor with the seek condition, sort and limit applied.
+
+    Raises:
+        InvalidRequestException: If the cursor was created for another sort.
+    """
+    sort_keys = find_sort_keys(sort)
+    check_cursor(pagination, sort_keys)
+    flipped = [descending != pagination.previous for _, descending in sort_keys]
+
+    query = dict(filter or {})
+    if pagination.cursor is not None:
+        values = pagination.cursor
+        seek = {
+            "$or": [
+                {
+                    **{sort_keys[j][0]: values[j] for j in range(i)},
+                    sort_keys[i][0]: {"$lt" if flipped[i] else "$gt": values[i]},
+                }
+                for i in range(len(sort_keys))
+            ]
+        }
+        query = {"$and": [query, seek]} if query else seek
+
+    return (
+        collection.find(query, **kwargs)
+        .sort(
+            [
+                (name, -1 if descending else 1)
+                for (name, _), descending in zip(sort_keys, flipped)
+            ]
+        )
+        .limit(pagination.limit)
+    )
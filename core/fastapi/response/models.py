@@ -3,6 +3,8 @@ from typing import Any, Union
 
 from pydantic import BaseModel, ConfigDict, field_validator, field_serializer
 
+from ...utils.lazy import LazyValue
+
 # Create IST timezone explicitly
 IST = timezone(timedelta(hours=5, minutes=30))
 
@@ -19,7 +21,13 @@ class CustomBaseModel(BaseModel):
         Handles:
         - Naive datetimes (assume IST)
         - Datetimes in other timezones (convert to IST)
+
+        Lazy handles, such as file field results, are resolved here so they
+        validate against plain `str` and `dict` annotations.
         """
+        if isinstance(value, LazyValue):
+            return value.resolve()
+
         if isinstance(value, datetime):
             # If no timezone, explicitly set to IST
             if value.tzinfo is None:
@@ -1,9 +1,14 @@
+import typing
+from functools import lru_cache
 from typing import Annotated, Any, Generic, TypeVar, List, Type, Optional, Dict
 from urllib.parse import urlencode
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
 from fastapi import Depends, Query as GetQuery, Request
 from fastapi.encoders import jsonable_encoder
 
+from ...exception.request import InvalidRequestException
+from .cursor import SortKey, decode_cursor, encode_cursor, get_sort_values
+
 T = TypeVar("T")
 M = TypeVar("M", bound=BaseModel)
 
@@ -12,6 +17,12 @@ try:
 except ImportError:
     ObjectId = None
 
+try:
+    from sqlalchemy import inspect as sqlalchemy_inspect
+    from sqlalchemy.orm import InstanceState
+except ImportError:
+    sqlalchemy_inspect = None
+
 
 class _PaginationParams(BaseModel):
     """Pagination parameters as a Pydantic model"""
@@ -27,6 +38,161 @@ def get_pagination_params(
     return _PaginationParams(offset=offset, limit=limit + 1)
 
 
+def _custom_encoders() -> Dict[Any, Any]:
+    custom_encoders = {}
+
+    if ObjectId:
+        custom_encoders[ObjectId] = str
+
+    return custom_encoders
+
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(schema: Type[M]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+# Schemas that can't be validated straight from ORM instances or documents,
+# e.g. a `str` field receiving an ObjectId. These keep the encode-first path.
+_encoded_schemas: set = set()
+
+
+def _get_instance_state(obj: Any) -> Optional["InstanceState"]:
+    if sqlalchemy_inspect is None or isinstance(obj, (dict, str, bytes)):
+        return None
+    state = sqlalchemy_inspect(obj, raiseerr=False)
+    return state if isinstance(state, InstanceState) else None
+
+
+class _LoadedAttributes:
+    """
+    Read-only view of an ORM instance hiding its unloaded attributes, so
+    `from_attributes` validation sees them as missing instead of lazy loading
+    them: N+1 queries on a sync session, MissingGreenlet on an AsyncSession.
+    """
+
+    __slots__ = ("_obj", "_unloaded")
+
+    def __init__(self, obj: Any, state: "InstanceState"):
+        self._obj = obj
+        self._unloaded = state.unloaded
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._unloaded:
+            raise AttributeError(name)
+        return _hide_unloaded(getattr(self._obj, name))
+
+
+def _hide_unloaded(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_hide_unloaded(item) for item in value]
+    # Other collections keep their type, e.g. for `set[Model]` fields
+    if isinstance(value, tuple):
+        return tuple(_hide_unloaded(item) for item in value)
+    if isinstance(value, frozenset):
+        return frozenset(_hide_unloaded(item) for item in value)
+    if isinstance(value, set):
+        return {_hide_unloaded(item) for item in value}
+    state = _get_instance_state(value)
+    return value if state is None else _LoadedAttributes(value, state)
+
+
+def _annotation_holds_raw(annotation: Any, seen: set) -> bool:
+    """
+    Check whether values of the given annotation may be kept as they are by
+    validation, e.g. an ORM instance given to an `Any` field.
+    """
+    if annotation is Any or annotation is object or isinstance(annotation, TypeVar):
+        return True
+    if isinstance(annotation, type):
+        if not issubclass(annotation, BaseModel) or annotation in seen:
+            return False
+        seen.add(annotation)
+        return any(
+            _annotation_holds_raw(field.annotation, seen)
+            for field in annotation.model_fields.values()
+        )
+    return any(
+        _annotation_holds_raw(arg, seen)
+        for arg in typing.get_args(annotation)
+        if arg is not Ellipsis
+    )
+
+
+@lru_cache(maxsize=None)
+def _holds_raw_values(schema: Type[M]) -> bool:
+    return _annotation_holds_raw(schema, set())
+
+
+def _encode_loaded(value: Any) -> Any:
+    """
+    Replace the `_LoadedAttributes` views kept by `Any` fields of validated
+    models with the encoded instance, as `jsonable_encoder` would have. Only
+    loaded attributes are encoded, so nothing is lazy loaded here either.
+    """
+    if isinstance(value, _LoadedAttributes):
+        return jsonable_encoder(value._obj, custom_encoder=_custom_encoders())
+    if isinstance(value, BaseModel):
+        fields = value.__dict__
+        for name, field_value in fields.items():
+            encoded = _encode_loaded(field_value)
+            if encoded is not field_value:
+                # Set directly, models may be frozen or validate assignments
+                fields[name] = encoded
+        return value
+    if isinstance(value, dict):
+        encoded = {key: _encode_loaded(item) for key, item in value.items()}
+        changed = any(encoded[key] is not item for key, item in value.items())
+        return encoded if changed else value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        encoded = [_encode_loaded(item) for item in value]
+        if all(new is old for new, old in zip(encoded, value)):
+            return value
+        # Sets become lists, like `jsonable_encoder` makes them, encoded
+        # instances aren't hashable
+        return tuple(encoded) if isinstance(value, tuple) else encoded
+    return value
+
+
+def _validate_items(items: List[Any], schema: Type[M]) -> List[M]:
+    """
+    Validate ORM instances or documents into `schema` in a single pass.
+
+    Items are read with `from_attributes` by a cached `List[schema]` adapter.
+    Attributes of ORM instances that aren't loaded, e.g. relationships not
+    eager loaded, are treated as missing rather than loaded, so validation
+    never queries the database: eager load what the schema needs.
+
+    If validation fails for a schema, it falls back to `jsonable_encoder`
+    first, and remembers to do so for that schema if that succeeds. Items
+    invalid either way raise the `ValidationError`.
+    """
+    if schema not in _encoded_schemas:
+        wrapped = bool(items) and _get_instance_state(items[0]) is not None
+        attributes = [_hide_unloaded(item) for item in items] if wrapped else items
+        try:
+            validated = _get_list_adapter(schema).validate_python(
+                attributes, from_attributes=True
+            )
+        except ValidationError:
+            validated = _validate_encoded(items, schema)
+            # The schema needs encoded values, e.g. a `str` field receiving an
+            # ObjectId. Invalid data raised above and is not remembered.
+            _encoded_schemas.add(schema)
+            return validated
+        if wrapped and _holds_raw_values(schema):
+            # `Any` fields keep the views they were given, which can't be
+            # serialized, encode them as the fallback path would have
+            return [_encode_loaded(item) for item in validated]
+        return validated
+    return _validate_encoded(items, schema)
+
+
+def _validate_encoded(items: List[Any], schema: Type[M]) -> List[M]:
+    model_dicts = jsonable_encoder(items, custom_encoder=_custom_encoders())
+    return [schema.model_validate(item_dict) for item_dict in model_dicts]
+
+
 class PaginatedResponse(BaseModel, Generic[M]):
     limit: int
     offset: int
@@ -73,22 +239,133 @@ def paginated_response(
     else:
         previous_url = None
 
-    custom_encoders = {}
+    validated_items = _validate_items(paginated_result, schema)
+
+    # Items are validated already, so the envelope is built without revalidating them
+    return PaginatedResponse[M].model_construct(
+        limit=limit,
+        offset=offset,
+        next=next_url,
+        previous=previous_url,
+        items=validated_items,
+    )
+
+
+PaginationParams = Annotated[_PaginationParams, Depends(get_pagination_params)]
 
-    if ObjectId:
-        custom_encoders[ObjectId] = str
 
-    model_dicts = jsonable_encoder(paginated_result, custom_encoder=custom_encoders)
+class _CursorPaginationParams(BaseModel):
+    """Keyset pagination parameters as a Pydantic model"""
 
-    validated_items = [schema.model_validate(item_dict) for item_dict in model_dicts]
+    # Shared by every dependency of the request asking for it
+    model_config = ConfigDict(frozen=True)
 
-    return PaginatedResponse[M](
+    limit: int = 10
+    cursor: Optional[List[Any]] = None
+    previous: bool = False
+    # Sort keys the cursor was created for, see `check_cursor`
+    cursor_sort_keys: List[SortKey] = []
+
+
+def _get_route_id(request: Request) -> str:
+    """Path template of the request's route, e.g. '/users/{user_id}/posts'."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
+def get_cursor_pagination_params(
+    request: Request,
+    cursor: Annotated[Optional[str], GetQuery()] = None,
+    limit: Annotated[int, GetQuery(ge=1, le=100)] = 10,
+) -> _CursorPaginationParams:
+    if cursor is None:
+        return _CursorPaginationParams(limit=limit + 1)
+    decoded = decode_cursor(cursor)
+    if decoded.route != _get_route_id(request):
+        raise InvalidRequestException(
+            message="Pagination cursor does not belong to this endpoint",
+            err_code="INVALID_CURSOR",
+        )
+    return _CursorPaginationParams(
+        limit=limit + 1,
+        cursor=decoded.values,
+        previous=decoded.previous,
+        cursor_sort_keys=decoded.sort_keys,
+    )
+
+
+class CursorPaginatedResponse(BaseModel, Generic[M]):
+    limit: int
+    next: Optional[str] = None
+    previous: Optional[str] = None
+    items: List[M]
+
+
+def _cursor_url(request: Request, cursor: str) -> str:
+    query_params = dict(request.query_params)
+    query_params.pop("offset", None)
+    query_params["cursor"] = cursor
+    return f"{request.url.path}?{urlencode(query_params)}"
+
+
+def cursor_paginated_response(
+    result: List[Any],
+    request: Request,
+    schema: Type[M],
+    pagination: _CursorPaginationParams,
+    sort_keys: List[SortKey],
+) -> CursorPaginatedResponse[M]:
+    """
+    Create a keyset paginated response from a list of SQLAlchemy models or documents
+
+    Args:
+        result: Rows fetched with `apply_cursor_to_select` or `apply_cursor_to_find`
+        request: FastAPI Request object
+        schema: Pydantic model class to convert results into
+        pagination: The `CursorPaginationParams` used for the query
+        sort_keys: Sort keys of the query, from `select_sort_keys` or
+            `find_sort_keys`
+
+    Returns:
+        CursorPaginatedResponse object with cursor based next and previous links
+    """
+    limit = pagination.limit - 1
+
+    # One extra row was fetched to detect whether there is more in the walk direction
+    has_more = len(result) > limit
+    page = result[:limit] if has_more else result
+
+    if pagination.previous:
+        # Rows were fetched in reverse order to walk backwards
+        page = page[::-1]
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, pagination.cursor is not None
+
+    next_url = previous_url = None
+    route = _get_route_id(request)
+    if page and has_next:
+        values = get_sort_values(page[-1], sort_keys)
+        next_url = _cursor_url(
+            request, encode_cursor(values, sort_keys=sort_keys, route=route)
+        )
+    if page and has_previous:
+        values = get_sort_values(page[0], sort_keys)
+        previous_url = _cursor_url(
+            request,
+            encode_cursor(values, previous=True, sort_keys=sort_keys, route=route),
+        )
+
+    validated_items = _validate_items(page, schema)
+
+    return CursorPaginatedResponse[M].model_construct(
         limit=limit,
-        offset=offset,
         next=next_url,
         previous=previous_url,
         items=validated_items,
     )
 
 
-PaginationParams = Annotated[_PaginationParams, Depends(get_pagination_params)]
+CursorPaginationParams = Annotated[
+    _CursorPaginationParams, Depends(get_cursor_pagination_params)
+]
@@ -0,0 +1,192 @@
+import typing
+from typing import Any, Dict, Type
+
+import orjson
+from pydantic import BaseModel
+
+from ...utils.lazy import LazyValue
+
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+# Same options as `fastapi.responses.ORJSONResponse.render`.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Keys renamed on the way out. Mongo documents carry `_id`, clients expect `id`.
+_RENAMED_KEYS = {"_id": "id"}
+
+# orjson writes object keys as `"key":`. A marker can also end a key holding
+# an escaped quote, e.g. `x"_id`, so bodies with escaped quotes are walked.
+_RENAME_MARKER = b'"_id":'
+_RENAMED_MARKER = b'"id":'
+_ESCAPED_QUOTE = b'\\"'
+
+# Cache of model class -> whether its dumped output may contain a key that
+# needs renaming. Models whose schema can't produce such keys are dumped by
+# pydantic-core and handed to orjson without being walked in Python.
+_model_plans: Dict[Type[BaseModel], bool] = {}
+
+_DYNAMIC_ORIGINS = (dict, typing.Mapping, typing.MutableMapping)
+
+
+def _annotation_is_dynamic(annotation: Any, seen: set) -> bool:
+    """
+    Check whether values of the given annotation may contain arbitrary dict keys.
+    """
+    if annotation is Any or annotation is object:
+        return True
+    if annotation is None:
+        return False
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _model_is_dynamic(annotation, seen)
+        return issubclass(annotation, dict)
+    origin = typing.get_origin(annotation)
+    if origin is typing.Literal:
+        return False
+    if origin is typing.Annotated:
+        return _annotation_is_dynamic(typing.get_args(annotation)[0], seen)
+    if origin is not None:
+        if origin in _DYNAMIC_ORIGINS or (
+            isinstance(origin, type) and issubclass(origin, dict)
+        ):
+            return True
+        return any(
+            _annotation_is_dynamic(arg, seen)
+            for arg in typing.get_args(annotation)
+            if arg is not Ellipsis
+        )
+    # TypeVars, forward references and anything we can't reason about.
+    return True
+
+
+def _model_is_dynamic(model_cls: Type[BaseModel], seen: set) -> bool:
+    cached = _model_plans.get(model_cls)
+    if cached is not None:
+        return cached
+    if model_cls in seen:
+        # Recursive models are always walked.
+        return True
+    seen.add(model_cls)
+
+    dynamic = model_cls.model_config.get("extra") == "allow"
+    if not dynamic:
+        for field in model_cls.model_fields.values():
+            if _annotation_is_dynamic(field.annotation, seen):
+                dynamic = True
+                break
+    if not dynamic:
+        for computed in model_cls.model_computed_fields.values():
+            if _annotation_is_dynamic(computed.return_type, seen):
+                dynamic = True
+                break
+
+    _model_plans[model_cls] = dynamic
+    return dynamic
+
+
+def model_needs_rename(model_cls: Type[BaseModel]) -> bool:
+    """
+    Return True if dumps of `model_cls` may contain keys that have to be renamed.
+    The result is computed once per model class and cached.
+    """
+    return _model_is_dynamic(model_cls, set())
+
+
+def _rename_keys(obj: Any) -> Any:
+    """
+    Rename `_id` keys and dump nested models in a single pass.
+
+    Containers that need no change are returned as-is, so a payload without
+    `_id` keys or models is walked but never copied.
+    """
+    if isinstance(obj, dict):
+        changed = False
+        items = []
+        for key, value in obj.items():
+            new_value = _rename_keys(value)
+            if key in _RENAMED_KEYS:
+                key = _RENAMED_KEYS[key]
+                changed = True
+            elif new_value is not value:
+                changed = True
+            items.append((key, new_value))
+        return dict(items) if changed else obj
+    if isinstance(obj, (list, tuple)):
+        new_items = None
+        for index, value in enumerate(obj):
+            new_value = _rename_keys(value)
+            if new_value is not value and new_items is None:
+                new_items = list(obj[:index])
+            if new_items is not None:
+                new_items.append(new_value)
+        if new_items is None:
+            return obj
+        return tuple(new_items) if isinstance(obj, tuple) else new_items
+    if isinstance(obj, BaseModel):
+        return dump_model(obj)
+    return obj
+
+
+def dump_model(model: BaseModel) -> Any:
+    """
+    Dump a model to python primitives with `_id` keys renamed to `id`.
+    The key walk only happens for models whose schema allows such keys.
+    """
+    dumped = model.model_dump()
+    if model_needs_rename(type(model)):
+        return _rename_keys(dumped)
+    return dumped
+
+
+def prepare_content(content: Any) -> Any:
+    """
+    Convert response content into something orjson can serialize directly.
+
+    Args:
+        content: Response content, a model, dict, list, tuple or primitive.
+
+    Returns:
+        The content with models dumped and `_id` keys renamed to `id`.
+    """
+    if isinstance(content, BaseModel):
+        return dump_model(content)
+    return _rename_keys(content)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if ObjectId and isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, LazyValue):
+        return obj.resolve()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def serialize(content: Any) -> bytes:
+    """
+    Serialize response content to JSON bytes, renaming `_id` keys to `id`.
+
+    The content is encoded by orjson as-is, with models dumped by pydantic-core
+    through the `default` hook. `_id` keys are then renamed on the encoded bytes.
+    The content is only walked in Python when an object may hold both `_id`
+    and `id`, where the rename has to collapse the two keys into one, or when
+    the body has escaped quotes, which could make a marker match inside a key.
+
+    Args:
+        content: Response content, a model, dict, list, tuple or primitive.
+
+    Returns:
+        bytes: The encoded JSON body.
+    """
+    body = orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    if _RENAME_MARKER not in body:
+        return body
+    if _RENAMED_MARKER not in body and _ESCAPED_QUOTE not in body:
+        return body.replace(_RENAME_MARKER, _RENAMED_MARKER)
+    return orjson.dumps(
+        prepare_content(content), default=_default, option=ORJSON_OPTIONS
+    )
@@ -11,6 +11,25 @@ class CoreSettings(BaseSettings):
     SECRET_KEY: str
     DEBUG: bool = False
     CORS_ORIGINS: list[str] | str
+    # File caching the routers `create_app` discovers, e.g. ".routers.json".
+    # Rebuilt whenever a directory of the apps tree changes.
+    ROUTER_MANIFEST: str | None = None
+    # Print the import time of every router at startup
+    ROUTER_IMPORT_REPORT: bool = True
+    # Compress responses with zstd, br or gzip, as accepted by the client.
+    # zstd and br need the zstandard and brotli packages.
+    COMPRESSION_ENABLED: bool = False
+    # Smaller responses are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # Larger bodies are compressed in a thread, off the event loop
+    COMPRESSION_THREAD_THRESHOLD: int = 256 * 1024
+    # Send a Server-Timing header with the time spent in the database, storage,
+    # authentication and rendering. Exposes internals, keep it off in public
+    # deployments unless needed.
+    SERVER_TIMING: bool = False
 
     @property
     def cors_origins(self) -> list[str]:
@@ -0,0 +1,321 @@
+"""
+Garbage collection of stored files no database row references.
+
+Run it as a management command, from a file in the commands folder:
+
+    from avcfastapi.core.storage.gc import CollectOrphanFilesCommand
+
+or directly:
+
+    python -m avcfastapi.core.storage.gc --models apps.users.models --dry-run
+"""
+
+import argparse
+import importlib
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import MetaData, String, Table, create_engine, select, type_coerce
+from sqlalchemy.engine import Connection
+
+from ..utils.commands import Command
+from .sqlalchemy.fields.abstract import AbstractFileField
+from .storage_class.abstract import Storage
+
+# Variables per `IN` query, below SQLite's historical limit of 999
+_QUERY_BATCH_SIZE = 500
+
+
+def iter_file_columns(metadata: MetaData) -> Iterator[tuple[Table, object]]:
+    """Yield every `(table, column)` whose type is a file field."""
+    for table in metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, AbstractFileField):
+                yield table, column
+
+
+def _get_prefixes(fields: Iterable[AbstractFileField]) -> list[str]:
+    """`upload_to` directories of the fields, without nested duplicates."""
+    prefixes = []
+    for prefix in sorted({field.upload_to.strip("/") for field in fields}):
+        if not any(prefix.startswith(f"{parent}/") for parent in prefixes):
+            prefixes.append(prefix)
+    # An empty `upload_to` covers the whole storage
+    return [""] if "" in prefixes else prefixes
+
+
+def _get_backend(storage: Storage) -> Storage:
+    # `CachedStorage` wraps the storage the files are kept in
+    return getattr(storage, "storage", storage)
+
+
+def get_location(storage: Storage, path: str = "") -> str:
+    """
+    Where a file of a storage is kept, the same for every storage instance
+    pointing at the same bucket or directory, e.g. 'S3Storage:bucket:media/a.jpg'.
+    """
+    backend = _get_backend(storage)
+    volume = os.path.normpath(str(backend.volume))
+    return (
+        f"{type(backend).__name__}:{volume}:{os.path.normpath(backend.get_path(path))}"
+    )
+
+
+def _index_references(
+    connection: Connection,
+    columns: list[tuple[Table, object]],
+    index: sqlite3.Connection,
+    batch_size: int,
+    purge_soft_deleted: bool,
+) -> int:
+    """
+    Stream the values of the columns into the on-disk index, with the paths of
+    every image variant, as locations of their field's storage, see
+    `get_location`. Returns the number of values read.
+    """
+    count = 0
+    for table, column in columns:
+        field = column.type
+        storage = field.storage
+        # Read the stored paths, not the lazy file objects of the field
+        statement = select(type_coerce(column, String)).where(column.isnot(None))
+        if purge_soft_deleted and "is_deleted" in table.c:
+            statement = statement.where(table.c.is_deleted.is_(False))
+        result = connection.execution_options(yield_per=batch_size).execute(statement)
+        for rows in result.partitions():
+            paths = [
+                (get_location(storage, path.lstrip("/")),)
+                for (value,) in rows
+                if value
+                for path in field.get_paths(value)
+            ]
+            index.executemany("INSERT OR IGNORE INTO refs VALUES (?)", paths)
+            count += len(rows)
+    index.commit()
+    return count
+
+
+def _find_referenced(
+    index: sqlite3.Connection, storage: Storage, paths: list[str]
+) -> set[str]:
+    locations = {get_location(storage, path): path for path in paths}
+    batches = list(locations)
+    referenced = set()
+    for i in range(0, len(batches), _QUERY_BATCH_SIZE):
+        batch = batches[i : i + _QUERY_BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        referenced.update(
+            locations[location]
+            for (location,) in index.execute(
+                f"SELECT path FROM refs WHERE path IN ({placeholders})", batch
+            )
+        )
+    return referenced
+
+
+def collect_orphans(
+    connection: Connection,
+    storage: Storage,
+    columns: list[tuple[Table, object]],
+    min_age: float = 3600,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    purge_soft_deleted: bool = False,
+    reference_columns: Optional[list[tuple[Table, object]]] = None,
+) -> dict[str, int]:
+    """
+    Delete the files of a storage that no file field column references.
+
+    The referenced paths are streamed from the database into a temporary
+    on-disk index, and the storage listing is streamed against it, so memory
+    use is bounded by `batch_size` rather than by the number of files. Only
+    the `upload_to` directories of the columns' fields are listed.
+
+    Args:
+        connection (Connection): Database connection the columns are read with.
+        storage (Storage): The storage to collect, shared by the columns' fields.
+        columns (list): `(table, column)` pairs of every file field column
+                        storing files in `storage`, see `iter_file_columns`.
+                        Files of a missing column would be deleted.
+        min_age (float): Files modified less than this many seconds ago are
+                         kept, as their rows may not be committed yet.
+        batch_size (int): Rows and files handled per batch.
+        dry_run (bool): Count orphans without deleting them.
+        purge_soft_deleted (bool): Treat files only referenced by soft deleted
+                                   rows (`is_deleted`) as orphans.
+        reference_columns (list, optional): Columns whose files are kept,
+                        whatever storage instance their fields use. Files are
+                        matched by location, see `get_location`, so storages
+                        sharing a bucket or directory keep each other's files.
+                        Defaults to `columns`.
+
+    Returns:
+        dict[str, int]: Numbers of rows read, files listed, files kept for
+                        being recent, and orphans found.
+    """
+    stats = {"rows": 0, "files": 0, "recent": 0, "orphans": 0}
+    cutoff = time.time() - min_age
+    with tempfile.TemporaryDirectory(prefix="storage-gc-") as directory:
+        index = sqlite3.connect(os.path.join(directory, "refs.sqlite3"))
+        try:
+            index.execute("CREATE TABLE refs (path TEXT PRIMARY KEY) WITHOUT ROWID")
+            stats["rows"] = _index_references(
+                connection,
+                columns if reference_columns is None else reference_columns,
+                index,
+                batch_size,
+                purge_soft_deleted,
+            )
+
+            def handle(batch: list[tuple[str, float]]):
+                candidates = []
+                for path, modified in batch:
+                    if modified > cutoff:
+                        stats["recent"] += 1
+                    else:
+                        candidates.append(path)
+                referenced = _find_referenced(index, storage, candidates)
+                orphans = [path for path in candidates if path not in referenced]
+                stats["orphans"] += len(orphans)
+                if orphans and not dry_run:
+                    storage.delete_many(orphans)
+
+            for prefix in _get_prefixes(column.type for _, column in columns):
+                batch = []
+                for item in storage.list_files(prefix):
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        stats["files"] += len(batch)
+                        handle(batch)
+                        batch = []
+                if batch:
+                    stats["files"] += len(batch)
+                    handle(batch)
+        finally:
+            index.close()
+    return stats
+
+
+def collect_all_orphans(
+    connection: Connection,
+    columns: list[tuple[Table, object]],
+    min_age: float = 3600,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    purge_soft_deleted: bool = False,
+) -> list[tuple[Storage, dict[str, int]]]:
+    """
+    Collect the orphan files of every storage the columns' fields use, see
+    `collect_orphans`.
+
+    Storage instances pointing at the same bucket or directory are collected
+    together, and a file is an orphan only if no column references it, so
+    storages with overlapping locations never delete each other's files.
+
+    Returns:
+        list: `(storage, stats)` pairs, one per storage location.
+    """
+    groups = {}
+    for table, column in columns:
+        storage = column.type.storage
+        groups.setdefault(get_location(storage), (storage, []))[1].append(
+            (table, column)
+        )
+    return [
+        (
+            storage,
+            collect_orphans(
+                connection,
+                storage,
+                group,
+                min_age=min_age,
+                batch_size=batch_size,
+                dry_run=dry_run,
+                purge_soft_deleted=purge_soft_deleted,
+                reference_columns=columns,
+            ),
+        )
+        for storage, group in groups.values()
+    ]
+
+
+class CollectOrphanFilesCommand(Command):
+    help = (
+        "Delete stored files that no file field column references, "
+        "including image variants."
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            required=True,
+            help="Modules defining the models, e.g. apps.users.models. "
+            "Every model with a file field must be imported.",
+        )
+        parser.add_argument(
+            "--database-url",
+            default=None,
+            help="Synchronous database URL, DATABASE_URL_SYNC by default.",
+        )
+        parser.add_argument("--min-age", type=float, default=3600)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--purge-soft-deleted", action="store_true")
+
+    def handle(
+        self,
+        models: list[str],
+        database_url: Optional[str] = None,
+        min_age: float = 3600,
+        batch_size: int = 1000,
+        dry_run: bool = False,
+        purge_soft_deleted: bool = False,
+        **options,
+    ):
+        from ..database.sqlalchamey.base import AbstractSQLModel
+
+        for module in models:
+            importlib.import_module(module)
+        if database_url is None:
+            from ..database.sqlalchamey.settings import settings as db_settings
+
+            database_url = db_settings.DATABASE_URL_SYNC
+
+        columns = list(iter_file_columns(AbstractSQLModel.metadata))
+        if not columns:
+            print("No file field columns found.")
+            return
+
+        engine = create_engine(database_url)
+        try:
+            with engine.connect() as connection:
+                collected = collect_all_orphans(
+                    connection,
+                    columns,
+                    min_age=min_age,
+                    batch_size=batch_size,
+                    dry_run=dry_run,
+                    purge_soft_deleted=purge_soft_deleted,
+                )
+                for storage, stats in collected:
+                    action = "found" if dry_run else "deleted"
+                    print(
+                        f"{type(storage).__name__}({storage.volume}): "
+                        f"{stats['rows']} rows, {stats['files']} files, "
+                        f"{stats['recent']} recent, {stats['orphans']} orphans {action}"
+                    )
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    command = CollectOrphanFilesCommand()
+    parser = argparse.ArgumentParser(
+        prog="python -m avcfastapi.core.storage.gc", description=command.help
+    )
+    command.add_arguments(parser)
+    command.handle(**vars(parser.parse_args()))
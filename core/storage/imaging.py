@@ -0,0 +1,247 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from PIL import Image as PILImage
+
+from .settings import settings
+
+# Runs the CPU bound image work off the event loop and around the GIL
+_executor: Optional[ProcessPoolExecutor] = None
+# Bounds the number of images queued in the pool, see `run_image_job`
+_slots: Optional[threading.BoundedSemaphore] = None
+_lock = threading.Lock()
+
+
+def _get_mp_context():
+    # Workers started by forking the server would inherit its threads, locks
+    # and connections mid-use, forkserver starts them from a clean process
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def get_image_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process pool used for image processing, or None if images are
+    processed in the calling thread (`STORAGE_IMAGE_WORKERS=0`).
+    """
+    global _executor, _slots
+    if _executor is None:
+        workers = settings.STORAGE_IMAGE_WORKERS
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            return None
+        with _lock:
+            if _executor is None:
+                queue_size = settings.STORAGE_IMAGE_QUEUE_SIZE or workers * 2
+                _slots = threading.BoundedSemaphore(max(queue_size, workers))
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=_get_mp_context()
+                )
+    return _executor
+
+
+def shutdown_image_executor(wait: bool = True) -> None:
+    """Stop the image process pool. It is started again on next use."""
+    global _executor, _slots
+    with _lock:
+        executor, _executor, _slots = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def run_image_job(func, *args):
+    """
+    Run `func(*args)` in the image process pool and wait for the result.
+
+    The calling thread blocks while the pool queue is full, so a burst of
+    uploads can't pile up decoded images in memory. `func` and its arguments
+    must be picklable. Call this from a worker thread, never the event loop.
+    """
+    executor = get_image_executor()
+    if executor is None:
+        return func(*args)
+
+    slots = _slots
+    slots.acquire()
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory), start a fresh pool next time
+        shutdown_image_executor(wait=False)
+        raise
+
+
+# Images are scaled down by cheap integer steps (JPEG DCT scaling or
+# `Image.reduce`) to no less than this multiple of the target size, then
+# resampled with LANCZOS. 3.0 is indistinguishable from a plain LANCZOS resize.
+REDUCING_GAP = 3.0
+
+
+def fit_size(size: tuple[int, int], width: int, height: int) -> tuple[int, int]:
+    """
+    Return the size of an image of `size` resized to fit in `width` x `height`,
+    maintaining aspect ratio.
+    """
+    img_ratio = size[0] / size[1]
+    target_ratio = width / height
+
+    if img_ratio > target_ratio:
+        # Image is wider than target aspect ratio, fit by target width
+        return width, round(width / img_ratio)
+    # Image is taller than or matches target aspect ratio, fit by target height
+    return round(height * img_ratio), height
+
+
+def resize_to_fit(img: PILImage.Image, width: int, height: int) -> PILImage.Image:
+    """Resize an image to fit in `width` x `height`, maintaining aspect ratio."""
+    return img.resize(
+        fit_size(img.size, width, height),
+        PILImage.LANCZOS,
+        reducing_gap=REDUCING_GAP,
+    )
+
+
+def variant_sizes(
+    size: tuple[int, int], variations: dict
+) -> dict[str, tuple[int, int]]:
+    """
+    Return the output size of every variation that specifies both 'width' and
+    'height', for an original image of `size`.
+    """
+    sizes = {}
+    for key, value in variations.items():
+        width = value.get("width")
+        height = value.get("height")
+        # Only generate variant if both width and height are specified
+        if width is not None and height is not None:
+            sizes[key] = fit_size(size, width, height)
+    return sizes
+
+
+def generate_variants(
+    image: PILImage.Image, variations: dict, size: Optional[tuple[int, int]] = None
+) -> dict[str, PILImage.Image]:
+    """
+    Resize an image for every variation that specifies both 'width' and 'height'.
+
+    Variants are generated largest first, and each one is derived from the
+    smallest image already generated that still covers it, instead of from the
+    full resolution original every time.
+
+    Args:
+        image (PILImage.Image): The original image, possibly decoded at a
+                                reduced scale, see `open_for_variants`.
+        variations (dict): Variation names mapped to their 'width' and 'height'.
+        size (tuple[int, int], optional): Size of the original image, if
+                                          `image` was decoded at a reduced scale.
+
+    Returns:
+        dict[str, PILImage.Image]: Variation names mapped to the resized images.
+    """
+    sizes = variant_sizes(size or image.size, variations)
+    variants = {}
+    sources = [image]
+    for key, target in sorted(sizes.items(), key=lambda item: -item[1][0] * item[1][1]):
+        # Smallest image generated so far that is at least as large as the target
+        source = next(
+            (
+                source
+                for source in reversed(sources)
+                if source.width >= target[0] and source.height >= target[1]
+            ),
+            image,
+        )
+        variant = source.resize(target, PILImage.LANCZOS, reducing_gap=REDUCING_GAP)
+        variants[key] = variant
+        sources.append(variant)
+    # Keep the order of the variations
+    return {key: variants[key] for key in sizes}
+
+
+def open_for_variants(
+    content: bytes, variations: dict
+) -> tuple[PILImage.Image, tuple[int, int]]:
+    """
+    Open an image to generate its variations from. JPEGs are decoded at the
+    smallest DCT scale (1/2, 1/4 or 1/8) that still covers the largest
+    variation. Images smaller than a variation are decoded in full.
+
+    Returns:
+        tuple[PILImage.Image, tuple[int, int]]: The image and its original size.
+    """
+    img = PILImage.open(io.BytesIO(content))
+    size = img.size
+    sizes = variant_sizes(size, variations).values()
+    if sizes and all(width <= size[0] and height <= size[1] for width, height in sizes):
+        # DCT scaling halves the size in steps for a fraction of the cost of a
+        # full decode. The result is resampled with LANCZOS afterwards anyway.
+        img.draft(
+            None,
+            (max(width for width, _ in sizes), max(height for _, height in sizes)),
+        )
+    return img, size
+
+
+def encode_image(img: PILImage.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def render_image(
+    content: bytes, fmt: str, variations: dict
+) -> tuple[bytes, dict[str, bytes]]:
+    """
+    Decode an image, re-encode it and encode its resized variations.
+    Runs in the image process pool, see `run_image_job`.
+
+    Args:
+        content (bytes): The uploaded image.
+        fmt (str): The image format, e.g. 'jpeg'.
+        variations (dict): Variation names mapped to their 'width' and 'height'.
+
+    Returns:
+        tuple[bytes, dict[str, bytes]]: The encoded original and variants.
+    """
+    with PILImage.open(io.BytesIO(content)) as img:
+        img.load()
+        original = encode_image(img, fmt)
+        variants = {
+            key: encode_image(variant, fmt)
+            for key, variant in generate_variants(img, variations).items()
+        }
+    return original, variants
+
+
+def render_variants(content: bytes, fmt: str, variations: dict) -> dict[str, bytes]:
+    """
+    Decode an image at reduced scale and encode its resized variations.
+    Runs in the image process pool, see `run_image_job`.
+
+    Args:
+        content (bytes): The original image.
+        fmt (str): The image format, e.g. 'jpeg'.
+        variations (dict): Variation names mapped to their 'width' and 'height'.
+
+    Returns:
+        dict[str, bytes]: Variation names mapped to the encoded variants.
+    """
+    img, size = open_for_variants(content, variations)
+    with img:
+        return {
+            key: encode_image(variant, fmt)
+            for key, variant in generate_variants(img, variations, size).items()
+        }
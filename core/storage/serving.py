@@ -0,0 +1,148 @@
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+
+from ..utils.cache import TTLCache
+from .settings import settings
+from .storage_class.abstract import run_in_storage_executor
+from .storage_class.filestorage import FileSystemStorage
+
+# Paths written by content addressed file fields, e.g. 'ab/abcd...ef.jpg'
+_CONTENT_ADDRESSED = re.compile(r"(^|/)([0-9a-f]{2})/\2[0-9a-f]{62}(\.[\w-]+)?$")
+
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class StorageFiles:
+    """
+    ASGI app serving the files of a `FileSystemStorage`, in place of a separate
+    web server for media.
+
+    Mount it at the path used as the storage's `url_prefix`, so the URLs from
+    `get_url` resolve to it:
+
+        storage = FileSystemStorage("media", "uploads", url_prefix="/media")
+        app.mount("/media", StorageFiles(storage))
+
+    Files are sent with the server's zero-copy path send extension when it
+    supports one. Range requests, strong ETags built from cached stat data,
+    and `If-None-Match`/`If-Modified-Since` 304 responses are supported.
+    Content addressed files are cached by clients for a year.
+    """
+
+    def __init__(
+        self,
+        storage: FileSystemStorage,
+        max_age: Optional[int] = None,
+        stat_cache_size: int = 10000,
+        stat_cache_ttl: float = 5,
+    ):
+        """
+        Args:
+            storage (FileSystemStorage): The storage to serve.
+            max_age (int, optional): Cache-Control max-age of files that are not
+                content addressed. Defaults to `STORAGE_FILES_MAX_AGE`.
+            stat_cache_size (int): Number of files whose stat data is cached.
+            stat_cache_ttl (float): Seconds a file's stat data is cached for.
+                A replaced file is served with its new ETag after at most this.
+        """
+        self.storage = storage
+        self.max_age = settings.STORAGE_FILES_MAX_AGE if max_age is None else max_age
+        self.root = Path(storage.get_path("")).resolve()
+        # `get_url` appends the full path of the file to the prefix
+        self.url_root = str(Path(storage.volume) / storage.base_path).strip("/")
+        self.stat_cache = TTLCache(max_size=stat_cache_size, ttl=stat_cache_ttl)
+
+    def _get_filepath(self, request_path: str) -> Optional[str]:
+        """Storage path of a request path, or None if it's outside the storage."""
+        request_path = request_path.strip("/")
+        if self.url_root:
+            if not request_path.startswith(f"{self.url_root}/"):
+                return None
+            request_path = request_path[len(self.url_root) + 1 :]
+        parts = request_path.split("/")
+        # Hidden files include the temporary files of writes in progress
+        if not request_path or any(not part or part.startswith(".") for part in parts):
+            return None
+        return request_path
+
+    def _stat(self, filepath: str) -> Optional[os.stat_result]:
+        full_path = Path(self.storage.get_path(filepath)).resolve()
+        if not full_path.is_relative_to(self.root):
+            return None
+        try:
+            stat_result = full_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        self.stat_cache.set(filepath, stat_result)
+        return stat_result
+
+    @staticmethod
+    def _is_not_modified(
+        request_headers: Headers, etag: str, stat_result: os.stat_result
+    ) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(stat_result.st_mtime) <= since
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            raise RuntimeError("StorageFiles only handles HTTP requests")
+
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"}
+            )
+            return await response(scope, receive, send)
+
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        filepath = self._get_filepath(path)
+        stat_result = None
+        if filepath is not None:
+            stat_result = self.stat_cache.get(filepath)
+            if stat_result is None:
+                stat_result = await run_in_storage_executor(self._stat, filepath)
+        if stat_result is None:
+            return await PlainTextResponse("Not Found", status_code=404)(
+                scope, receive, send
+            )
+
+        etag = f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": (
+                _IMMUTABLE
+                if _CONTENT_ADDRESSED.search(filepath)
+                else f"public, max-age={self.max_age}"
+            ),
+        }
+
+        if self._is_not_modified(Headers(scope=scope), etag, stat_result):
+            response = Response(status_code=304, headers=headers)
+        else:
+            response = FileResponse(
+                self.storage.get_path(filepath),
+                headers=headers,
+                stat_result=stat_result,
+            )
+        await response(scope, receive, send)
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from ..settings import BaseSettings
+
+
+class StorageSettings(BaseSettings):
+    # Threads used to run blocking storage calls off the event loop
+    STORAGE_MAX_WORKERS: int = 16
+    # Chunk size used when streaming file content
+    STORAGE_CHUNK_SIZE: int = 64 * 1024
+    # Processes used to decode, resize and encode images. Defaults to the
+    # number of CPUs, 0 processes images in the calling thread.
+    STORAGE_IMAGE_WORKERS: Optional[int] = None
+    # Images queued or in flight in the process pool before callers wait.
+    # Defaults to twice the number of workers.
+    STORAGE_IMAGE_QUEUE_SIZE: Optional[int] = None
+    # Route rendering image variants on first request, for image fields
+    # created with `lazy_variants=True`
+    STORAGE_IMAGE_RENDER_PATH: str = "/api/images"
+    # Prepended to the render path in variant URLs, e.g. "https://api.example.com"
+    STORAGE_IMAGE_RENDER_BASE_URL: str = ""
+    # Cache-Control max-age of files served by `StorageFiles`. Content addressed
+    # files never change and are always cached for a year.
+    STORAGE_FILES_MAX_AGE: int = 3600
+
+
+settings = StorageSettings()
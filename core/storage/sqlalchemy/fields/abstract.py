@@ -1,12 +1,72 @@
+import hashlib
 import os
 import io
+import tempfile
 from typing import Dict, Optional, Union
 from sqlalchemy.types import TypeDecorator, String
+from sqlalchemy.util.concurrency import await_only, in_greenlet
 
 from ....exception.request import InvalidRequestException
+from ....utils.lazy import LazyValue
 
 from ..inputs.file import InputFile
-from ...storage_class.abstract import Storage
+from ...settings import settings
+from ...storage_class.abstract import (
+    SPOOL_MAX_SIZE,
+    Storage,
+    is_async_iterable,
+    run_in_storage_executor,
+)
+
+
+class FileResult:
+    """
+    Base for the values file fields load from the database, which have the
+    `storage`, the stored `file_path` and the `field` they were loaded from.
+    """
+
+    __slots__ = ()
+
+    def get_paths(self) -> list[str]:
+        """Storage paths of the file and any files derived from it."""
+        return [self.file_path]
+
+    def delete(self):
+        """
+        Delete the file and any files derived from it from the storage.
+
+        Files of content addressed fields may be shared by several rows, delete
+        them with `python -m avcfastapi.core.storage.gc` instead, which only
+        removes files no row references.
+        """
+        self.storage.delete_many(self.get_paths())
+
+    async def adelete(self):
+        """Asynchronously delete the file and any files derived from it."""
+        await self.storage.adelete_many(self.get_paths())
+
+
+class LazyFileResult(FileResult, LazyValue):
+    """
+    Base for the values of file fields with `lazy=True`.
+
+    Only the stored path is kept when a row is loaded, URLs are looked up in
+    the storage on first access, so columns that are never rendered cost no
+    storage calls. These aren't `str` or `dict` instances: validate them into a
+    `CustomBaseModel`, or annotate the schema field with the result class.
+    """
+
+    __slots__ = ("storage", "file_path", "field")
+
+    def __init__(
+        self,
+        storage: Storage,
+        file_path: str,
+        field: Optional["AbstractFileField"] = None,
+    ):
+        self.storage = storage
+        self.file_path = file_path
+        self.field = field
 
 
 class AbstractFileField(TypeDecorator):
@@ -22,25 +82,143 @@ class AbstractFileField(TypeDecorator):
         self,
         storage: Storage,
         upload_to: str = "uploads",
+        content_addressed: bool = False,
+        lazy: bool = False,
     ):
+        """
+        Args:
+            storage (Storage): The storage files are saved to.
+            upload_to (str): Directory in the storage files are saved under.
+            content_addressed (bool): Name files by the SHA-256 of their content
+                instead of `InputFile.filename`. Uploading content that is
+                already stored skips the upload and reuses the stored file.
+            lazy (bool): Load values as handles looking their URLs up on first
+                access, see `LazyFileResult`, instead of `str` or `dict`
+                values with the URLs looked up when the row is loaded.
+        """
         super().__init__()
         self.storage = storage
         self.upload_to = upload_to
+        self.content_addressed = content_addressed
+        self.lazy = lazy
 
     def _get_filepath(self, path: str) -> str:
         """Generate the full file path for the image."""
         return os.path.join(self.upload_to, path)
 
+    def _get_content_path(self, digest: str, filename: str) -> str:
+        """
+        Path of content addressed files, e.g. 'uploads/ab/abcd...ef.jpg'.
+        The extension of the uploaded filename is kept.
+        """
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(self.upload_to, digest[:2], f"{digest}{ext}")
+
+    def _hash_content(self, content) -> str:
+        """SHA-256 of bytes or a seekable file-like object, read in chunks."""
+        if isinstance(content, bytes):
+            return hashlib.sha256(content).hexdigest()
+        digest = hashlib.sha256()
+        while chunk := content.read(settings.STORAGE_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+
+    async def _spool_and_hash(
+        self, content
+    ) -> tuple[str, tempfile.SpooledTemporaryFile]:
+        """Hash an async byte iterator while collecting it into a temporary file."""
+        digest = hashlib.sha256()
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            async for chunk in content:
+                digest.update(chunk)
+                await run_in_storage_executor(spooled.write, chunk)
+            spooled.seek(0)
+        except BaseException:
+            spooled.close()
+            raise
+        return digest.hexdigest(), spooled
+
+    def _is_stored(self, path: str) -> bool:
+        # Always asked to the storage: files can be deleted by other processes,
+        # e.g. `python -m avcfastapi.core.storage.gc`, which no cache would see
+        return self.storage.exists(path)
+
+    def get_paths(self, path: str) -> list[str]:
+        """Storage paths of a stored file and any files derived from it."""
+        return [path]
+
+    def _validate(self, content, path: str):
+        """
+        Check uploaded content before it is stored, raising if it is not
+        accepted. Content addressed uploads are checked before looking for a
+        stored copy, so reusing one never skips validation.
+        """
+
+    def _limit_size(self, content):
+        """
+        Wrap an async byte iterator to raise as soon as it exceeds the field's
+        size limit, so oversized streams are never read to the end.
+        """
+        return content
+
     def save_file(self, content: bytes, path: str) -> str:
         """Save the file to the storage and return the file path."""
         raise NotImplementedError("Subclasses must implement save_file method.")
 
+    async def asave_file(self, content, path: str):
+        """Asynchronously save the file to the storage."""
+        await run_in_storage_executor(self.save_file, content, path)
+
     def get_result(self, path: str):
         """
         Get the URL for the file stored in the storage system.
         """
         raise NotImplementedError("Subclasses must implement get_file_url method.")
 
+    def _upload(self, value: InputFile) -> str:
+        """Save an `InputFile` and return the path stored in the database."""
+        content = value.content
+        if not self.content_addressed:
+            path = self._get_filepath(value.filename)
+            self.save_file(content=content, path=path)
+            return path
+
+        if is_async_iterable(content):
+            raise InvalidRequestException(
+                message="Async file content can only be saved from an AsyncSession."
+            )
+        path = self._get_content_path(self._hash_content(content), value.filename)
+        self._validate(content, path)
+        if not self._is_stored(path):
+            self.save_file(content=content, path=path)
+        return path
+
+    async def _aupload(self, value: InputFile) -> str:
+        """Asynchronously save an `InputFile` and return the path stored in the database."""
+        content = value.content
+        if not self.content_addressed:
+            path = self._get_filepath(value.filename)
+            await self.asave_file(content=content, path=path)
+            return path
+
+        spooled = None
+        try:
+            if is_async_iterable(content):
+                digest, spooled = await self._spool_and_hash(self._limit_size(content))
+                content = spooled
+            else:
+                digest = await run_in_storage_executor(self._hash_content, content)
+            path = self._get_content_path(digest, value.filename)
+            await run_in_storage_executor(self._validate, content, path)
+            if not await run_in_storage_executor(self._is_stored, path):
+                await self.asave_file(content=content, path=path)
+            return path
+        finally:
+            if spooled is not None:
+                spooled.close()
+
     def process_bind_param(
         self, value: Union[Dict, bytes, io.BytesIO], dialect
     ) -> Optional[str]:
@@ -49,6 +227,11 @@ class AbstractFileField(TypeDecorator):
         if not value:
             return None
 
+        if isinstance(value, FileResult):
+            # A value loaded from the database, assigned back unchanged. Checked
+            # first, `FileObject` is also a `str` of the URL.
+            return value.file_path
+
         if isinstance(value, str):
             return value
 
@@ -57,16 +240,16 @@ class AbstractFileField(TypeDecorator):
                 raise InvalidRequestException(
                     message="Invalid input type. Expected File, dict, bytes, or io.BytesIO."
                 )
-            path = self._get_filepath(
-                value.filename
-            )  # this will be the value stored in the database
-            self.save_file(content=value.content, path=path)
-            return path
+            # The returned path is the value stored in the database
+            if in_greenlet():
+                # Flushing from an AsyncSession, let the event loop run the upload
+                return await_only(self._aupload(value))
+            return self._upload(value)
         except InvalidRequestException as e:
             raise e
         except Exception as e:
             raise ValueError(f"Error processing image: {str(e)}")
 
-    def process_result_value(self, value: str, dialect) -> Optional[str]:
+    def process_result_value(self, value: str, dialect) -> Optional[FileResult]:
         """Process the value when retrieving from database."""
         return self.get_result(value)
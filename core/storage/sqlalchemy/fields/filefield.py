@@ -2,22 +2,78 @@ import io
 import os
 from typing import Optional
 
-from .abstract import AbstractFileField
-from ...storage_class.abstract import Storage
+from .abstract import AbstractFileField, FileResult, LazyFileResult
+from ...storage_class.abstract import Storage, is_async_iterable
 
 
-class FileObject(str):
-    def __new__(cls, storage, file_path, file_url):
+class FileObject(FileResult, str):
+    """
+    A file loaded from a `FileField`: the URL of the file, with its stored path
+    in `file_path`. The URL is looked up in the storage unless `file_url` is given.
+    """
+
+    def __new__(
+        cls,
+        storage: Storage,
+        file_path: str,
+        file_url: Optional[str] = None,
+        field=None,
+    ):
+        if file_url is None:
+            file_url = storage.get_url(file_path)
         obj = str.__new__(cls, file_url)
         obj.storage = storage
         obj.file_path = file_path
         obj.file_url = file_url
+        obj.field = field
         return obj
 
-    def delete(self):
-        raise NotImplementedError(
-            "File does not support direct delete operation. Use the S3 client to delete the file."
-        )
+    def resolve(self) -> str:
+        return str(self)
+
+
+class LazyFileObject(LazyFileResult):
+    """
+    A file loaded from a `FileField` with `lazy=True`. Behaves like the URL of
+    the file, which is looked up in the storage on first access.
+    """
+
+    __slots__ = ("_file_url",)
+
+    json_schema = {"type": "string"}
+
+    def __init__(self, storage: Storage, file_path: str, field=None):
+        super().__init__(storage, file_path, field)
+        self._file_url = None
+
+    @property
+    def file_url(self) -> str:
+        if self._file_url is None:
+            self._file_url = self.storage.get_url(self.file_path)
+        return self._file_url
+
+    def resolve(self) -> str:
+        return self.file_url
+
+    def __str__(self) -> str:
+        return self.file_url
+
+    def __repr__(self) -> str:
+        return f"LazyFileObject({self.file_path!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyFileObject):
+            return self.file_path == other.file_path
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.file_path)
+
+    def __getattr__(self, item):
+        """Forward string methods, e.g. `file.endswith(".pdf")`, to the URL."""
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.file_url, item)
 
 
 class FileField(AbstractFileField):
@@ -32,21 +88,29 @@ class FileField(AbstractFileField):
         upload_to="uploads",
         max_size: int = 50 * 1024 * 1024,  # 50MB default
         allowed_extensions: Optional[list[str]] = None,
+        content_addressed: bool = False,
+        lazy: bool = False,
     ):
-        super().__init__(storage, upload_to)
+        super().__init__(
+            storage, upload_to, content_addressed=content_addressed, lazy=lazy
+        )
         self.max_size = max_size
         self.allowed_extensions = allowed_extensions
 
-    def save_file(self, content, path):
+    def _validate(self, content, path):
         ext = path.split(".")[-1].lower()
         if self.allowed_extensions and ext not in self.allowed_extensions:
             raise ValueError(
                 f"Unsupported file extension. Allowed extensions: {self.allowed_extensions}"
             )
 
+        if is_async_iterable(content):
+            # Size of a stream is only known while reading it, see `_limit_size`
+            return
+
         if isinstance(content, bytes):
             file_size = len(content)
-        elif isinstance(content, io.BytesIO):
+        else:
             content.seek(0, os.SEEK_END)
             file_size = content.tell()
             content.seek(0)
@@ -56,12 +120,36 @@ class FileField(AbstractFileField):
                 f"File size exceeds maximum allowed size of {self.max_size} bytes"
             )
 
+    async def _limit_size(self, content):
+        file_size = 0
+        async for chunk in content:
+            file_size += len(chunk)
+            if self.max_size and file_size > self.max_size:
+                raise ValueError(
+                    f"File size exceeds maximum allowed size of {self.max_size} bytes"
+                )
+            yield chunk
+
+    def save_file(self, content, path):
+        self._validate(content, path)
         self.storage.save(
             content=content,
             filepath=path,
             content_type=None,  # Content type can be determined by the storage system
         )
 
+    async def asave_file(self, content, path):
+        self._validate(content, path)
+        if is_async_iterable(content):
+            content = self._limit_size(content)
+        await self.storage.asave(
+            content=content,
+            filepath=path,
+            content_type=None,
+        )
+
     def get_result(self, path):
-        url = self.storage.get_url(path)
-        return FileObject(storage=self.storage, file_path=path, file_url=url)
+        if not path:
+            return None
+        result_class = LazyFileObject if self.lazy else FileObject
+        return result_class(storage=self.storage, file_path=path, field=self)
@@ -1,14 +1,73 @@
+import asyncio
 import io
+import warnings
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
+from urllib.parse import quote
 from PIL import Image as PILImage
 
 from ....exception.request import InvalidRequestException
 
-from .abstract import AbstractFileField
-from ...storage_class.abstract import Storage
-
-
-class Image(dict):
+from .abstract import AbstractFileField, FileResult, LazyFileResult
+from ...imaging import (
+    generate_variants,
+    render_image,
+    render_variants,
+    run_image_job,
+    variant_sizes,
+)
+from ...variants import register_image_field
+from ...storage_class.abstract import (
+    Storage,
+    is_async_iterable,
+    run_in_storage_executor,
+)
+
+
+def _is_url(path: str) -> bool:
+    return path.startswith("http://") or path.startswith("https://")
+
+
+def _variant_path(path: str, suffix: str) -> str:
+    """Embed a variant suffix (e.g. '.thumbnail') before the file extension."""
+    file_name, dot, ext = path.rpartition(".")
+    if not dot:
+        return f"{path}{suffix}"
+    return f"{file_name}{suffix}.{ext}" if ext else f"{file_name}{suffix}"
+
+
+def _variation_paths(file_path: str, variants: tuple) -> dict:
+    if _is_url(file_path):
+        return {"original": file_path}
+    paths = {key: _variant_path(file_path, suffix) for key, suffix in variants}
+    paths["original"] = file_path
+    return paths
+
+
+def _variation_url(
+    storage: Storage,
+    file_path: str,
+    key: str,
+    path: str,
+    render_url: Optional[str],
+) -> Optional[str]:
+    """URL of a variation, or None if it is not available."""
+    if _is_url(path):
+        return path
+    if key == "original":
+        return storage.get_url(path)
+    if render_url:
+        return f"{render_url}/{key}/{quote(file_path)}"
+    try:
+        return storage.get_url(path)
+    except Exception:
+        # Gracefully handle cases where a variant might not exist
+        # (e.g., if generation failed or it was manually deleted)
+        return None
+
+
+class Image(FileResult, dict):
     """
     A dictionary-like object representing an image and its available variations.
     It provides convenient access to the URLs of the original image and its
@@ -17,46 +76,199 @@ class Image(dict):
     This class is primarily used as the return type for `ImageField.get_result()`.
     """
 
-    def __init__(self, storage: Storage, variations: dict, **kwargs):
+    def __init__(
+        self,
+        storage: Storage,
+        file_path: str,
+        variants: tuple = (),
+        render_url: Optional[str] = None,
+        field=None,
+        **urls,
+    ):
         """
-        Initializes the Image object.
+        Initializes the Image object, looking up the URLs of the original image
+        and its variations.
+
+        The former signature, `Image(storage, variations, **urls)` with the
+        file paths and URLs of the variations, is deprecated but still accepted.
 
         Args:
             storage (Storage): The storage instance used to retrieve URLs.
-            variations (dict): A dictionary mapping variation names to their
-                               corresponding file paths in storage.
-            **kwargs: Keyword arguments representing the actual URLs of the
-                      original and variant images (e.g., 'original'='http://...',
-                      'thumbnail'='http://...').
+            file_path (str): The path of the original image in storage, or an
+                             external URL.
+            variants (tuple): `(name, suffix)` pairs of the field's variations,
+                              see `ImageField._variant_suffixes`.
+            render_url (str, optional): URL prefix of the route rendering the
+                                        variants on first request, for fields
+                                        with lazily rendered variants.
+            field (ImageField, optional): The field the image was loaded from.
         """
-        self.variations = variations  # Stores file paths for variations
+        if isinstance(file_path, Mapping):
+            warnings.warn(
+                "Image(storage, variations, **urls) is deprecated, pass the "
+                "stored file_path and the field's variants instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            self.storage = storage
+            self.file_path = file_path["original"]
+            self.field = field
+            self.variations = dict(file_path)
+            super().__init__(urls)
+            return
+        if urls:
+            raise TypeError(
+                f"Unexpected keyword arguments: {', '.join(urls)}, URLs are only "
+                "given with the deprecated variations mapping."
+            )
         self.storage = storage
-        super().__init__(kwargs)  # Stores URLs for variations
+        self.file_path = file_path
+        self.field = field
+        self.variations = _variation_paths(file_path, variants)  # File paths
+        urls = {}
+        for key, path in self.variations.items():
+            url = _variation_url(storage, file_path, key, path, render_url)
+            if url is not None:
+                urls[key] = url
+        super().__init__(urls)  # Stores URLs for variations
 
     def __getattr__(self, item):
         """
         Allows access to image URLs as attributes.
         For example, `image.original` will return the URL for the original image.
         """
-        if self.variations["original"].startswith("http://") or self.variations[
-            "original"
-        ].startswith("https://"):
-            return self.variations.get("original")
-        return super().__getattr__(item)  # Ensure dict methods work
+        if item.startswith("_"):
+            raise AttributeError(item)
+        try:
+            return self.get(item) if _is_url(self.file_path) else self[item]
+        except KeyError:
+            raise AttributeError(item) from None
+
+    def get(self, item, default=None):
+        """
+        Return the URL of a variation, or `default` if it is not available.
+        Images stored as external URLs return the original for every variation.
+        """
+        if _is_url(self.file_path):
+            return self.file_path
+        return super().get(item, default)
+
+    def resolve(self) -> dict:
+        return dict(self)
+
+    def get_paths(self) -> list[str]:
+        """
+        Storage paths of the original image and its variants. Variants that were
+        never rendered are included, deleting a missing file is a no-op.
+        """
+        return [path for path in self.variations.values() if not _is_url(path)]
+
+
+class LazyImage(LazyFileResult, Mapping):
+    """
+    A read-only mapping of an image's variation names to their URLs, loaded
+    from an `ImageField` with `lazy=True`.
+
+    URLs are looked up in the storage on first access of each variation, so an
+    image that is loaded but never rendered costs no storage calls.
+    """
+
+    __slots__ = ("_variants", "_render_url", "_paths", "_urls")
+
+    json_schema = {"type": "object", "additionalProperties": {"type": "string"}}
+
+    def __init__(
+        self,
+        storage: Storage,
+        file_path: str,
+        variants: tuple = (),
+        render_url: Optional[str] = None,
+        field=None,
+    ):
+        """
+        Initializes the LazyImage object.
+
+        Args:
+            storage (Storage): The storage instance used to retrieve URLs.
+            file_path (str): The path of the original image in storage, or an
+                             external URL.
+            variants (tuple): `(name, suffix)` pairs of the field's variations,
+                              see `ImageField._variant_suffixes`.
+            render_url (str, optional): URL prefix of the route rendering the
+                                        variants on first request, for fields
+                                        with lazily rendered variants.
+            field (ImageField, optional): The field the image was loaded from.
+        """
+        super().__init__(storage, file_path, field)
+        self._variants = variants
+        self._render_url = render_url
+        self._paths = None
+        self._urls = {}
+
+    @property
+    def variations(self) -> dict:
+        """File paths of the original image and its variations."""
+        if self._paths is None:
+            self._paths = _variation_paths(self.file_path, self._variants)
+        return self._paths
+
+    def _get_url(self, key: str) -> Optional[str]:
+        if key in self._urls:
+            return self._urls[key]
+        path = self.variations.get(key)
+        if path is None:
+            return None
+        url = _variation_url(self.storage, self.file_path, key, path, self._render_url)
+        self._urls[key] = url
+        return url
+
+    def __getitem__(self, key: str) -> str:
+        url = self._get_url(key)
+        if url is None:
+            raise KeyError(key)
+        return url
 
-    def get(self, item, **kwargs):
+    def __iter__(self):
+        for key in self.variations:
+            if self._get_url(key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __getattr__(self, item):
         """
         Allows access to image URLs as attributes.
         For example, `image.original` will return the URL for the original image.
         """
-        if self.variations["original"].startswith("http://") or self.variations[
-            "original"
-        ].startswith("https://"):
-            return self.variations.get("original")
-        return super().get(item, **kwargs)  # Ensure dict methods work
+        if item.startswith("_"):
+            raise AttributeError(item)
+        try:
+            return self.get(item) if _is_url(self.file_path) else self[item]
+        except KeyError:
+            raise AttributeError(item) from None
+
+    def get(self, item, default=None):
+        """
+        Return the URL of a variation, or `default` if it is not available.
+        Images stored as external URLs return the original for every variation.
+        """
+        if _is_url(self.file_path):
+            return self.file_path
+        return super().get(item, default)
+
+    def resolve(self) -> dict:
+        return dict(self)
 
-    def delete(self):
-        raise NotImplementedError("Image does not support direct delete operation. ")
+    def __repr__(self) -> str:
+        return f"LazyImage({self.file_path!r})"
+
+    def get_paths(self) -> list[str]:
+        """
+        Storage paths of the original image and its variants. Variants that were
+        never rendered are included, deleting a missing file is a no-op.
+        """
+        return [path for path in self.variations.values() if not _is_url(path)]
 
 
 class ImageField(AbstractFileField):
@@ -77,6 +289,13 @@ class ImageField(AbstractFileField):
         max_size: int = 30 * 1024 * 1024,
         allowed_extensions: list[str] = ["jpg", "jpeg", "png", "gif", "webp"],
         variations: dict = {},
+        lazy_variants: bool = False,
+        name: Optional[str] = None,
+        content_addressed: bool = False,
+        passthrough: bool = False,
+        max_dimensions: Optional[tuple[int, int]] = None,
+        lazy: bool = False,
+        max_upload_size: Optional[int] = None,
     ):
         """
         Initializes the ImageField.
@@ -96,11 +315,56 @@ class ImageField(AbstractFileField):
                                          variation name, and its value is a dictionary
                                          specifying 'width' and 'height' for resizing.
                                          Example: `{'thumbnail': {'width': 150, 'height': 150}}`.
+            lazy_variants (bool, optional): Only upload the original image. Variations
+                                            are rendered the first time they are
+                                            requested through the route at
+                                            `STORAGE_IMAGE_RENDER_PATH`, saved to the
+                                            storage and served from there afterwards.
+                                            Not available with private storages,
+                                            the route is not authenticated.
+            name (str, optional): Name of the field in the render route, unique per
+                                  application. Defaults to `upload_to`.
+            content_addressed (bool, optional): Name images by the SHA-256 of the
+                                                uploaded content. Re-uploads of a
+                                                stored image skip processing and
+                                                upload entirely.
+            passthrough (bool, optional): Store the uploaded bytes as they are instead
+                                          of re-encoding the original. The upload is
+                                          validated from the image header and
+                                          `max_size` is enforced before anything is
+                                          decoded. Pixels are only decoded to
+                                          generate variations.
+            max_dimensions (tuple[int, int], optional): Maximum width and height of
+                                                        uploaded images, checked from
+                                                        the image header.
+            lazy (bool, optional): Load values as `LazyImage` handles, looking the
+                                   URLs up on first access instead of when the
+                                   row is loaded.
+            max_upload_size (int, optional): The maximum size of the uploaded bytes,
+                                             enforced while streamed uploads are
+                                             read, before anything is decoded.
+                                             Not limited by default, `max_size`
+                                             applies to the re-encoded original,
+                                             or to the upload for passthrough
+                                             fields.
         """
-        super().__init__(storage, upload_to)
+        super().__init__(
+            storage, upload_to, content_addressed=content_addressed, lazy=lazy
+        )
         self.allowed_extensions = allowed_extensions
         self.variations = variations
         self.max_size = max_size
+        self.lazy_variants = lazy_variants
+        self.passthrough = passthrough
+        self.max_dimensions = max_dimensions
+        self.max_upload_size = max_upload_size
+        # Built once per field, every loaded row shares it
+        self._variant_suffixes = tuple((key, f".{key}") for key in variations)
+        self._render_url = (
+            register_image_field(name or upload_to.strip("/"), self)
+            if lazy_variants
+            else None
+        )
 
     def _process_image_file(
         self, image_data: Union[bytes, io.BytesIO], path: Optional[str] = None
@@ -146,6 +410,7 @@ class ImageField(AbstractFileField):
         """
         Generates resized image variants based on the defined `variations` dictionary.
         Images are resized using LANCZOS resampling for high quality.
+        See `core.storage.imaging.generate_variants`.
 
         Args:
             image (PILImage.Image): The original PIL Image object.
@@ -156,34 +421,7 @@ class ImageField(AbstractFileField):
             dict[str, PILImage.Image]: A dictionary where keys are variation names
                                        and values are the generated PIL Image variant objects.
         """
-
-        def resize_image(
-            img: PILImage.Image, width: int, height: int
-        ) -> PILImage.Image:
-            """Helper function to resize an image, maintaining aspect ratio."""
-            img_ratio = img.width / img.height
-            target_ratio = width / height
-
-            if img_ratio > target_ratio:
-                # Image is wider than target aspect ratio, fit by target width
-                new_width = width
-                new_height = round(width / img_ratio)
-            else:
-                # Image is taller than or matches target aspect ratio, fit by target height
-                new_height = height
-                new_width = round(height * img_ratio)
-
-            return img.resize((new_width, new_height), PILImage.LANCZOS)
-
-        variants = {}
-        for key, value in variations.items():
-            width = value.get("width")
-            height = value.get("height")
-            # Only generate variant if both width and height are specified
-            if width is not None and height is not None:
-                variants[key] = resize_image(image, width, height)
-
-        return variants
+        return generate_variants(image, variations)
 
     def _get_variant_path(self, path: str, key: str) -> str:
         """
@@ -197,18 +435,129 @@ class ImageField(AbstractFileField):
         Returns:
             str: The generated file path for the image variant.
         """
-        if "." in path:
-            ext = path.split(".")[-1]
-            file_name = ".".join(path.split(".")[:-1])
+        return _variant_path(path, f".{key}")
+
+    def is_variant_path(self, path: str) -> bool:
+        """Whether a path is the path of one of the field's variants."""
+        file_name, dot, _ = path.rpartition(".")
+        stem = file_name if dot else path
+        return any(stem.endswith(suffix) for _, suffix in self._variant_suffixes)
+
+    def get_paths(self, path: str) -> list[str]:
+        """Storage paths of a stored image and its variants."""
+        if _is_url(path):
+            return []
+        paths = [path]
+        paths.extend(
+            _variant_path(path, suffix) for _, suffix in self._variant_suffixes
+        )
+        return paths
+
+    def _check_size(self, size: int):
+        if self.max_size and size > self.max_size:
+            raise InvalidRequestException(
+                f"Image size ({size} bytes) exceeds maximum allowed size of {self.max_size} bytes."
+            )
+
+    def _check_upload_size(self, size: int):
+        """Checks the size of the uploaded bytes, see `max_upload_size`."""
+        if self.passthrough:
+            # The uploaded bytes are stored as they are
+            self._check_size(size)
+        if self.max_upload_size and size > self.max_upload_size:
+            raise InvalidRequestException(
+                f"Upload size ({size} bytes) exceeds maximum allowed size of {self.max_upload_size} bytes."
+            )
+
+    async def _limit_size(self, content):
+        size = 0
+        async for chunk in content:
+            size += len(chunk)
+            self._check_upload_size(size)
+            yield chunk
+
+    async def _read_stream(self, content) -> bytes:
+        """Collect an async byte iterator, stopping as soon as it is too large."""
+        return b"".join([chunk async for chunk in self._limit_size(content)])
+
+    def _check_image(
+        self, content: bytes, path: Optional[str] = None
+    ) -> tuple[PILImage.Image, str]:
+        """
+        Validates an uploaded image from its size and header: the format and
+        the dimensions. Pixels are not decoded.
+
+        Returns:
+            tuple[PILImage.Image, str]: The lazily loaded image and its format.
+        """
+        self._check_upload_size(len(content))
+
+        img, fmt = self._process_image_file(content, path)
+        if self.max_dimensions and (
+            img.width > self.max_dimensions[0] or img.height > self.max_dimensions[1]
+        ):
+            raise InvalidRequestException(
+                f"Image dimensions ({img.width}x{img.height}) exceed maximum allowed dimensions of {self.max_dimensions[0]}x{self.max_dimensions[1]}."
+            )
+        return img, fmt
+
+    def _validate(self, content, path: str):
+        if isinstance(content, bytes):
+            data = content
+        elif isinstance(content, io.BytesIO):
+            data = content.getvalue()
         else:
-            ext = ""  # No extension, append key directly
-            file_name = path
-        return f"{file_name}.{key}.{ext}" if ext else f"{file_name}.{key}"
+            data = content.read()
+            content.seek(0)
+        self._check_image(data, path)
+
+    def _render(self, content, path: str) -> list[tuple[str, bytes, str]]:
+        """
+        Validates the image and renders the original and its variations.
+        Decoding, resizing and encoding run in the image process pool, see
+        `run_image_job`, so this blocks and must not run on the event loop.
+
+        Returns:
+            list[tuple[str, bytes, str]]: `(path, content, content_type)` of
+                                          every file to upload.
+        """
+        if not isinstance(content, bytes):
+            content = (
+                content.getvalue()
+                if isinstance(content, io.BytesIO)
+                else content.read()
+            )
+
+        # Only the header is parsed here, the pixels are decoded in the pool
+        img, fmt = self._check_image(content, path)
+
+        # Lazily rendered variants are left to the render route
+        variations = {} if self.lazy_variants else self.variations
+        if self.passthrough:
+            original = content
+            variants = (
+                run_image_job(render_variants, content, fmt, variations)
+                if variant_sizes(img.size, variations)
+                else {}
+            )
+        else:
+            original, variants = run_image_job(render_image, content, fmt, variations)
+            self._check_size(len(original))
+
+        content_type = f"image/{fmt}"
+        files = [(path, original, content_type)]
+        for key, variant in variants.items():
+            variant_path = self._get_variant_path(path, key)
+            # Avoid overwriting the original if a variant key matches the original path logic
+            if variant_path != path:
+                files.append((variant_path, variant, content_type))
+        return files
 
     def save_file(self, content: Union[bytes, io.BytesIO], path: str):
         """
         Saves the original image and generates/saves its specified variations
         to the configured storage. Performs size validation before saving.
+        The original and the variations are uploaded in parallel.
 
         This method is typically called by the SQLAlchemy ORM during an object's
         save operation when the ImageField is updated with new content.
@@ -221,47 +570,53 @@ class ImageField(AbstractFileField):
             InvalidRequestException: If the image size exceeds `max_size` after processing.
             (Other exceptions from `_process_image_file` or `storage.save` may also occur).
         """
-        img, fmt = self._process_image_file(content, path)
-        buffer = io.BytesIO()
-        img.save(buffer, format=fmt)
-        buffer.seek(0)  # Rewind buffer to the beginning for reading
-
-        if self.max_size and buffer.getbuffer().nbytes > self.max_size:
-            raise InvalidRequestException(
-                f"Image size ({buffer.getbuffer().nbytes} bytes) exceeds maximum allowed size of {self.max_size} bytes."
+        files = self._render(content, path)
+        if len(files) == 1:
+            self.storage.save(
+                content=files[0][1], filepath=path, content_type=files[0][2]
+            )
+            return
+
+        # A pool per call, this may already run on a storage executor thread
+        with ThreadPoolExecutor(
+            max_workers=len(files), thread_name_prefix="image-upload"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    self.storage.save,
+                    content=file_content,
+                    filepath=file_path,
+                    content_type=content_type,
+                )
+                for file_path, file_content, content_type in files
+            ]
+            for future in futures:
+                future.result()
+
+    async def asave_file(self, content, path: str):
+        """
+        Asynchronously saves the image and its variations. The processing runs
+        off the event loop and the files are uploaded concurrently.
+        """
+        if is_async_iterable(content):
+            content = await self._read_stream(content)
+        files = await run_in_storage_executor(self._render, content, path)
+        await asyncio.gather(
+            *(
+                self.storage.asave(
+                    content=file_content,
+                    filepath=file_path,
+                    content_type=content_type,
+                )
+                for file_path, file_content, content_type in files
             )
-
-        # Save the original image
-        self.storage.save(
-            content=buffer,
-            filepath=path,
-            content_type=f"image/{fmt}",
         )
 
-        if self.variations:
-            # Generate and save image variants
-            variants = self._generate_variants(img, self.variations)
-            for key, variant in variants.items():
-                buffer = io.BytesIO()
-                # Save variant in the same format as the original
-                variant.save(buffer, format=fmt)
-                buffer.seek(0)
-
-                variant_path = self._get_variant_path(path, key)
-
-                # Avoid overwriting the original if a variant key matches the original path logic
-                if variant_path != path:
-                    self.storage.save(
-                        content=buffer,
-                        filepath=variant_path,
-                        content_type=f"image/{fmt}",
-                    )
-
-    def get_result(self, path: str) -> "Image":
+    def get_result(self, path: str) -> Union["Image", "LazyImage"]:
         """
         Retrieves the URLs for the original image and all its generated variations.
-        This method constructs an `Image` object containing URLs to access the
-        stored image files.
+        Fields with `lazy=True` return a `LazyImage` instead, which looks the
+        URLs up on first access.
 
         Args:
             path (str): The storage path of the original image file as stored in the database.
@@ -274,29 +629,11 @@ class ImageField(AbstractFileField):
         """
         if not path:
             return None
-        variations = {}
-        variation_paths = {}
-
-        if path.startswith("http://") or path.startswith("https://"):
-            # If the path is already a URL, use it directly
-            variations["original"] = path
-            variation_paths["original"] = path
-        else:
-            # Get URLs for all defined variations
-            for variation_key in self.variations:
-                variant_path = self._get_variant_path(path, variation_key)
-                variation_paths[variation_key] = variant_path
-                try:
-                    url = self.storage.get_url(variant_path)
-                    variations[variation_key] = url
-                except Exception:
-                    # Gracefully handle cases where a variant might not exist
-                    # (e.g., if generation failed or it was manually deleted)
-                    pass
-
-            # Always include the original image
-            variations["original"] = self.storage.get_url(path)
-            variation_paths["original"] = path
-
-        # Return a specialized Image object for easier access to URLs and paths
-        return Image(storage=self.storage, variations=variation_paths, **variations)
+        result_class = LazyImage if self.lazy else Image
+        return result_class(
+            storage=self.storage,
+            file_path=path,
+            variants=self._variant_suffixes,
+            render_url=self._render_url,
+            field=self,
+        )
@@ -5,7 +5,7 @@ from uuid import uuid4
 class InputFile:
     def __init__(
         self,
-        content: bytes,
+        content,
         filename: str,
         folder: str = None,
         prefix_date: bool = True,
@@ -15,7 +15,8 @@ class InputFile:
         Initialize a File instance with content.
 
         Args:
-            content (bytes): The file content.
+            content: The file content as bytes, a binary file-like object
+                or an async byte iterator (e.g. `UploadFile` chunks).
         """
         self.content = content
         if "." in filename:
@@ -1,2 +1,3 @@
+from .cached import CachedStorage
 from .filestorage import FileSystemStorage
 from .s3storage import S3Storage
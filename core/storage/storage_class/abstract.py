@@ -1,8 +1,73 @@
+import asyncio
+import functools
 import io
+import tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, BinaryIO, Iterable, Iterator, Optional
+
+from ..settings import settings
+from ...settings import settings as core_settings
+from ...utils.timing import timed
+
+# Shared by all storage backends to run blocking I/O off the event loop
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Async byte iterators larger than this are spooled to disk before upload
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Methods recorded as `storage` spans of the current request if SERVER_TIMING
+# is enabled. Blocking calls made from the thread pool by the async methods
+# don't see the request's context, so they are not counted twice.
+TIMED_METHODS = (
+    "save",
+    "open",
+    "read",
+    "delete",
+    "delete_many",
+    "exists",
+    "get_url",
+    "asave",
+    "aread",
+    "adelete",
+    "adelete_many",
+    "aexists",
+)
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """Return the thread pool used for blocking storage calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.STORAGE_MAX_WORKERS,
+            thread_name_prefix="storage",
+        )
+    return _executor
+
+
+async def run_in_storage_executor(func, *args, **kwargs):
+    """Run a blocking call in the storage thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_storage_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def is_async_iterable(content: Any) -> bool:
+    return hasattr(content, "__aiter__")
 
 
 class Storage(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not core_settings.SERVER_TIMING:
+            return
+        for name in TIMED_METHODS:
+            method = getattr(cls, name)
+            if not hasattr(method, "__timed__"):
+                setattr(cls, name, timed("storage")(method))
+
     def __init__(self, volume: str, base_path: str):
         """
         Initialize a storage instance.
@@ -28,6 +93,8 @@ class Storage(ABC):
             return content.getvalue()
         elif isinstance(content, bytes):
             return content
+        elif hasattr(content, "read"):
+            return content.read()
         else:
             raise TypeError(
                 "Unsupported content. Must be UploadFile, BytesIO, or bytes."
@@ -84,3 +151,158 @@ class Storage(ABC):
             str: URL to access the file.
         """
         raise NotImplementedError("Subclasses must implement this method.")
+
+    def open(self, filepath: str) -> BinaryIO:
+        """
+        Open a stored file for binary reading.
+
+        Args:
+            filepath (str): Relative file path.
+
+        Returns:
+            BinaryIO: A readable file-like object. The caller must close it.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def read(self, filepath: str) -> bytes:
+        """
+        Read the whole content of a stored file.
+
+        Args:
+            filepath (str): Relative file path.
+
+        Returns:
+            bytes: The file content.
+        """
+        file = self.open(filepath)
+        try:
+            return file.read()
+        finally:
+            file.close()
+
+    def delete(self, filepath: str) -> None:
+        """
+        Delete a file from the storage system. Missing files are ignored.
+
+        Args:
+            filepath (str): Relative file path.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def delete_many(self, filepaths: Iterable[str]) -> None:
+        """
+        Delete several files from the storage system. Missing files are ignored.
+        Backends override this with batched or parallel deletes.
+
+        Args:
+            filepaths (Iterable[str]): Relative file paths.
+        """
+        for filepath in filepaths:
+            self.delete(filepath)
+
+    def list_files(self, prefix: str = "") -> Iterator[tuple[str, float]]:
+        """
+        Stream the files stored under a directory, without loading the whole
+        listing into memory.
+
+        Args:
+            prefix (str): Relative directory to list, the whole storage by default.
+
+        Yields:
+            tuple[str, float]: The relative file path and its modification time
+                as a POSIX timestamp.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def exists(self, filepath: str) -> bool:
+        """
+        Check whether a file exists in the storage system.
+
+        Args:
+            filepath (str): Relative file path.
+
+        Returns:
+            bool: True if the file exists.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call in the storage thread pool."""
+        return await run_in_storage_executor(func, *args, **kwargs)
+
+    async def _spool(self, content: AsyncIterator[bytes]) -> BinaryIO:
+        """Collect an async byte iterator into a temporary file."""
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        async for chunk in content:
+            await self._run(spooled.write, chunk)
+        await self._run(spooled.seek, 0)
+        return spooled
+
+    async def asave(
+        self,
+        content: bytes | io.BytesIO | BinaryIO | AsyncIterator[bytes],
+        filepath: str,
+        content_type: str | None = None,
+    ) -> str:
+        """
+        Asynchronously save a file to the storage system.
+
+        The blocking `save` runs in the storage thread pool, so the event loop
+        is never blocked by the upload.
+
+        Args:
+            content: Bytes, a binary file-like object or an async byte iterator.
+            filepath (str): Relative file path where the file should be stored.
+            content_type (str | None): MIME type of the file, optional.
+
+        Returns:
+            str: The final saved file path.
+        """
+        if is_async_iterable(content):
+            spooled = await self._spool(content)
+            try:
+                return await self._run(self.save, spooled, filepath, content_type)
+            finally:
+                spooled.close()
+        return await self._run(self.save, content, filepath, content_type)
+
+    async def aopen(
+        self, filepath: str, chunk_size: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Asynchronously stream the content of a stored file.
+
+        Example:
+            async for chunk in storage.aopen("uploads/report.pdf"):
+                ...
+
+        Args:
+            filepath (str): Relative file path.
+            chunk_size (int | None): Size of the yielded chunks.
+
+        Yields:
+            bytes: Chunks of the file content.
+        """
+        chunk_size = chunk_size or settings.STORAGE_CHUNK_SIZE
+        file = await self._run(self.open, filepath)
+        try:
+            while chunk := await self._run(file.read, chunk_size):
+                yield chunk
+        finally:
+            await self._run(file.close)
+
+    async def aread(self, filepath: str) -> bytes:
+        """Asynchronously read the whole content of a stored file."""
+        return await self._run(self.read, filepath)
+
+    async def adelete(self, filepath: str) -> None:
+        """Asynchronously delete a file from the storage system."""
+        await self._run(self.delete, filepath)
+
+    async def adelete_many(self, filepaths: Iterable[str]) -> None:
+        """Asynchronously delete several files from the storage system."""
+        await self._run(self.delete_many, list(filepaths))
+
+    async def aexists(self, filepath: str) -> bool:
+        """Asynchronously check whether a file exists in the storage system."""
+        return await self._run(self.exists, filepath)
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from ..settings import settings
+from .abstract import Storage
+
+
+class CachedStorage(Storage):
+    """
+    Read-through cache of another storage's files on local disk.
+
+    Reads of a cached file cost disk I/O instead of a round trip to the wrapped
+    storage, e.g. S3. Cached files are evicted least recently used first once
+    they take more than `max_size` bytes. `save` and `delete` go to the wrapped
+    storage and invalidate the cached copy. Other calls, such as `get_url`, are
+    passed through.
+
+        storage = CachedStorage(S3Storage(...), max_size=2 * 1024**3)
+        content = storage.read("uploads/report.pdf")
+
+    Files changed in the wrapped storage by other processes are served from
+    the cache until evicted, so every process should use its own cache
+    directory, and files should not be changed in place. Upload paths of the
+    file fields are unique, or content addressed.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        cache_dir: Optional[str] = None,
+        max_size: int = 1024 * 1024 * 1024,
+        max_file_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            storage (Storage): The storage to cache.
+            cache_dir (str, optional): Directory of the cached files. Files cached
+                there by a previous run are reused. Defaults to a new temporary
+                directory, removed by `close` or when the process exits.
+            max_size (int): Bytes of cached files kept on disk.
+            max_file_size (int, optional): Larger files are read from the wrapped
+                storage without being cached. Defaults to an eighth of `max_size`.
+        """
+        super().__init__(volume=storage.volume, base_path=storage.base_path)
+        self.storage = storage
+        if cache_dir is None:
+            self.cache_dir = tempfile.mkdtemp(prefix="storage-cache-")
+            self._cleanup = weakref.finalize(
+                self, shutil.rmtree, self.cache_dir, ignore_errors=True
+            )
+        else:
+            self.cache_dir = cache_dir
+            self._cleanup = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size = max_size
+        self.max_file_size = max_size // 8 if max_file_size is None else max_file_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        # Cache keys of the cached files and their sizes, least recently used first
+        self._index: OrderedDict[str, int] = OrderedDict()
+        # Downloads in progress, flagged when invalidated by a save or delete
+        # so the previous content is not cached
+        self._downloads: dict[str, bool] = {}
+        # Lock of the misses of each file and the number of threads using it
+        self._fetch_locks: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def __getattr__(self, item):
+        # Backend specific attributes, e.g. `S3Storage.url_cache`
+        if item.startswith("_") or item == "storage":
+            raise AttributeError(item)
+        return getattr(self.storage, item)
+
+    def _load_index(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith("."):
+                # A download interrupted by a previous run
+                os.unlink(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.size += size
+        self._evict()
+
+    def _get_key(self, filepath: str) -> str:
+        return hashlib.sha256(self.storage.get_path(filepath).encode()).hexdigest()
+
+    def _get_cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _evict(self):
+        """Remove least recently used files until the cache fits. Holds `_lock`."""
+        while self.size > self.max_size and self._index:
+            key, size = self._index.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            # Open readers keep reading the unlinked file
+            Path(self._get_cache_path(key)).unlink(missing_ok=True)
+
+    def _open_hit(self, key: str) -> Optional[BinaryIO]:
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+            try:
+                file = open(self._get_cache_path(key), "rb")
+            except FileNotFoundError:
+                # Removed from the cache directory by hand
+                self.size -= self._index.pop(key)
+                return None
+            self.hits += 1
+            return file
+
+    def _fetch(self, filepath: str, key: str) -> BinaryIO:
+        """
+        Download a file into the cache and open the cached copy. Files too large
+        to cache, or invalidated while downloading, are read from the download.
+        """
+        with self._lock:
+            self._downloads[key] = False
+        temp_path = self._get_cache_path(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            with closing(self.storage.open(filepath)) as source, open(
+                temp_path, "wb"
+            ) as file:
+                shutil.copyfileobj(source, file, settings.STORAGE_CHUNK_SIZE)
+                size = file.tell()
+            file = open(temp_path, "rb")
+        except BaseException:
+            # E.g. the file is missing from the wrapped storage
+            with self._lock:
+                self._downloads.pop(key, None)
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            invalidated = self._downloads.pop(key, False)
+            if size <= self.max_file_size and not invalidated:
+                os.replace(temp_path, self._get_cache_path(key))
+                self.size += size - self._index.pop(key, 0)
+                self._index[key] = size
+                self._evict()
+                return file
+        # The open file stays readable after the unlink
+        os.unlink(temp_path)
+        return file
+
+    def _open_cached(self, filepath: str) -> BinaryIO:
+        """Open the cached copy of a file, downloading it on a miss."""
+        key = self._get_key(filepath)
+        file = self._open_hit(key)
+        if file is not None:
+            return file
+        with self._lock:
+            entry = self._fetch_locks.get(key)
+            if entry is None:
+                entry = self._fetch_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            # Concurrent misses of the same file wait for a single download
+            with entry[0]:
+                file = self._open_hit(key)
+                if file is not None:
+                    return file
+                with self._lock:
+                    self.misses += 1
+                return self._fetch(filepath, key)
+        finally:
+            with self._lock:
+                # Dropped by the last thread, waiters must share the same lock
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._fetch_locks[key]
+
+    def invalidate(self, filepath: str):
+        """Drop the cached copy of a file."""
+        key = self._get_key(filepath)
+        with self._lock:
+            if key in self._downloads:
+                self._downloads[key] = True
+            size = self._index.pop(key, None)
+            if size is None:
+                return
+            self.size -= size
+            Path(self._get_cache_path(key)).unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop every cached file."""
+        with self._lock:
+            keys = list(self._index)
+            for key in self._downloads:
+                self._downloads[key] = True
+            self._index.clear()
+            self.size = 0
+        for key in keys:
+            Path(self._get_cache_path(key)).unlink(missing_ok=True)
+
+    def close(self):
+        """Remove the cache directory, if it is the default temporary one."""
+        if self._cleanup is not None:
+            self._cleanup()
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._index),
+            "size": self.size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def open(self, filepath):
+        return self._open_cached(filepath)
+
+    def read(self, filepath):
+        """Read a file from its cached copy."""
+        with self._open_cached(filepath) as file:
+            return file.read()
+
+    def save(self, content, filepath, content_type=None, *args, **kwargs):
+        self.invalidate(filepath)
+        try:
+            return self.storage.save(content, filepath, content_type, *args, **kwargs)
+        finally:
+            # A read during the upload may have cached the previous content
+            self.invalidate(filepath)
+
+    async def asave(self, content, filepath, content_type=None):
+        self.invalidate(filepath)
+        try:
+            return await self.storage.asave(content, filepath, content_type)
+        finally:
+            self.invalidate(filepath)
+
+    def delete(self, filepath):
+        self.invalidate(filepath)
+        self.storage.delete(filepath)
+
+    def delete_many(self, filepaths):
+        filepaths = list(filepaths)
+        for filepath in filepaths:
+            self.invalidate(filepath)
+        self.storage.delete_many(filepaths)
+
+    def exists(self, filepath):
+        return self.storage.exists(filepath)
+
+    def list_files(self, prefix=""):
+        return self.storage.list_files(prefix)
+
+    def get_path(self, filepath):
+        return self.storage.get_path(filepath)
+
+    def get_url(self, filepath, *args, **kwargs):
+        return self.storage.get_url(filepath, *args, **kwargs)
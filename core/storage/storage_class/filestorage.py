@@ -1,6 +1,12 @@
+import io
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from .abstract import Storage
+from ..settings import settings
+from .abstract import Storage, is_async_iterable
 
 
 class FileSystemStorage(Storage):
@@ -8,9 +14,18 @@ class FileSystemStorage(Storage):
         super().__init__(volume, base_path)
         self.url_prefix = url_prefix or ""
 
+    @staticmethod
+    def _get_temp_path(full_path: Path) -> Path:
+        """
+        Hidden temporary file next to `full_path`. Files are written there and
+        renamed into place, so readers never see a partially written file.
+        """
+        return full_path.with_name(f".{full_path.name}.{uuid.uuid4().hex}.tmp")
+
     def save(self, content, filepath, *args, **kwargs):
         """
         Synchronously save a file buffer to the local filesystem at volume/base_path/filepath.
+        The file is written to a temporary file and atomically renamed into place.
 
         Args:
             content (bytes or file-like object): The file data to write.
@@ -28,15 +43,97 @@ class FileSystemStorage(Storage):
             # Ensure the parent directories exist
             full_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(full_path, "wb") as f:
-                content = self._get_bytes(content)
-                f.write(content)
+            temp_path = self._get_temp_path(full_path)
+            try:
+                with open(temp_path, "wb") as f:
+                    if isinstance(content, io.BytesIO):
+                        # The whole buffer, whatever its position
+                        f.write(content.getbuffer())
+                    elif hasattr(content, "read"):
+                        shutil.copyfileobj(content, f)
+                    else:
+                        f.write(self._get_bytes(content))
+                os.replace(temp_path, full_path)
+            except BaseException:
+                temp_path.unlink(missing_ok=True)
+                raise
 
             return str(full_path)
 
         except Exception as e:
             raise IOError(f"Failed to save file to {full_path}: {e}")
 
+    async def asave(self, content, filepath, content_type=None):
+        """
+        Asynchronously save a file, streaming async byte iterators straight to disk.
+        """
+        if not is_async_iterable(content):
+            return await super().asave(content, filepath, content_type)
+
+        full_path = Path(self.volume) / self.base_path / filepath
+        try:
+            await self._run(full_path.parent.mkdir, parents=True, exist_ok=True)
+            temp_path = self._get_temp_path(full_path)
+            try:
+                f = await self._run(open, temp_path, "wb")
+                try:
+                    async for chunk in content:
+                        await self._run(f.write, chunk)
+                finally:
+                    await self._run(f.close)
+                await self._run(os.replace, temp_path, full_path)
+            except BaseException:
+                await self._run(temp_path.unlink, missing_ok=True)
+                raise
+            return str(full_path)
+        except Exception as e:
+            raise IOError(f"Failed to save file to {full_path}: {e}")
+
+    def open(self, filepath):
+        return open(self.get_path(filepath), "rb")
+
+    def delete(self, filepath):
+        Path(self.get_path(filepath)).unlink(missing_ok=True)
+
+    def delete_many(self, filepaths):
+        """Delete several files, unlinking them in parallel."""
+        filepaths = list(filepaths)
+        if len(filepaths) <= 1:
+            return super().delete_many(filepaths)
+        with ThreadPoolExecutor(
+            max_workers=min(len(filepaths), settings.STORAGE_MAX_WORKERS),
+            thread_name_prefix="storage-delete",
+        ) as pool:
+            # Consumed to raise the first error
+            list(pool.map(self.delete, filepaths))
+
+    def list_files(self, prefix=""):
+        """
+        Stream the files under a directory. Hidden files, such as the temporary
+        files of writes in progress, are skipped.
+        """
+        root = Path(self.get_path(""))
+        stack = [root / prefix if prefix else root]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield (
+                            Path(entry.path).relative_to(root).as_posix(),
+                            entry.stat().st_mtime,
+                        )
+
+    def exists(self, filepath):
+        return Path(self.get_path(filepath)).is_file()
+
     def get_path(self, filepath):
         full_path = Path(self.volume) / self.base_path / filepath
         return str(full_path)
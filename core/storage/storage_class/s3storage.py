@@ -1,9 +1,19 @@
+import asyncio
 import io
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Union
 from fastapi import UploadFile
 import boto3
+from botocore.exceptions import ClientError
 
-from .abstract import Storage
+from .abstract import Storage, is_async_iterable
+from ...utils.cache import TTLCache
+
+# S3 rejects multipart parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Most keys a single DeleteObjects request accepts
+DELETE_BATCH_SIZE = 1000
 
 
 class S3Storage(Storage):
@@ -15,6 +25,11 @@ class S3Storage(Storage):
         region_name: str,
         base_path: str = "",
         private: bool = False,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        url_expires_in: int = 3600,
+        url_cache_size: int = 4096,
+        url_refresh_margin: int = 300,
     ):
         """
         Initialize the S3Storage.
@@ -25,7 +40,17 @@ class S3Storage(Storage):
             aws_secret_access_key (str): AWS secret key.
             region_name (str): AWS region.
             base_path (str): Prefix path in the bucket (optional).
+            part_size (int): Part size of multipart uploads. Content larger than
+                one part is uploaded in parts of this size.
+            max_concurrency (int): Parts of one upload in flight at once. Peak
+                memory of an upload is bounded by `part_size * max_concurrency`.
+            url_expires_in (int): Validity of presigned URLs in seconds.
+            url_cache_size (int): Presigned URLs kept in the LRU cache, 0 disables it.
+            url_refresh_margin (int): A cached URL is re-signed this many seconds
+                before it expires, so clients never receive an almost expired URL.
         """
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
         super().__init__(volume=bucket_name, base_path=base_path)
         self.bucket_name = bucket_name
         self.base_path = base_path.strip("/")
@@ -36,6 +61,147 @@ class S3Storage(Storage):
             region_name=region_name,
         )
         self.private = private
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.url_expires_in = url_expires_in
+        self.url_refresh_margin = url_refresh_margin
+        self.url_cache = TTLCache(max_size=url_cache_size)
+
+    def _put_object(self, data: bytes, s3_key: str, content_type: str | None):
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Body=data,
+            ContentType=content_type or "application/octet-stream",
+        )
+
+    def _create_multipart_upload(self, s3_key: str, content_type: str | None) -> str:
+        response = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type or "application/octet-stream",
+        )
+        return response["UploadId"]
+
+    def _upload_part(
+        self, s3_key: str, upload_id: str, part_number: int, data: bytes
+    ) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _complete_multipart_upload(self, s3_key: str, upload_id: str, parts: list):
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": sorted(parts, key=lambda part: part["PartNumber"])
+            },
+        )
+
+    def _abort_multipart_upload(self, s3_key: str, upload_id: str):
+        try:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id
+            )
+        except Exception:
+            # The upload failed already, the original error is more useful
+            pass
+
+    def _save_stream(self, fileobj, s3_key: str, content_type: str | None):
+        """
+        Upload a readable file-like object, in parts if it is larger than one part.
+        At most `max_concurrency` parts are held in memory at any time.
+        """
+        data = fileobj.read(self.part_size)
+        if len(data) < self.part_size:
+            self._put_object(data, s3_key, content_type)
+            return
+
+        upload_id = self._create_multipart_upload(s3_key, content_type)
+        try:
+            parts = []
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                pending = set()
+                part_number = 1
+                while data:
+                    pending.add(
+                        pool.submit(
+                            self._upload_part, s3_key, upload_id, part_number, data
+                        )
+                    )
+                    part_number += 1
+                    # Only parts in flight should keep a reference to their data
+                    data = None
+                    # Wait for a free slot before reading the next part
+                    if len(pending) >= self.max_concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        parts.extend(future.result() for future in done)
+                    data = fileobj.read(self.part_size)
+                parts.extend(future.result() for future in pending)
+            self._complete_multipart_upload(s3_key, upload_id, parts)
+        except BaseException:
+            self._abort_multipart_upload(s3_key, upload_id)
+            raise
+
+    async def _asave_stream(self, content, s3_key: str, content_type: str | None):
+        """
+        Upload an async byte iterator in parts as it is read.
+        At most `max_concurrency` parts are held in memory at any time.
+        """
+        slots = asyncio.Semaphore(self.max_concurrency)
+        tasks = []
+        upload_id = None
+        part_number = 1
+        buffer = bytearray()
+
+        async def upload_part(number: int, data: bytes) -> dict:
+            try:
+                return await self._run(
+                    self._upload_part, s3_key, upload_id, number, data
+                )
+            finally:
+                slots.release()
+
+        try:
+            await slots.acquire()
+            async for chunk in content:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = await self._run(
+                            self._create_multipart_upload, s3_key, content_type
+                        )
+                    data = bytes(buffer[: self.part_size])
+                    del buffer[: self.part_size]
+                    tasks.append(asyncio.create_task(upload_part(part_number, data)))
+                    part_number += 1
+                    await slots.acquire()
+
+            if upload_id is None:
+                await self._run(self._put_object, bytes(buffer), s3_key, content_type)
+                return
+            if buffer:
+                tasks.append(
+                    asyncio.create_task(upload_part(part_number, bytes(buffer)))
+                )
+            else:
+                slots.release()
+            parts = await asyncio.gather(*tasks)
+            await self._run(self._complete_multipart_upload, s3_key, upload_id, parts)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if upload_id is not None:
+                await self._run(self._abort_multipart_upload, s3_key, upload_id)
+            raise
 
     def save(
         self,
@@ -69,20 +235,41 @@ class S3Storage(Storage):
         s3_key = f"{self.base_path}/{filepath}" if self.base_path else filepath
 
         try:
-            content = self._get_bytes(content)
+            if isinstance(content, io.BytesIO):
+                # The whole buffer, whatever its position, as `_get_bytes` reads it
+                content = content.getvalue()
+            if isinstance(content, bytes):
+                if len(content) < self.part_size:
+                    self._put_object(content, s3_key, content_type)
+                    return s3_key
+                content = io.BytesIO(content)
+            elif not hasattr(content, "read"):
+                content = io.BytesIO(self._get_bytes(content))
 
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content,
-                ContentType=content_type or "application/octet-stream",
-            )
+            self._save_stream(content, s3_key, content_type)
 
             return s3_key
 
         except Exception as e:
             raise IOError(f"Failed to upload file to S3 at {s3_key}: {e}")
 
+    async def asave(self, content, filepath, content_type=None):
+        """
+        Asynchronously upload a file to S3.
+
+        Async byte iterators are uploaded in parts while they are read, without
+        being collected first. Other content goes through `save` in a thread.
+        """
+        if not is_async_iterable(content):
+            return await super().asave(content, filepath, content_type)
+
+        s3_key = self.get_path(filepath)
+        try:
+            await self._asave_stream(content, s3_key, content_type)
+            return s3_key
+        except Exception as e:
+            raise IOError(f"Failed to upload file to S3 at {s3_key}: {e}")
+
     def get_path(self, filepath):
         """
         Get the full S3 object key.
@@ -102,17 +289,109 @@ class S3Storage(Storage):
 
         return f"{self.base_path}/{filepath}" if self.base_path else filepath
 
-    def get_url(self, filepath):
+    def open(self, filepath):
+        s3_key = self.get_path(filepath)
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+        except Exception as e:
+            raise IOError(f"Failed to open S3 object {s3_key}: {e}")
+        return response["Body"]
+
+    def delete(self, filepath):
+        s3_key = self.get_path(filepath)
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+        except Exception as e:
+            raise IOError(f"Failed to delete S3 object {s3_key}: {e}")
+
+    def _delete_objects(self, s3_keys: list[str]):
+        try:
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in s3_keys], "Quiet": True},
+            )
+        except Exception as e:
+            raise IOError(f"Failed to delete {len(s3_keys)} S3 objects: {e}")
+        errors = response.get("Errors")
+        if errors:
+            raise IOError(
+                f"Failed to delete {len(errors)} S3 objects, e.g. "
+                f"{errors[0].get('Key')}: {errors[0].get('Message')}"
+            )
+
+    def delete_many(self, filepaths):
+        """
+        Delete several files with DeleteObjects requests of up to 1000 keys,
+        at most `max_concurrency` of them in flight.
+
+        Raises:
+            IOError: If any of the files could not be deleted.
+        """
+        s3_keys = [self.get_path(filepath) for filepath in filepaths]
+        batches = [
+            s3_keys[i : i + DELETE_BATCH_SIZE]
+            for i in range(0, len(s3_keys), DELETE_BATCH_SIZE)
+        ]
+        if len(batches) <= 1 or self.max_concurrency == 1:
+            for batch in batches:
+                self._delete_objects(batch)
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(len(batches), self.max_concurrency)
+        ) as pool:
+            # Consumed to raise the first error
+            list(pool.map(self._delete_objects, batches))
+
+    def list_files(self, prefix=""):
+        """Stream the objects under a prefix, a page of up to 1000 keys at a time."""
+        key_prefix = self.get_path(prefix)
+        if key_prefix and not key_prefix.endswith("/"):
+            # Limit the listing to the directory, 'uploads' must not match 'uploads2'
+            key_prefix += "/"
+        root = f"{self.base_path}/" if self.base_path else ""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        try:
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=key_prefix):
+                for obj in page.get("Contents", ()):
+                    yield obj["Key"][len(root) :], obj["LastModified"].timestamp()
+        except ClientError as e:
+            raise IOError(f"Failed to list S3 objects under {key_prefix}: {e}")
+
+    def exists(self, filepath):
+        s3_key = self.get_path(filepath)
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise IOError(f"Failed to check S3 object {s3_key}: {e}")
+
+    def get_url(self, filepath, expires_in: int | None = None):
         """
         Get the URL for a file stored in S3.
+
+        Presigned URLs are cached per key and expiry and reused until
+        `url_refresh_margin` seconds before they expire.
         """
         s3_key = self.get_path(filepath)
+        expires_in = expires_in or self.url_expires_in
+        cache_key = (s3_key, expires_in)
+
+        url = self.url_cache.get(cache_key)
+        if url is not None:
+            return url
+
         try:
             url = self.s3_client.generate_presigned_url(
                 "get_object",
                 Params={"Bucket": self.bucket_name, "Key": s3_key},
-                ExpiresIn=3600,  # URL valid for 1 hour
+                ExpiresIn=expires_in,
             )
-            return url
         except Exception as e:
             raise IOError(f"Failed to generate URL for S3 object {s3_key}: {e}")
+
+        ttl = expires_in - self.url_refresh_margin
+        if ttl > 0:
+            self.url_cache.set(cache_key, url, ttl=ttl)
+        return url
@@ -0,0 +1,135 @@
+import asyncio
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi.responses import RedirectResponse
+
+from ..exception.database import NotFoundException
+from ..utils.cache import TTLCache
+from .imaging import render_variants, run_image_job
+from .settings import settings
+from .storage_class.abstract import run_in_storage_executor
+
+# Image fields with lazily rendered variants by name, see `register_image_field`
+image_fields: Dict[str, object] = {}
+
+# Variants known to exist in storage, so repeated requests skip the lookup
+_rendered = TTLCache(max_size=10000, ttl=3600)
+
+# Renders in progress, concurrent requests for the same variant share one
+_renders: Dict[tuple, asyncio.Future] = {}
+
+variant_router = APIRouter(prefix=settings.STORAGE_IMAGE_RENDER_PATH)
+
+
+def register_image_field(name: str, field) -> str:
+    """
+    Serve the variants of an `ImageField` from the render route.
+
+    The route is not authenticated and redirects to the stored variants, so
+    fields of private storages can't be registered.
+
+    Args:
+        name (str): Name of the field in the route, unique per application.
+        field (ImageField): The field.
+
+    Returns:
+        str: The URL prefix of the field's variants.
+
+    Raises:
+        ValueError: If another field is registered with the same name, or the
+            field's storage is private.
+    """
+    registered = image_fields.get(name)
+    if registered is not None and registered is not field:
+        raise ValueError(
+            f"An image field named {name!r} is already registered, "
+            "pass a unique `name` to the ImageField."
+        )
+    if getattr(field.storage, "private", False):
+        raise ValueError(
+            f"Image field {name!r} uses a private storage, its variants can't be "
+            "rendered lazily by the unauthenticated render route."
+        )
+    image_fields[name] = field
+    return f"{settings.STORAGE_IMAGE_RENDER_BASE_URL}{settings.STORAGE_IMAGE_RENDER_PATH}/{name}"
+
+
+async def _render(field, path: str, variant: str, variant_path: str) -> None:
+    storage = field.storage
+    if not await storage.aexists(path):
+        raise NotFoundException("Image not found")
+    content = await storage.aread(path)
+    _, fmt = field._process_image_file(content, path)
+    variants = await run_in_storage_executor(
+        run_image_job,
+        render_variants,
+        content,
+        fmt,
+        {variant: field.variations[variant]},
+    )
+    await storage.asave(
+        content=variants[variant],
+        filepath=variant_path,
+        content_type=f"image/{fmt}",
+    )
+
+
+async def render_variant(field, path: str, variant: str) -> str:
+    """
+    Render a variant of a stored image and save it next to the original,
+    unless it exists already. Concurrent calls for the same variant wait for
+    a single render.
+
+    Returns:
+        str: The storage path of the variant.
+    """
+    variant_path = field._get_variant_path(path, variant)
+    key = (id(field), variant_path)
+    if _rendered.get(key):
+        return variant_path
+
+    task = _renders.get(key)
+    if task is None:
+        if await field.storage.aexists(variant_path):
+            _rendered.set(key, True)
+            return variant_path
+        # Checked again, another request may have started it meanwhile
+        task = _renders.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_render(field, path, variant, variant_path))
+        _renders[key] = task
+
+        def done(task: asyncio.Future):
+            _renders.pop(key, None)
+            if not task.cancelled():
+                # Retrieved here too, every waiting request may have gone away
+                task.exception()
+
+        task.add_done_callback(done)
+
+    # A client going away must not cancel the render other requests wait for
+    await asyncio.shield(task)
+    _rendered.set(key, True)
+    return variant_path
+
+
+@variant_router.get("/{name}/{variant}/{path:path}", include_in_schema=False)
+async def image_variant(name: str, variant: str, path: str):
+    field = image_fields.get(name)
+    spec = field.variations.get(variant) if field else None
+    # Only the configured variations of originals the field uploaded are
+    # rendered, a variant of a variant would let anyone fill the storage
+    if (
+        not spec
+        or spec.get("width") is None
+        or spec.get("height") is None
+        or not path.startswith(f"{field.upload_to.rstrip('/')}/")
+        or ".." in path.split("/")
+        or field.is_variant_path(path)
+    ):
+        raise NotFoundException("Image not found")
+
+    variant_path = await render_variant(field, path, variant)
+    url = await run_in_storage_executor(field.storage.get_url, variant_path)
+    return RedirectResponse(url)
@@ -0,0 +1,54 @@
+from typing import Any
+
+from pydantic_core import core_schema
+
+try:
+    from fastapi.encoders import ENCODERS_BY_TYPE
+except ImportError:
+    ENCODERS_BY_TYPE = None
+
+
+class LazyValue:
+    """
+    Base for handles that stand in for a plain value until it is first needed.
+
+    Subclasses implement `resolve` to compute the value. Handles are resolved
+    when validated into a `CustomBaseModel`, when serialized by pydantic as a
+    field annotated with the handle class, and when rendered by
+    `CustomORJSONResponse` or FastAPI's `jsonable_encoder`.
+    """
+
+    __slots__ = ()
+
+    # JSON schema of the resolved value, used for the OpenAPI docs.
+    json_schema: dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if ENCODERS_BY_TYPE is not None:
+            # `jsonable_encoder` looks encoders up by exact type
+            ENCODERS_BY_TYPE[cls] = resolve_lazy
+
+    def resolve(self) -> Any:
+        """Compute the plain value this handle stands for."""
+        raise NotImplementedError("Subclasses must implement resolve method.")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            lambda value: value,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                resolve_lazy
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return dict(cls.json_schema)
+
+
+def resolve_lazy(value: Any) -> Any:
+    """Return the resolved value of a `LazyValue`, other values as they are."""
+    if isinstance(value, LazyValue):
+        return value.resolve()
+    return value
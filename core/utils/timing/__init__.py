@@ -0,0 +1,126 @@
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional
+
+
+class ServerTimings:
+    """
+    Total duration and count of the spans of one request, by span name.
+
+    Spans recorded from threads running with a copy of the request's context,
+    e.g. `run_in_threadpool`, are added to the same totals.
+    """
+
+    __slots__ = ("spans", "_lock")
+
+    def __init__(self):
+        self.spans: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        # Spans of concurrent threads of the same request update the same totals
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [seconds, 1]
+            else:
+                span[0] += seconds
+                span[1] += 1
+
+    def get_header(self, total: Optional[float] = None) -> str:
+        """
+        `Server-Timing` header value, e.g. `db;dur=12.3;desc="4 calls"`, in
+        milliseconds, ending with the total if given.
+        """
+        with self._lock:
+            spans = [
+                (name, seconds, count) for name, (seconds, count) in self.spans.items()
+            ]
+        metrics = [
+            f'{name};dur={seconds * 1000:.2f};desc="{count} call{"s" * (count != 1)}"'
+            for name, seconds, count in spans
+        ]
+        if total is not None:
+            metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_timings: ContextVar[Optional[ServerTimings]] = ContextVar(
+    "server_timings", default=None
+)
+# Name of the innermost span, so a span nested in one of the same name, e.g.
+# `Storage.read` calling `Storage.open`, is not counted twice
+_active_span: ContextVar[Optional[str]] = ContextVar("server_timing_span", default=None)
+
+
+def start_timings() -> Token:
+    """Start collecting spans in the current context, see `ServerTimingMiddleware`."""
+    return _timings.set(ServerTimings())
+
+
+def stop_timings(token: Token):
+    _timings.reset(token)
+
+
+def get_timings() -> Optional[ServerTimings]:
+    """Spans of the current request, None when they are not collected."""
+    return _timings.get()
+
+
+def record(name: str, seconds: float):
+    """Add a span measured elsewhere, e.g. by a driver's own monitoring."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.record(name, seconds)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a block of code into the current request's spans.
+
+        with span("render"):
+            body = serialize(content)
+    """
+    timings = _timings.get()
+    if timings is None or _active_span.get() == name:
+        yield
+        return
+    token = _active_span.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, time.perf_counter() - start)
+        _active_span.reset(token)
+
+
+def timed(name: str):
+    """Decorator timing every call of a function or coroutine function as a span."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            async_wrapper.__timed__ = name
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _timings.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        wrapper.__timed__ = name
+        return wrapper
+
+    return decorator
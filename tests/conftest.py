@@ -0,0 +1,13 @@
+import os
+
+# Core settings are read from the environment when the modules are imported
+os.environ.setdefault("APP_NAME", "test")
+os.environ.setdefault("APP_SECRET_KEY", "test")
+os.environ.setdefault("APP_CORS_ORIGINS", "*")
+os.environ.setdefault("APP_ROUTER_IMPORT_REPORT", "0")
+os.environ.setdefault("APP_STORAGE_IMAGE_WORKERS", "0")
+os.environ.setdefault("APP_DATABASE_HOST", "localhost")
+os.environ.setdefault("APP_DATABASE_PORT", "5432")
+os.environ.setdefault("APP_DATABASE_USER", "test")
+os.environ.setdefault("APP_DATABASE_PASSWORD", "test")
+os.environ.setdefault("APP_DATABASE_NAME", "test")
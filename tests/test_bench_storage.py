@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+from ..benchmarks.bench_storage import _wait_result
+
+context = multiprocessing.get_context("fork")
+
+
+def _run(target, *args) -> dict:
+    queue = context.Queue()
+    process = context.Process(target=target, args=(queue, *args))
+    process.start()
+    result = _wait_result(process, queue, "put_small", "fs")
+    process.join()
+    return result
+
+
+def _send_result(queue):
+    queue.put({"benchmark": "put_small", "backend": "fs", "ops": 1})
+
+
+def _die(queue, code: int):
+    # e.g. killed by the OOM killer before sending a result
+    os._exit(code)
+
+
+def test_result_of_benchmark_process():
+    assert _run(_send_result) == {"benchmark": "put_small", "backend": "fs", "ops": 1}
+
+
+def test_process_dying_without_result_is_reported():
+    assert _run(_die, 3) == {
+        "benchmark": "put_small",
+        "backend": "fs",
+        "error": "process exited with code 3",
+    }
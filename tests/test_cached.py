@@ -0,0 +1,70 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ..core.storage.storage_class.cached import CachedStorage
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = CachedStorage(
+        FileSystemStorage(str(tmp_path / "files"), "media"),
+        cache_dir=str(tmp_path / "cache"),
+    )
+    yield storage
+    storage.close()
+
+
+def test_failed_download_is_forgotten(storage):
+    with pytest.raises(FileNotFoundError):
+        storage.read("uploads/missing.txt")
+
+    assert storage._downloads == {}
+    assert os.listdir(storage.cache_dir) == []
+
+    storage.save(b"content", "uploads/missing.txt")
+    assert storage.read("uploads/missing.txt") == b"content"
+    assert storage.stats()["files"] == 1
+
+
+def test_read_hits_cached_copy(storage):
+    storage.save(b"content", "uploads/a.txt")
+
+    assert storage.read("uploads/a.txt") == b"content"
+    assert storage.read("uploads/a.txt") == b"content"
+    assert storage.stats()["hits"] == 1
+    assert storage.stats()["misses"] == 1
+
+
+def test_close_removes_only_the_default_cache_dir(tmp_path):
+    files = FileSystemStorage(str(tmp_path / "files"), "media")
+    default = CachedStorage(files)
+    given = CachedStorage(files, cache_dir=str(tmp_path / "cache"))
+
+    default.close()
+    given.close()
+
+    assert not os.path.exists(default.cache_dir)
+    assert os.path.isdir(given.cache_dir)
+
+
+def test_concurrent_misses_download_once(storage):
+    storage.save(b"content", "uploads/a.txt")
+    opened = []
+    open_file = storage.storage.open
+
+    def slow_open(filepath):
+        opened.append(filepath)
+        time.sleep(0.05)
+        return open_file(filepath)
+
+    storage.storage.open = slow_open
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        contents = list(executor.map(storage.read, ["uploads/a.txt"] * 8))
+
+    assert contents == [b"content"] * 8
+    assert opened == ["uploads/a.txt"]
+    assert storage._fetch_locks == {}
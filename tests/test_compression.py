@@ -0,0 +1,57 @@
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from ..core.fastapi.middlewares.compression import CompressionMiddleware
+
+BODY = b"x" * 4096
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"])
+
+    @app.get("/not-modified")
+    async def not_modified():
+        return Response(status_code=304, headers={"etag": '"abc"'})
+
+    @app.get("/image-not-modified")
+    async def image_not_modified():
+        return Response(
+            status_code=304, headers={"etag": '"abc"'}, media_type="image/png"
+        )
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield BODY
+            yield BODY
+
+        return StreamingResponse(
+            chunks(), media_type="text/plain", headers={"content-length": "unknown"}
+        )
+
+    return TestClient(app, headers={"accept-encoding": "gzip"})
+
+
+def test_not_modified_matches_compressed_response():
+    response = _client().get("/not-modified")
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_not_modified_of_uncompressible_response_unchanged():
+    response = _client().get("/image-not-modified")
+
+    assert response.headers["etag"] == '"abc"'
+    assert "vary" not in response.headers
+
+
+def test_stream_with_malformed_content_length_is_compressed():
+    response = _client().get("/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY * 2
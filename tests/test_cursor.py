@@ -0,0 +1,118 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from ..core.exception.core import AbstractException
+from ..core.fastapi.app.exception_handlers import abstract_exception_handler
+from ..core.fastapi.response.cursor import apply_cursor_to_select, select_sort_keys
+from ..core.fastapi.response.pagination import (
+    CursorPaginationParams,
+    cursor_paginated_response,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Mapped under another name than its column
+    created: Mapped[int] = mapped_column("created_at")
+
+
+class PostSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created: int
+
+
+# (id, created), with ties on created
+ROWS = [(1, 1), (2, 1), (3, 2), (4, 2), (5, 2), (6, 3), (7, 3)]
+
+ORDERINGS = {
+    "desc": (Post.created.desc(), Post.id.desc()),
+    "asc": (Post.created.asc(), Post.id.asc()),
+    "mixed": (Post.created.desc(), Post.id.asc()),
+}
+
+
+def _expected(name):
+    if name == "desc":
+        return sorted(ROWS, key=lambda row: (-row[1], -row[0]))
+    if name == "asc":
+        return sorted(ROWS, key=lambda row: (row[1], row[0]))
+    return sorted(ROWS, key=lambda row: (-row[1], row[0]))
+
+
+@pytest.fixture(scope="module")
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(Post(id=id, created=created) for id, created in ROWS)
+        session.commit()
+
+    app = FastAPI()
+    app.add_exception_handler(AbstractException, abstract_exception_handler)
+
+    def add_route(name, order_by):
+        @app.get(f"/{name}")
+        def list_posts(request: Request, pagination: CursorPaginationParams):
+            with Session(engine) as session:
+                statement = apply_cursor_to_select(select(Post), pagination, *order_by)
+                rows = session.scalars(statement).all()
+                return cursor_paginated_response(
+                    rows,
+                    request,
+                    PostSchema,
+                    pagination,
+                    select_sort_keys(*order_by),
+                )
+
+    for name, order_by in ORDERINGS.items():
+        add_route(name, order_by)
+    yield TestClient(app)
+    engine.dispose()
+
+
+def _ids(page):
+    return [(item["id"], item["created"]) for item in page["items"]]
+
+
+@pytest.mark.parametrize("name", list(ORDERINGS))
+def test_walk_forward_and_back(client, name):
+    pages = [client.get(f"/{name}", params={"limit": 2}).json()]
+    while pages[-1]["next"]:
+        response = client.get(pages[-1]["next"])
+        assert response.status_code == 200
+        pages.append(response.json())
+
+    assert [row for page in pages for row in _ids(page)] == _expected(name)
+
+    # Walking back from the last page gives the same pages
+    page = pages[-1]
+    for expected in reversed(pages[:-1]):
+        page = client.get(page["previous"]).json()
+        assert _ids(page) == _ids(expected)
+    assert page["previous"] is None
+
+
+def test_cursor_of_another_ordering_is_rejected(client):
+    next_url = client.get("/desc", params={"limit": 2}).json()["next"]
+    cursor = next_url.split("cursor=")[1]
+
+    response = client.get("/mixed", params={"cursor": cursor})
+
+    assert response.status_code == 400
@@ -0,0 +1,59 @@
+import pytest
+
+from ..core.storage.sqlalchemy.fields.filefield import FileField, FileObject
+from ..core.storage.sqlalchemy.inputs.file import InputFile
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+
+
+def test_file_object_is_the_url(tmp_path):
+    storage = FileSystemStorage(str(tmp_path), "media", url_prefix="/media")
+    field = FileField(storage=storage)
+
+    file = field.get_result("uploads/a.txt")
+
+    assert isinstance(file, str)
+    assert file == storage.get_url("uploads/a.txt")
+    assert file.file_path == "uploads/a.txt"
+    assert file.field is field
+
+
+def test_file_object_former_signature(tmp_path):
+    storage = FileSystemStorage(str(tmp_path), "media")
+
+    file = FileObject(storage, "uploads/a.txt", "https://cdn.example.com/a.txt")
+
+    assert file == "https://cdn.example.com/a.txt"
+    assert file.file_url == "https://cdn.example.com/a.txt"
+    assert file.file_path == "uploads/a.txt"
+
+
+def _content_addressed(storage, **kwargs) -> FileField:
+    return FileField(
+        storage=storage, upload_to="docs", content_addressed=True, **kwargs
+    )
+
+
+def test_content_addressed_upload_validated_before_reusing_stored_copy(tmp_path):
+    storage = FileSystemStorage(str(tmp_path), "media")
+    lenient = _content_addressed(storage)
+    strict = _content_addressed(storage, max_size=4)
+    content = b"stored content"
+
+    path = lenient._upload(InputFile(content, "a.txt"))
+    assert storage.exists(path)
+
+    with pytest.raises(ValueError):
+        strict._upload(InputFile(content, "a.txt"))
+
+
+def test_content_addressed_upload_restores_a_collected_file(tmp_path):
+    storage = FileSystemStorage(str(tmp_path), "media")
+    field = _content_addressed(storage)
+    content = b"stored content"
+
+    path = field._upload(InputFile(content, "a.txt"))
+    # Deleted meanwhile, e.g. by the orphan collector of another process
+    storage.delete(path)
+
+    assert field._upload(InputFile(content, "a.txt")) == path
+    assert storage.read(path) == content
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, text
+
+from ..core.storage.gc import collect_all_orphans, iter_file_columns
+from ..core.storage.sqlalchemy.fields.filefield import FileField
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+
+
+@pytest.fixture
+def root(tmp_path):
+    for path in (
+        "media/uploads/doc.txt",
+        "media/uploads/avatars/me.txt",
+        "media/uploads/orphan.txt",
+    ):
+        full_path = tmp_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text("x")
+        os.utime(full_path, (0, 0))
+    return tmp_path
+
+
+@pytest.fixture
+def columns(root):
+    # Two storage instances on the same directory, the avatars directory of
+    # the second is inside the uploads directory of the first
+    documents = FileSystemStorage(str(root), "media")
+    avatars = FileSystemStorage(f"{root}/", "media/")
+    metadata = MetaData()
+    Table(
+        "documents",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("file", FileField(storage=documents, upload_to="uploads")),
+    )
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("avatar", FileField(storage=avatars, upload_to="uploads/avatars")),
+    )
+    return metadata, list(iter_file_columns(metadata))
+
+
+@pytest.fixture
+def connection(columns):
+    engine = create_engine("sqlite://")
+    columns[0].create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO documents (file) VALUES ('uploads/doc.txt')")
+        )
+        connection.execute(
+            text("INSERT INTO users (avatar) VALUES ('uploads/avatars/me.txt')")
+        )
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def test_dry_run_keeps_files_of_storages_sharing_a_directory(root, columns, connection):
+    collected = collect_all_orphans(connection, columns[1], min_age=0, dry_run=True)
+
+    # Both storages point at the same directory, which is listed once
+    assert len(collected) == 1
+    _, stats = collected[0]
+    assert stats["files"] == 3
+    assert stats["orphans"] == 1
+    assert (root / "media/uploads/orphan.txt").exists()
+
+
+def test_deletes_only_unreferenced_files(root, columns, connection):
+    collect_all_orphans(connection, columns[1], min_age=0)
+
+    assert (root / "media/uploads/doc.txt").exists()
+    assert (root / "media/uploads/avatars/me.txt").exists()
+    assert not (root / "media/uploads/orphan.txt").exists()
@@ -0,0 +1,89 @@
+import asyncio
+
+import orjson
+import pytest
+
+from ..core.exception.request import InvalidRequestException
+from ..core.storage.sqlalchemy.fields.imagefield import Image, ImageField, LazyImage
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+
+UPLOAD = b"x" * 4096
+
+
+async def _stream(content: bytes, chunk_size: int = 1024):
+    for i in range(0, len(content), chunk_size):
+        yield content[i : i + chunk_size]
+
+
+def _read(field: ImageField, content: bytes) -> bytes:
+    return asyncio.run(field._read_stream(_stream(content)))
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(str(tmp_path), "media")
+
+
+def test_upload_size_not_limited_by_max_size_when_reencoded(storage):
+    # `max_size` applies to the re-encoded original, which may be smaller
+    field = ImageField(storage=storage, max_size=1024)
+
+    assert _read(field, UPLOAD) == UPLOAD
+
+
+def test_upload_size_limited_by_max_upload_size(storage):
+    field = ImageField(storage=storage, max_size=1024, max_upload_size=2048)
+
+    with pytest.raises(InvalidRequestException):
+        _read(field, UPLOAD)
+
+
+def test_passthrough_upload_size_limited_by_max_size(storage):
+    field = ImageField(storage=storage, max_size=1024, passthrough=True)
+
+    with pytest.raises(InvalidRequestException):
+        _read(field, UPLOAD)
+
+
+def test_image_former_signature(storage):
+    variations = {"original": "pics/a.png", "thumb": "pics/a.thumb.png"}
+
+    with pytest.warns(DeprecationWarning):
+        image = Image(storage, variations, original="/a.png", thumb="/a.thumb.png")
+
+    assert image == {"original": "/a.png", "thumb": "/a.thumb.png"}
+    assert image.thumb == "/a.thumb.png"
+    assert image.variations == variations
+    assert image.get_paths() == ["pics/a.png", "pics/a.thumb.png"]
+
+
+def test_image_urls_only_with_former_signature(storage):
+    with pytest.raises(TypeError):
+        Image(storage, "pics/a.png", original="/a.png")
+
+
+def test_loaded_image_is_a_dict_of_urls(storage):
+    field = ImageField(storage=storage, variations={"thumb": {"width": 10}})
+
+    image = field.get_result("pics/a.png")
+
+    assert isinstance(image, dict)
+    assert image == {
+        "original": storage.get_url("pics/a.png"),
+        "thumb": storage.get_url("pics/a.thumb.png"),
+    }
+    assert orjson.loads(orjson.dumps(image)) == image
+
+
+def test_lazy_image_looks_urls_up_on_access(storage):
+    field = ImageField(storage=storage, variations={"thumb": {"width": 10}}, lazy=True)
+    calls = []
+    get_url = storage.get_url
+    storage.get_url = lambda path: calls.append(path) or get_url(path)
+
+    image = field.get_result("pics/a.png")
+    assert isinstance(image, LazyImage)
+    assert calls == []
+
+    assert image["thumb"] == get_url("pics/a.thumb.png")
+    assert calls == ["pics/a.thumb.png"]
@@ -0,0 +1,13 @@
+import multiprocessing
+
+import pytest
+
+from ..core.storage.imaging import _get_mp_context
+
+
+@pytest.mark.skipif(
+    "forkserver" not in multiprocessing.get_all_start_methods(),
+    reason="forkserver is not available",
+)
+def test_image_workers_are_not_forked_from_the_server():
+    assert _get_mp_context().get_start_method() == "forkserver"
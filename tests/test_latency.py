@@ -0,0 +1,33 @@
+from ..core.fastapi.middlewares.latency import (
+    OTHER_METHOD,
+    OVERFLOW_ROUTE,
+    LatencyRegistry,
+)
+
+
+def _keys(registry: LatencyRegistry) -> list:
+    return [
+        (entry["method"], entry["route"], entry["status_code"], entry["count"])
+        for entry in registry.snapshot()
+    ]
+
+
+def test_unknown_methods_recorded_as_other():
+    registry = LatencyRegistry()
+    registry.record("BREW", "/coffee", 200, 1.0)
+    registry.record("PROPFIND", "/coffee", 200, 1.0)
+
+    assert _keys(registry) == [(OTHER_METHOD, "/coffee", 200, 2)]
+
+
+def test_keys_beyond_max_keys_overflow():
+    registry = LatencyRegistry(max_keys=2)
+    for index in range(10):
+        registry.record("GET", f"/items/{index}", 200, 1.0)
+    registry.record("GET", "/items/0", 200, 1.0)
+
+    assert _keys(registry) == [
+        ("GET", "/items/0", 200, 2),
+        ("GET", "/items/1", 200, 1),
+        ("GET", OVERFLOW_ROUTE, 0, 8),
+    ]
@@ -0,0 +1,153 @@
+from typing import Any, List, Optional
+
+import orjson
+import pytest
+from pydantic import BaseModel, ConfigDict, ValidationError
+from sqlalchemy import ForeignKey, create_engine, event, select
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    relationship,
+    selectinload,
+)
+
+from ..core.fastapi.response.pagination import (
+    _encoded_schemas,
+    _hide_unloaded,
+    _validate_items,
+)
+from ..core.fastapi.response.serializer import serialize
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Author(Base):
+    __tablename__ = "authors"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+    posts: Mapped[List["Post"]] = relationship(back_populates="author")
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str]
+    author_id: Mapped[int] = mapped_column(ForeignKey("authors.id"))
+    author: Mapped[Author] = relationship(back_populates="posts")
+
+
+class AuthorSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
+
+class PostWithModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    author: Optional[AuthorSchema] = None
+
+
+class PostWithAny(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    author: Any = None
+
+
+class AuthorWithPosts(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    posts: Any = None
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        author = Author(id=1, name="Ada")
+        session.add_all([author, Post(id=1, title="a", author=author)])
+        session.commit()
+    with Session(engine) as session:
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        session.statements = statements
+        yield session
+    engine.dispose()
+
+
+def _load_posts(session, eager: bool):
+    statement = select(Post)
+    if eager:
+        statement = statement.options(selectinload(Post.author))
+    posts = session.scalars(statement).all()
+    session.statements.clear()
+    return posts
+
+
+@pytest.mark.parametrize("schema", [PostWithModel, PostWithAny])
+def test_loaded_relationship_is_serialized(session, schema):
+    items = _validate_items(_load_posts(session, eager=True), schema)
+
+    assert orjson.loads(serialize(items)) == [
+        {"id": 1, "title": "a", "author": {"id": 1, "name": "Ada"}}
+    ]
+    assert session.statements == []
+
+
+@pytest.mark.parametrize("schema", [PostWithModel, PostWithAny])
+def test_unloaded_relationship_is_not_loaded(session, schema):
+    items = _validate_items(_load_posts(session, eager=False), schema)
+
+    assert serialize(items) == b'[{"id":1,"title":"a","author":null}]'
+    assert session.statements == []
+
+
+def test_loaded_collection_is_serialized(session):
+    authors = session.scalars(select(Author).options(selectinload(Author.posts))).all()
+    session.statements.clear()
+
+    items = _validate_items(authors, AuthorWithPosts)
+
+    posts = orjson.loads(serialize(items))[0]["posts"]
+    assert posts == [{"id": 1, "title": "a", "author_id": 1}]
+    assert session.statements == []
+
+
+def test_hide_unloaded_keeps_container_types():
+    assert _hide_unloaded((1, 2)) == (1, 2)
+    assert _hide_unloaded({1, 2}) == {1, 2}
+    assert _hide_unloaded(frozenset({1})) == frozenset({1})
+    assert _hide_unloaded([1]) == [1]
+
+
+class StrictPost(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: int
+
+
+def test_invalid_rows_raise_without_disabling_direct_validation(session):
+    posts = _load_posts(session, eager=False)
+
+    with pytest.raises(ValidationError):
+        _validate_items(posts, StrictPost)
+
+    assert StrictPost not in _encoded_schemas
@@ -0,0 +1,84 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from ..core.fastapi.middlewares.response_cache import ResponseCacheMiddleware
+from ..core.fastapi.response.cache import MemoryCacheBackend, ResponseCache
+
+
+def _client() -> TestClient:
+    cache = ResponseCache(MemoryCacheBackend())
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/greeting")
+    @cache.cached(vary=["Accept-Language"])
+    async def greeting():
+        return {"greeting": "hello"}
+
+    @app.get("/uncached")
+    @cache.cached(vary=["Accept-Language"], key_builder=lambda request: None)
+    async def uncached():
+        return {"greeting": "hello"}
+
+    @app.get("/echo")
+    @cache.cached()
+    async def echo(request: Request):
+        return {"path": request.url.path}
+
+    @app.get("/plain")
+    @cache.cached()
+    async def plain():
+        return {"greeting": "hello"}
+
+    return TestClient(app)
+
+
+def test_vary_headers_are_sent():
+    client = _client()
+    headers = {"accept-language": "en"}
+
+    miss = client.get("/greeting", headers=headers)
+    hit = client.get("/greeting", headers=headers)
+    not_modified = client.get(
+        "/greeting", headers={**headers, "if-none-match": hit.headers["etag"]}
+    )
+
+    assert miss.headers["x-cache"] == "MISS"
+    assert hit.headers["x-cache"] == "HIT"
+    assert not_modified.status_code == 304
+    for response in (miss, hit, not_modified):
+        assert response.headers.get_list("vary") == ["accept-language"]
+
+
+def test_vary_header_sent_for_uncached_requests():
+    response = _client().get("/uncached")
+
+    assert "x-cache" not in response.headers
+    assert response.headers["vary"] == "accept-language"
+
+
+def test_no_vary_header_without_vary():
+    response = _client().get("/plain")
+
+    assert response.headers["x-cache"] == "MISS"
+    assert "vary" not in response.headers
+
+
+def test_endpoint_request_parameter_is_passed():
+    client = _client()
+
+    miss = client.get("/echo")
+    hit = client.get("/echo")
+
+    assert miss.json() == hit.json() == {"path": "/echo"}
+    assert hit.headers["x-cache"] == "HIT"
+
+
+def test_identified_requests_are_not_cached_without_a_key():
+    client = _client()
+
+    first = client.get("/plain", headers={"authorization": "Bearer a"})
+    second = client.get("/plain", headers={"authorization": "Bearer a"})
+
+    assert "x-cache" not in first.headers
+    assert "x-cache" not in second.headers
@@ -0,0 +1,20 @@
+import orjson
+
+from ..core.fastapi.response.serializer import serialize
+
+
+def test_id_keys_are_renamed():
+    assert orjson.loads(serialize({"_id": 1, "items": [{"_id": 2}]})) == {
+        "id": 1,
+        "items": [{"id": 2}],
+    }
+
+
+def test_key_ending_with_escaped_quote_and_id_is_kept():
+    content = {'x"_id': 1, "_id": 2, "text": 'say "_id": hi'}
+
+    assert orjson.loads(serialize(content)) == {
+        'x"_id': 1,
+        "id": 2,
+        "text": 'say "_id": hi',
+    }
@@ -0,0 +1,51 @@
+import asyncio
+
+from sqlalchemy import Integer, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from ..core.database.sqlalchamey.listeners import INCLUDE_DELETED, add_loader_criteria
+from ..core.database.sqlalchamey.mixins import SoftDeleteMixin
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(SoftDeleteMixin, Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+async def _query(*execution_options: dict) -> list:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            deleted = Note(id=2)
+            deleted.soft_delete()
+            session.add_all([Note(id=1), deleted])
+            await session.commit()
+
+        results = []
+        async with AsyncSession(engine) as session:
+            add_loader_criteria(session)
+            for options in execution_options:
+                statement = select(Note.id).order_by(Note.id)
+                result = await session.execute(statement.execution_options(**options))
+                results.append(result.scalars().all())
+        return results
+    finally:
+        await engine.dispose()
+
+
+def test_soft_deleted_rows_are_hidden():
+    assert asyncio.run(_query({})) == [[1]]
+
+
+def test_include_deleted_skips_the_filter():
+    results = asyncio.run(_query({INCLUDE_DELETED: True}, {}))
+
+    assert results == [[1, 2], [1]]
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from ..core.database.sqlalchamey import sql_logging
+from ..core.database.sqlalchamey.settings import settings
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_SQL_LOG_SLOW_MS", 0)
+    monkeypatch.setattr(settings, "DATABASE_SQL_LOG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "DATABASE_SQL_LOG_PARAMETERS", False)
+    records = []
+    monkeypatch.setattr(
+        sql_logging.logger, "info", lambda message, *args: records.append(args)
+    )
+    return records
+
+
+def test_failed_statements_leave_no_state_on_the_connection(logged):
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", sql_logging._before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", sql_logging._after_cursor_execute)
+
+    with engine.connect() as connection:
+        info = dict(connection.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+        connection.execute(text("SELECT 1"))
+
+        assert connection.info == info
+    engine.dispose()
+
+    # Only the statement that ran is logged, with its own duration
+    assert [statement for _, statement in logged] == ["SELECT 1"]
+    assert logged[0][0] < 1000
@@ -0,0 +1,32 @@
+import io
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+from ..core.storage.storage_class.s3storage import S3Storage
+
+BUCKET = "avcfastapi-test"
+
+
+@pytest.fixture(params=["fs", "s3"])
+def storage(request, tmp_path, monkeypatch):
+    if request.param == "fs":
+        yield FileSystemStorage(str(tmp_path), "media")
+        return
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET, "test", "test", "us-east-1", base_path="media")
+
+
+def test_save_bytesio_from_any_position(storage):
+    buffer = io.BytesIO()
+    buffer.write(b"written without seeking back")
+
+    storage.save(buffer, "uploads/a.txt")
+
+    assert storage.read("uploads/a.txt") == b"written without seeking back"
+    assert buffer.tell() == len(b"written without seeking back")
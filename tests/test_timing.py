@@ -0,0 +1,37 @@
+import threading
+import time
+
+import pytest
+
+from ..core.utils.timing import ServerTimings
+
+THREADS = 8
+RECORDS = 200
+
+
+class _SlowSeconds(float):
+    """Duration whose addition lets other threads run, as a switch there would."""
+
+    def __radd__(self, other):
+        time.sleep(0)
+        return other + float(self)
+
+
+def test_record_from_threads_keeps_every_span():
+    timings = ServerTimings()
+    barrier = threading.Barrier(THREADS)
+
+    def work():
+        barrier.wait()
+        for _ in range(RECORDS):
+            timings.record("db", _SlowSeconds(0.001))
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    seconds, count = timings.spans["db"]
+    assert count == THREADS * RECORDS
+    assert seconds == pytest.approx(THREADS * RECORDS * 0.001)
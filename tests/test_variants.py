@@ -0,0 +1,121 @@
+import asyncio
+import gc
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image as PILImage
+
+from ..core.exception.core import AbstractException
+from ..core.fastapi.app.exception_handlers import abstract_exception_handler
+from ..core.storage.sqlalchemy.fields.imagefield import ImageField
+from ..core.storage.storage_class.filestorage import FileSystemStorage
+from ..core.storage import variants
+from ..core.storage.variants import image_fields, render_variant, variant_router
+
+VARIATIONS = {"thumb": {"width": 10, "height": 10}}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(str(tmp_path), "media", url_prefix="/media")
+
+
+@pytest.fixture
+def field(storage):
+    field = ImageField(
+        storage=storage,
+        upload_to="pics",
+        variations=VARIATIONS,
+        lazy_variants=True,
+    )
+    yield field
+    image_fields.pop("pics", None)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_exception_handler(AbstractException, abstract_exception_handler)
+    app.include_router(variant_router)
+    return TestClient(app)
+
+
+def _png(storage, path):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (50, 50)).save(buffer, "PNG")
+    storage.save(buffer.getvalue(), path)
+
+
+def test_renders_variant_of_original(field, storage, client):
+    _png(storage, "pics/a b#c.png")
+
+    url = field.get_result("pics/a b#c.png")["thumb"]
+    response = client.get(url, follow_redirects=False)
+
+    assert response.status_code == 307
+    assert storage.exists("pics/a b#c.thumb.png")
+
+
+def test_rejects_variant_of_variant(field, storage, client):
+    _png(storage, "pics/a.png")
+    _png(storage, "pics/a.thumb.png")
+
+    response = client.get(
+        "/api/images/pics/thumb/pics/a.thumb.png", follow_redirects=False
+    )
+
+    assert response.status_code == 404
+    assert not storage.exists("pics/a.thumb.thumb.png")
+
+
+def test_rejects_duplicate_name(field, storage):
+    with pytest.raises(ValueError):
+        ImageField(
+            storage=storage,
+            upload_to="pics",
+            variations=VARIATIONS,
+            lazy_variants=True,
+        )
+
+
+def test_rejects_private_storage(storage):
+    storage.private = True
+    with pytest.raises(ValueError):
+        ImageField(
+            storage=storage,
+            upload_to="private",
+            variations=VARIATIONS,
+            lazy_variants=True,
+        )
+    assert "private" not in image_fields
+
+
+def test_failed_render_with_no_waiter_is_retrieved(field, monkeypatch):
+    async def run():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        started, fail = asyncio.Event(), asyncio.Event()
+
+        async def failing_render(*args):
+            started.set()
+            await fail.wait()
+            raise OSError("storage unavailable")
+
+        monkeypatch.setattr(variants, "_render", failing_render)
+        waiter = asyncio.ensure_future(render_variant(field, "pics/a.png", "thumb"))
+        await started.wait()
+        # The only request waiting for the render goes away
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        fail.set()
+        while variants._renders:
+            await asyncio.sleep(0.001)
+        gc.collect()
+        return errors
+
+    assert asyncio.run(run()) == []